@@ -0,0 +1,207 @@
+"""
+Access log JSON untuk apiv1 dan sampler request lambat.
+
+AccessLogMiddleware menulis satu baris per request ke logger `lms.access`:
+route template (`/api/v1/courses/{course_id}/similar`), method, status, user,
+tenant, path param (course_id dst.), latensi, waktu DB dan jumlah query. Waktu DB
+diukur dengan execute_wrapper di semua koneksi thread request; query dari thread
+lain (item GET di /batch) tidak ikut terhitung.
+
+Request yang lebih lama dari LMS_SLOW_REQUEST_MS juga ditulis ke logger
+`lms.slow` beserta SQL-nya (tanpa parameter, maksimal LMS_SLOW_REQUEST_MAX_QUERIES),
+dibatasi LMS_SLOW_REQUEST_PER_MINUTE per proses supaya database yang sedang lambat
+tidak membanjiri log.
+
+Menulis log tidak dilakukan di thread request: QueuedFileHandler hanya menaruh
+record di antrean, dan QueueListener di thread terpisah yang memformat JSON dan
+menulis file. Ringkas hasilnya dengan `python manage.py analyze_access_log`.
+"""
+import json
+import logging
+import queue
+import re
+import threading
+import time
+from contextlib import ExitStack
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from pathlib import Path
+
+from django.conf import settings
+from django.db import connections
+from django.utils.functional import SimpleLazyObject, empty
+
+access_logger = logging.getLogger("lms.access")
+slow_logger = logging.getLogger("lms.slow")
+
+_CONVERTER = re.compile(r"<(?:\w+:)?(\w+)>")
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+# ─── Handler & formatter ─────────────────────────────────────
+
+class JsonFormatter(logging.Formatter):
+    """Satu objek JSON per baris: ts, level, logger, lalu isi `extra={"data": {...}}`."""
+
+    def format(self, record):
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+        }
+        data = getattr(record, "data", None)
+        if data is not None:
+            entry.update(data)
+        else:
+            entry["message"] = record.getMessage()
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class QueuedFileHandler(QueueHandler):
+    """QueueHandler dengan RotatingFileHandler yang berjalan di thread QueueListener.
+
+    Formatter yang dipasang lewat LOGGING diteruskan ke handler file, jadi
+    format JSON juga dikerjakan di thread listener. Tiap proses worker punya
+    listener sendiri; arahkan ke file berbeda per proses kalau file dirotasi.
+    """
+
+    def __init__(self, filename, max_bytes=50 * 1024 * 1024, backup_count=5):
+        super().__init__(queue.SimpleQueue())
+        Path(filename).parent.mkdir(parents=True, exist_ok=True)
+        self.target = RotatingFileHandler(
+            filename, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8", delay=True
+        )
+        self.listener = QueueListener(self.queue, self.target)
+        self.listener.start()
+        self._listening = True
+
+    def setFormatter(self, fmt):
+        self.target.setFormatter(fmt)
+
+    def prepare(self, record):
+        # record access/slow sudah berisi dict `data`; formatting ditunda ke listener
+        return record
+
+    def close(self):
+        # dipanggil logging.shutdown() saat proses selesai: kosongkan antrean dulu
+        if self._listening:
+            self._listening = False
+            self.listener.stop()
+        self.target.close()
+        super().close()
+
+
+# ─── Middleware ──────────────────────────────────────────────
+
+class _QueryTimer:
+    def __init__(self, keep):
+        self.count = 0
+        self.seconds = 0.0
+        self.keep = keep
+        self.statements = []       # (sql, ms) untuk dump request lambat
+
+    def __call__(self, execute, sql, params, many, context):
+        began = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - began
+            self.count += 1
+            self.seconds += elapsed
+            if len(self.statements) < self.keep:
+                self.statements.append((sql, round(elapsed * 1000, 3)))
+
+
+class _SlowBudget:
+    """Batas jumlah dump request lambat per menit (per proses)."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.minute = None
+        self.used = 0
+
+    def take(self, limit):
+        minute = int(time.time() // 60)
+        with self.lock:
+            if minute != self.minute:
+                self.minute, self.used = minute, 0
+            if self.used >= limit:
+                return False
+            self.used += 1
+            return True
+
+
+_slow_budget = _SlowBudget()
+
+
+def route_template(match):
+    """`api/v1/courses/<course_id>/similar` -> `/api/v1/courses/{course_id}/similar`."""
+    if match is None:
+        return None
+    return "/" + _CONVERTER.sub(r"{\1}", match.route)
+
+
+def _user_id(request):
+    # JwtAuth mengganti request.user dengan AnonymousUser ber-id; user session yang
+    # belum pernah dibaca (endpoint tanpa auth) tidak di-load hanya untuk log
+    user = request.__dict__.get("user")
+    if isinstance(user, SimpleLazyObject) and user._wrapped is empty:
+        return None
+    return getattr(user, "id", None)
+
+
+def _param(value):
+    return int(value) if isinstance(value, str) and value.isdigit() else value
+
+
+class AccessLogMiddleware:
+    """Catat setiap request di LMS_ACCESS_LOG_PATHS ke logger `lms.access` (lihat modul)."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.paths = tuple(_setting("LMS_ACCESS_LOG_PATHS", ("/api/",)))
+        self.slow_ms = _setting("LMS_SLOW_REQUEST_MS", 1000)
+        self.slow_per_minute = _setting("LMS_SLOW_REQUEST_PER_MINUTE", 30)
+        self.keep = _setting("LMS_SLOW_REQUEST_MAX_QUERIES", 200)
+
+    def __call__(self, request):
+        if not request.path.startswith(self.paths) or not (
+            access_logger.isEnabledFor(logging.INFO) or slow_logger.isEnabledFor(logging.WARNING)
+        ):
+            return self.get_response(request)
+
+        timer = _QueryTimer(self.keep)
+        started = time.perf_counter()
+        with ExitStack() as stack:
+            for alias in connections:
+                stack.enter_context(connections[alias].execute_wrapper(timer))
+            response = self.get_response(request)
+        latency_ms = (time.perf_counter() - started) * 1000
+
+        match = request.resolver_match
+        params = {k: _param(v) for k, v in match.kwargs.items()} if match else {}
+        tenant = getattr(request, "tenant", None)
+        entry = {
+            "method": request.method,
+            "route": route_template(match),
+            "status": response.status_code,
+            "user_id": _user_id(request),
+            "tenant": tenant.slug if tenant else None,
+            "course_id": params.get("course_id"),
+            "params": params,
+            "latency_ms": round(latency_ms, 3),
+            "db_ms": round(timer.seconds * 1000, 3),
+            "queries": timer.count,
+        }
+        access_logger.info("access", extra={"data": entry})
+        if latency_ms >= self.slow_ms and _slow_budget.take(self.slow_per_minute):
+            slow_logger.warning("slow", extra={"data": {
+                **entry,
+                "path": request.get_full_path(),
+                "sql": [{"sql": sql, "ms": ms} for sql, ms in timer.statements],
+                "sql_truncated": timer.count > len(timer.statements),
+            }})
+        return response
@@ -1,5 +1,12 @@
-from django.contrib import admin
+from django.contrib import admin, messages
+from django.contrib.admin.views.main import PAGE_VAR
+from django.core.paginator import Paginator
+from django.db import connections
+from django.utils.functional import cached_property
+
+from .purge import start_job
 from .models import (
+    Tenant,
     Course,
     CourseMember,
     CourseContent,
@@ -7,48 +14,174 @@ from .models import (
     Profile,
     Announcement,
     CompletionTracking,
+    MediaAsset,
 )
 
+
+# ─── Komponen untuk tabel besar ───────────────────────────────
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Di PostgreSQL, changelist tanpa filter memakai estimasi pg_class.reltuples
+    alih-alih COUNT(*) penuh (yang men-scan seluruh tabel). Tabel kecil dan
+    changelist yang difilter tetap dihitung eksak.
+    """
+    estimate_threshold = 100_000
+
+    @cached_property
+    def count(self):
+        qs = self.object_list
+        connection = connections[qs.db]
+        if connection.vendor == "postgresql" and not qs.query.where:
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    "SELECT reltuples::bigint FROM pg_class WHERE relname = %s",
+                    [qs.model._meta.db_table],
+                )
+                row = cursor.fetchone()
+            if row and row[0] >= self.estimate_threshold:
+                return row[0]
+        return super().count
+
+
+class LargeTableAdmin(admin.ModelAdmin):
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False  # hindari COUNT(*) kedua untuk "x total"
+    list_per_page = 50
+
+
+class InputFilter(admin.SimpleListFilter):
+    """Filter sidebar berupa input teks (id atau nama) tanpa me-render semua pilihan FK."""
+    template = "admin/input_filter.html"
+    field = None         # nama FK, mis. "user"
+    text_lookup = None   # lookup untuk input non-angka, mis. "user__username"
+    placeholder = ""
+
+    def lookups(self, request, model_admin):
+        # harus tidak kosong supaya filter ditampilkan
+        return (("", ""),)
+
+    def queryset(self, request, queryset):
+        value = (self.value() or "").strip()
+        if not value:
+            return queryset
+        if value.isdigit():
+            return queryset.filter(**{f"{self.field}_id": int(value)})
+        return queryset.filter(**{self.text_lookup: value})
+
+    def choices(self, changelist):
+        all_choice = next(super().choices(changelist))
+        # pertahankan filter lain + urutan, tapi reset halaman
+        all_choice["query_parts"] = [
+            (key, value)
+            for key, values in changelist.filter_params.items()
+            if key not in (self.parameter_name, PAGE_VAR)
+            for value in values
+        ]
+        yield all_choice
+
+
+def input_filter(field, title, text_lookup, placeholder):
+    return type(f"{field.title()}InputFilter", (InputFilter,), {
+        "title": title,
+        "parameter_name": field,
+        "field": field,
+        "text_lookup": text_lookup,
+        "placeholder": placeholder,
+    })
+
+
+UserFilter    = input_filter("user", "user", "user__username", "username")
+TeacherFilter = input_filter("teacher", "teacher", "teacher__username", "username")
+CourseFilter  = input_filter("course", "course", "course__name__icontains", "nama kursus")
+UploaderFilter = input_filter("uploaded_by", "uploader", "uploaded_by__username", "username")
+
+
+# ─── Model admin ──────────────────────────────────────────────
+
+@admin.register(Tenant)
+class TenantAdmin(admin.ModelAdmin):
+    list_display = ["slug", "name", "created_at"]
+    search_fields = ["slug", "name"]
+
 @admin.register(Course)
 class CourseAdmin(admin.ModelAdmin):
-    list_display = ["name", "price", "description", "teacher", "created_at"]
-    list_filter  = ["teacher"]
+    list_display = ["name", "tenant", "price", "description", "teacher", "created_at"]
+    list_filter  = ["tenant", TeacherFilter]
+    list_select_related = ["teacher", "tenant"]
     search_fields = ["name", "description"]
-    readonly_fields = ["created_at", "updated_at"]
-    fields = ["name", "description", "price", "image", "teacher", "created_at", "updated_at"]
+    autocomplete_fields = ["teacher"]
+    readonly_fields = ["archived_at", "created_at", "updated_at"]
+    fields = [
+        "tenant", "name", "description", "price", "image", "teacher", "ends_at", "archived_at",
+        "created_at", "updated_at",
+    ]
+    actions = ["purge_courses"]
+
+    @admin.action(description="Hapus permanen di background (course besar)")
+    def purge_courses(self, request, queryset):
+        # delete bawaan admin memuat semua turunan ke memori; purge berjalan per potongan
+        jobs = [start_job("course", cid, requested_by=request.user.id)
+                for cid in queryset.values_list("id", flat=True)]
+        self.message_user(
+            request,
+            f"{len(jobs)} course diantrekan untuk dihapus: " + ", ".join(j["job_id"] for j in jobs),
+            messages.SUCCESS,
+        )
 
 @admin.register(CourseMember)
-class CourseMemberAdmin(admin.ModelAdmin):
-    list_display = ["course_id", "user_id", "roles", "created_at"]
-    list_filter  = ["roles"]
-    search_fields = ["user_id__username", "course_id__name"]
+class CourseMemberAdmin(LargeTableAdmin):
+    list_display = ["course", "user", "roles", "created_at"]
+    list_filter  = ["roles", CourseFilter]
+    list_select_related = ["course", "user"]
+    search_fields = ["user__username", "course__name"]
+    autocomplete_fields = ["course", "user"]
 
 @admin.register(CourseContent)
-class CourseContentAdmin(admin.ModelAdmin):
-    list_display = ["name", "course_id", "created_at"]
-    list_filter  = ["course_id"]
+class CourseContentAdmin(LargeTableAdmin):
+    list_display = ["name", "course", "comment_count", "created_at"]
+    list_filter  = [CourseFilter]
+    list_select_related = ["course"]
     search_fields = ["name", "description"]
-    readonly_fields = ["created_at", "updated_at"]
+    autocomplete_fields = ["course", "parent"]
+    readonly_fields = ["comment_count", "created_at", "updated_at"]
 
 @admin.register(Comment)
-class CommentAdmin(admin.ModelAdmin):
-    list_display = ["content_id", "member_id", "comment", "created_at"]
-    list_filter  = ["member_id__roles"]
+class CommentAdmin(LargeTableAdmin):
+    list_display = ["content", "member", "comment", "created_at"]
+    list_filter  = ["member__roles"]
+    list_select_related = ["content__course", "member__user", "member__course"]
     search_fields = ["comment"]
+    autocomplete_fields = ["content", "member"]
 
 @admin.register(Profile)
 class ProfileAdmin(admin.ModelAdmin):
     list_display = ["user", "handphone", "description"]
+    list_select_related = ["user"]
     search_fields = ["user__username", "handphone"]
+    autocomplete_fields = ["user"]
 
 @admin.register(Announcement)
-class AnnouncementAdmin(admin.ModelAdmin):
-    list_display = ["course", "title", "publish_date", "created_at"]
-    list_filter  = ["course"]
+class AnnouncementAdmin(LargeTableAdmin):
+    list_display = ["course", "title", "publish_date", "published_at", "created_at"]
+    list_filter  = [CourseFilter]
+    list_select_related = ["course"]
     search_fields = ["title", "message"]
+    autocomplete_fields = ["course"]
 
 @admin.register(CompletionTracking)
-class CompletionTrackingAdmin(admin.ModelAdmin):
+class CompletionTrackingAdmin(LargeTableAdmin):
     list_display = ["user", "content", "completed_at"]
-    list_filter  = ["user"]
+    list_filter  = [UserFilter]
+    list_select_related = ["user", "content__course"]
     search_fields = ["content__name"]
+    autocomplete_fields = ["user", "content"]
+
+@admin.register(MediaAsset)
+class MediaAssetAdmin(LargeTableAdmin):
+    list_display = ["sha256", "content_type", "size", "status", "uploaded_by", "created_at"]
+    list_filter  = ["status", UploaderFilter]
+    list_select_related = ["uploaded_by"]
+    search_fields = ["sha256"]
+    readonly_fields = ["sha256", "file", "size", "width", "height", "thumbnails"]
+    autocomplete_fields = ["uploaded_by"]
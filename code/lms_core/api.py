@@ -1,39 +1,108 @@
-from ninja import NinjaAPI, Router
+from ninja import NinjaAPI, Router, File, Query
+from ninja.files import UploadedFile
+from ninja.errors import Throttled
 from ninja.responses import Response
 from django.utils import timezone
+from lms_core import tenancy
+from django.http import FileResponse, StreamingHttpResponse
+from django.core.handlers.asgi import ASGIRequest
+from asgiref.sync import sync_to_async
+from django.db.models import F, Q, Sum
+from django.conf import settings
+from django.core.files.storage import default_storage
 from django.contrib.auth.models import User
 
-from ninja_simple_jwt.auth.views.api import mobile_auth_router
-from ninja_simple_jwt.auth.ninja_auth import HttpJwtAuth
+from lms_core.auth import JwtAuth, AsyncJwtAuth, mobile_auth_router
+from lms_core import events
 
+import asyncio
+import time
+from datetime import date, datetime, timedelta, timezone as dt_timezone
 from typing import List
+from lms_core.conditional import etag, aggregate_version
+from lms_core.renderers import default_renderer, project, trusted_response
+from lms_core.permissions import is_member, is_teacher, can_access, course_roles, member_course_ids
+from lms_core.throttling import UserWindowThrottle, IPWindowThrottle, ConcurrencyLimiter
+from lms_core.uploads import UploadRejected, store_upload
+from lms_core.tasks import enqueue
+from lms_core.idempotency import idempotent
+from lms_core.upsert import insert_ignore, upsert
+from lms_core import batch, categories, course_ops, profiling, purge, rollups, similarity
+from lms_core.utils import after_response
 from lms_core.schema import (
     RegisterInput, RegisterOutput,
     BatchEnrollInput, BatchEnrollOutput,
+    CourseCloneIn, CourseCloneOut, CourseArchiveOut, PurgeJobOut,
+    ArchivedCompletionOut, ArchivedCompletionPageOut, ArchivedCommentOut, ArchivedCommentPageOut,
+    BatchIn, BatchOut,
     AnnouncementIn, AnnouncementOut,
+    AnnouncementBulkIn, FeedbackBulkIn, BulkResultOut,
     CompletionInput, CompletionOut,
-    ProfileOut, ProfileEditInput,
+    ProfileOut, ProfileEditInput, MediaAssetOut, ProfileFileOut,
     CategoryIn, CategoryOut,
-    BookmarkIn, BookmarkOut,
-    FeedbackIn, FeedbackOut,
-    DashboardOut, CourseAnalyticsOut,
-    CourseContentMini,
+    BookmarkIn, BookmarkOut, BookmarkDetailOut, BookmarkBulkIn, BookmarkBulkOut,
+    FeedbackIn, FeedbackOut, FeedPageOut,
+    DashboardOut, CourseAnalyticsOut, FeedItemOut, CourseTimeseriesOut,
+    CourseContentMini, CourseRatingOut, SimilarCourseOut,
+    CourseCommentIn, CommentOut, CommentPageOut,
+    CommentBulkDeleteIn, CommentBulkDeleteOut,
 )
 from lms_core.models import (
     Course, CourseMember, CourseContent, Comment,
     Profile, Announcement, CompletionTracking,
-    Category, Bookmark, Feedback
+    Category, Bookmark, Feedback, CourseRating, MediaAsset,
+    ActivityRollup, ROLLUP_METRICS, SimilarCourse, CompletionArchive, CommentArchive,
 )
 
-apiv1 = NinjaAPI()
-auth = HttpJwtAuth()
+apiv1 = NinjaAPI(renderer=default_renderer)
+auth = JwtAuth()
+
+BULK_CHUNK_SIZE = 500
+
+def archived_conflict():
+    return Response({"detail": "Course sudah diarsipkan, data hanya bisa dibaca"}, status=409)
+
+def is_archived(course_id):
+    return Course.objects.filter(id=course_id).exclude(archived_at=None).exists()
+
+write_throttle = [UserWindowThrottle("writes"), IPWindowThrottle("writes_ip")]
+expensive = ConcurrencyLimiter("writes")
+
+
+@apiv1.exception_handler(Throttled)
+def throttled(request, exc):
+    response = apiv1.create_response(request, {"detail": str(exc)}, status=429)
+    if exc.wait:
+        response["Retry-After"] = str(max(int(exc.wait + 0.999), 1))
+    return response
+
+
+@apiv1.exception_handler(UploadRejected)
+def upload_rejected(request, exc):
+    return apiv1.create_response(request, {"detail": str(exc)}, status=exc.status)
+
+
+def bulk_summary(results, started):
+    elapsed = time.perf_counter() - started
+    counts = {"created": 0, "updated": 0, "error": 0}
+    for r in results:
+        counts[r["status"]] += 1
+    return {
+        "success":          counts["error"] == 0,
+        "created":          counts["created"],
+        "updated":          counts["updated"],
+        "failed":           counts["error"],
+        "elapsed_ms":       round(elapsed * 1000, 3),
+        "items_per_second": round(len(results) / elapsed, 1) if elapsed else 0.0,
+        "results":          results,
+    }
 
 
 # ─── AUTH ─────────────────────────────────────────────────
 auth_router = Router()
 auth_router.add_router("", mobile_auth_router)
 
-@auth_router.post("/register", response=RegisterOutput)
+@auth_router.post("/register", response=RegisterOutput, throttle=[IPWindowThrottle("register")])
 def register(request, data: RegisterInput):
     if User.objects.filter(username=data.username).exists():
         return {"success": False, "message": "Username sudah digunakan.", "user": None}
@@ -46,11 +115,15 @@ apiv1.add_router("/auth/", auth_router)
 # ─── BATCH ENROLL ───────────────────────────────────────────
 enroll_router = Router(auth=auth)
 
-@enroll_router.post("/batch-enroll", response=BatchEnrollOutput)
+@enroll_router.post("/batch-enroll", response=BatchEnrollOutput, throttle=write_throttle)
+@idempotent
+@expensive
 def batch_enroll(request, data: BatchEnrollInput):
     course = Course.objects.filter(id=data.course_id).first()
     if not course:
         return {"success": False, "message": "Course not found.", "enrolled": []}
+    if course.archived_at:
+        return archived_conflict()
 
     enrolled_payload = []
     for uid in data.user_ids:
@@ -69,6 +142,9 @@ def batch_enroll(request, data: BatchEnrollInput):
             "user_id":   user.id,
             "roles":     member.roles,
         })
+    if enrolled_payload:
+        # daftar course serupa dihitung ulang di worker kalau jumlah member berubah banyak
+        enqueue(similarity.refresh_if_stale, course.id)
 
     return {
         "success": True,
@@ -79,103 +155,299 @@ def batch_enroll(request, data: BatchEnrollInput):
 apiv1.add_router("/courses/", enroll_router)
 
 
+# ─── COURSE CLONE / ARCHIVE ────────────────────────────────
+course_ops_router = Router(auth=auth)
+
+@course_ops_router.post("/{course_id}/clone", response={201: CourseCloneOut}, throttle=write_throttle)
+@idempotent
+@expensive
+def clone_course(request, course_id: int, data: CourseCloneIn):
+    started = time.perf_counter()
+    course = Course.objects.filter(id=course_id).first()
+    if not course or not is_teacher(request, course_id):
+        return Response({"detail": "Forbidden"}, status=403)
+    new_course, contents, announcements = course_ops.clone_course(
+        course, request.user.id,
+        name=data.name, announcements=data.announcements, shift_days=data.shift_days,
+    )
+    return 201, {
+        "id":            new_course.id,
+        "name":          new_course.name,
+        "contents":      contents,
+        "announcements": announcements,
+        "elapsed_ms":    round((time.perf_counter() - started) * 1000, 3),
+    }
+
+@course_ops_router.post("/{course_id}/archive", response=CourseArchiveOut, throttle=write_throttle)
+@idempotent
+@expensive
+def archive_course(request, course_id: int):
+    started = time.perf_counter()
+    if not is_teacher(request, course_id):
+        return Response({"detail": "Forbidden"}, status=403)
+    try:
+        completions, comments = course_ops.archive_course(course_id)
+    except course_ops.CourseNotFinished as exc:
+        return Response({"detail": str(exc)}, status=409)
+    return {
+        "course_id":            course_id,
+        "completions_archived": completions,
+        "comments_archived":    comments,
+        "archived_at":          Course.objects.values_list("archived_at", flat=True).get(id=course_id),
+        "elapsed_ms":           round((time.perf_counter() - started) * 1000, 3),
+    }
+
+ARCHIVE_PAGE_MAX = 100
+
+def archive_page(qs, schema, before, limit):
+    limit = max(1, min(limit, ARCHIVE_PAGE_MAX))
+    if before:
+        qs = qs.filter(id__lt=before)
+    items = list(project(qs.order_by("-id"), schema)[:limit + 1])
+    has_more = len(items) > limit
+    items = items[:limit]
+    return {"next_before": items[-1]["id"] if has_more else None, "items": items}
+
+@course_ops_router.get("/{course_id}/archive/completions", response=ArchivedCompletionPageOut)
+def archived_completions(request, course_id: int, before: int = None, limit: int = 50):
+    if not can_access(request, course_id):
+        return Response({"detail": "Not found or forbidden"}, status=404)
+    # pengajar melihat semua completion, member hanya miliknya
+    qs = CompletionArchive.objects.filter(course_id=course_id)
+    if not is_teacher(request, course_id):
+        qs = qs.filter(user_id=request.user.id)
+    return archive_page(qs, ArchivedCompletionOut, before, limit)
+
+@course_ops_router.get("/{course_id}/archive/comments", response=ArchivedCommentPageOut)
+def archived_comments(request, course_id: int, content_id: int = None, before: int = None,
+                      limit: int = 20):
+    if not can_access(request, course_id):
+        return Response({"detail": "Not found or forbidden"}, status=404)
+    qs = CommentArchive.objects.filter(course_id=course_id)
+    if content_id:
+        qs = qs.filter(content_id=content_id)
+    return archive_page(qs, ArchivedCommentOut, before, limit)
+
+@course_ops_router.get("/purge-jobs/{job_id}", response=PurgeJobOut)
+def purge_job(request, job_id: str):
+    job = purge.job_status(job_id)
+    if not job or job["requested_by"] != request.user.id:
+        return Response({"detail": "Not found"}, status=404)
+    return job
+
+@course_ops_router.delete("/{course_id}", response={202: PurgeJobOut}, throttle=write_throttle)
+def delete_course(request, course_id: int):
+    # hapus course besar di worker; progress lewat GET /courses/purge-jobs/{job_id}
+    if not is_teacher(request, course_id):
+        return Response({"detail": "Forbidden"}, status=403)
+    return 202, purge.start_job("course", course_id, requested_by=request.user.id)
+
+apiv1.add_router("/courses/", course_ops_router)
+
+
 # ─── ANNOUNCEMENTS ─────────────────────────────────────────
 announce_router = Router(auth=auth)
 
 @announce_router.post("/{course_id}/announcements", response=AnnouncementOut)
+@idempotent
 def create_announcement(request, course_id: int, data: AnnouncementIn):
-    course = Course.objects.filter(id=course_id).first()
-    if not course or course.teacher != request.user:
+    if not is_teacher(request, course_id):
         return Response({"detail": "Forbidden"}, status=403)
-    return Announcement.objects.create(
-        course=course,
+    if is_archived(course_id):
+        return archived_conflict()
+    ann = Announcement(
+        course_id=course_id,
         title=data.title,
         message=data.message,
         publish_date=data.publish_date
     )
+    ann.save()
+    if ann.announced:
+        events.publish(course_id, "announcement.created", id=ann.id, title=ann.title)
+    return ann
 
-@announce_router.get("/{course_id}/announcements", response=List[AnnouncementOut])
-def list_announcements(request, course_id: int):
-    return list(
-        Announcement.objects.filter(
+@announce_router.post("/{course_id}/announcements/bulk", response=BulkResultOut)
+@idempotent
+def bulk_create_announcements(request, course_id: int, data: AnnouncementBulkIn):
+    started = time.perf_counter()
+    if not is_teacher(request, course_id):
+        return Response({"detail": "Forbidden"}, status=403)
+    if is_archived(course_id):
+        return archived_conflict()
+
+    objs = [
+        Announcement(
             course_id=course_id,
-            publish_date__lte=timezone.now()
+            title=item.title,
+            message=item.message,
+            publish_date=item.publish_date,
         )
+        for item in data.items
+    ]
+    now = timezone.now()
+    for obj in objs:
+        obj.schedule(now)
+    with tenancy.atomic():
+        Announcement.objects.bulk_create(objs, batch_size=BULK_CHUNK_SIZE)
+        published = [obj.id for obj in objs if obj.announced]
+        if published:
+            events.publish(course_id, "announcement.created", ids=published)
+
+    results = [
+        {"index": i, "id": obj.id, "status": "created"}
+        for i, obj in enumerate(objs)
+    ]
+    return bulk_summary(results, started)
+
+def published_announcements(course_id):
+    # published_at = waktu mulai tampil; baris terjadwal ikut terbaca begitu waktunya lewat,
+    # tanpa menunggu publish_announcements
+    return Announcement.objects.filter(
+        course_id=course_id,
+        published_at__lte=timezone.now()
+    )
+
+def announcements_version(request, course_id):
+    return aggregate_version(
+        Course.objects.filter(id=course_id),
+        announcements=(published_announcements(course_id), "updated_at"),
+    )
+
+@announce_router.get("/{course_id}/announcements", response=List[AnnouncementOut])
+@etag(announcements_version)
+def list_announcements(request, course_id: int):
+    return trusted_response(
+        request, project(published_announcements(course_id), AnnouncementOut)
     )
 
 @announce_router.put("/{course_id}/announcements/{ann_id}", response=AnnouncementOut)
 def edit_announcement(request, course_id: int, ann_id: int, data: AnnouncementIn):
     ann = Announcement.objects.filter(id=ann_id, course_id=course_id).first()
-    if not ann or ann.course.teacher != request.user:
+    if not ann or not is_teacher(request, course_id):
         return Response({"detail": "Forbidden"}, status=403)
+    if is_archived(course_id):
+        return archived_conflict()
     for k, v in data.dict().items():
         setattr(ann, k, v)
     ann.save()
+    if ann.is_visible():
+        events.publish(course_id, "announcement.updated", id=ann.id, title=ann.title)
     return ann
 
 @announce_router.delete("/{course_id}/announcements/{ann_id}")
 def delete_announcement(request, course_id: int, ann_id: int):
     ann = Announcement.objects.filter(id=ann_id, course_id=course_id).first()
-    if not ann or ann.course.teacher != request.user:
+    if not ann or not is_teacher(request, course_id):
         return Response({"detail": "Forbidden"}, status=403)
+    if is_archived(course_id):
+        return archived_conflict()
+    events.publish(course_id, "announcement.deleted", id=ann.id)
     ann.delete()
     return {"success": True}
 
 apiv1.add_router("/courses/", announce_router)
 
 
+# ─── FEED ──────────────────────────────────────────────────
+feed_router = Router(auth=auth)
+
+FEED_PAGE_MAX = 100
+FEED_SETTLE = timedelta(seconds=getattr(settings, "LMS_FEED_SETTLE", 5))
+EPOCH = datetime(1970, 1, 1, tzinfo=dt_timezone.utc)
+
+def feed_cursor(row):
+    # (published_at, id): banyak pengumuman bisa tampil di detik yang sama
+    micros = (row["published_at"] - EPOCH) // timedelta(microseconds=1)
+    return f"{micros}-{row['id']}"
+
+def parse_feed_cursor(cursor):
+    micros, ann_id = cursor.split("-")
+    return EPOCH + timedelta(microseconds=int(micros)), int(ann_id)
+
+@feed_router.get("/feed", response=FeedPageOut)
+def announcement_feed(request, since: str = None, before: str = None, limit: int = 20):
+    course_ids = member_course_ids(request)
+    limit = max(1, min(limit, FEED_PAGE_MAX))
+    # published_at diisi sebelum commit: baris yang belum `FEED_SETTLE` lama belum dikembalikan,
+    # supaya cursor tidak melewati pengumuman yang commit-nya terlambat
+    qs = Announcement.objects.filter(
+        course_id__in=course_ids, published_at__lte=timezone.now() - FEED_SETTLE
+    )
+    try:
+        if since:
+            ts, ann_id = parse_feed_cursor(since)
+            qs = qs.filter(Q(published_at__gt=ts) | Q(published_at=ts, id__gt=ann_id))
+        if before:
+            ts, ann_id = parse_feed_cursor(before)
+            qs = qs.filter(Q(published_at__lt=ts) | Q(published_at=ts, id__lt=ann_id))
+    except ValueError:
+        return Response({"detail": "Cursor tidak valid"}, status=400)
+
+    if since and not before:
+        # polling: ambil item terlama setelah cursor dulu supaya tidak ada yang terlewat
+        items = list(project(qs.order_by("published_at", "id"), FeedItemOut,
+                             course_name="course__name")[:limit])
+        items.reverse()
+        has_more = False
+    else:
+        items = list(project(qs.order_by("-published_at", "-id"), FeedItemOut,
+                             course_name="course__name")[:limit + 1])
+        has_more = len(items) > limit
+        items = items[:limit]
+    return {
+        "items":       items,
+        "cursor":      feed_cursor(items[0]) if items else since,
+        "next_before": feed_cursor(items[-1]) if has_more else None,
+    }
+
+apiv1.add_router("", feed_router)
+
+
 # ─── COMPLETION TRACKING ────────────────────────────────────
 completion_router = Router(auth=auth)
 
-@completion_router.post("/completions", response=CompletionOut)
+@completion_router.post("/completions", response=CompletionOut, throttle=write_throttle)
+@idempotent
+@expensive
 def add_completion(request, data: CompletionInput):
-    content = CourseContent.objects.filter(id=data.content_id).first()
+    content = (
+        CourseContent.objects.filter(id=data.content_id)
+        .values("course_id", "course__archived_at").first()
+    )
     if not content:
         return Response({"detail": "Content not found."}, status=404)
 
     # only members or teacher may mark complete
-    is_member  = CourseMember.objects.filter(course=content.course, user=request.user).exists()
-    is_teacher = (content.course.teacher == request.user)
-    if not (is_member or is_teacher):
+    if not can_access(request, content["course_id"]):
         return Response({"detail": "Forbidden."}, status=403)
+    if content["course__archived_at"]:
+        return archived_conflict()
 
-    comp, _ = CompletionTracking.objects.get_or_create(
-        user=request.user,
-        content=content
+    comp = upsert(
+        CompletionTracking, {"user_id": request.user.id, "content_id": data.content_id},
+        unique_fields=["user", "content"],
     )
     return {
         "id":         comp.id,
-        "user_id":    comp.user.id,
-        "content_id": comp.content.id,
+        "user_id":    comp.user_id,
+        "content_id": comp.content_id,
     }
 
 @completion_router.get("/courses/{course_id}/completions", response=List[CourseContentMini])
 def show_completions(request, course_id: int):
-    qs = CompletionTracking.objects.filter(
-        user=request.user,
-        content__course_id=course_id
-    ).select_related("content")
-
-    # serialize each content item into schema fields
-    return [
-        {
-            "id":          ct.content.id,
-            "name":        ct.content.name,
-            "description": ct.content.description,
-            "course_id":   ct.content.course.id,
-            "created_at":  ct.content.created_at,
-            "updated_at":  ct.content.updated_at,
-        }
-        for ct in qs
-    ]
+    qs = CourseContent.objects.filter(
+        course_id=course_id,
+        completions__user_id=request.user.id,
+    ).order_by("-completions__completed_at")
+    return trusted_response(request, project(qs, CourseContentMini))
 
 @completion_router.delete("/completions/{comp_id}")
 def delete_completion(request, comp_id: int):
-    comp = CompletionTracking.objects.filter(id=comp_id).first()
+    comp = CompletionTracking.objects.filter(id=comp_id).select_related("content").first()
     if not comp:
         return Response({"detail": "Not found"}, status=404)
     # allow owner or course teacher
-    if comp.user != request.user and comp.content.course.teacher != request.user:
+    if comp.user_id != request.user.id and not is_teacher(request, comp.content.course_id):
         return Response({"detail": "Forbidden"}, status=403)
     comp.delete()
     return {"success": True}
@@ -183,10 +455,176 @@ def delete_completion(request, comp_id: int):
 apiv1.add_router("", completion_router)
 
 
+# ─── COMMENTS ──────────────────────────────────────────────
+comment_router = Router(auth=auth)
+
+COMMENT_PAGE_MAX = 100
+
+def comment_rows(qs):
+    """List dict CommentOut. Username diambil dengan query kedua ke auth_user (database
+    default): komentar bisa tinggal di database tenant yang tidak punya tabel user."""
+    fields = [name for name in CommentOut.model_fields if name not in ("user_id", "username")]
+    rows = list(qs.values(*fields, user_id=F("member__user_id")))
+    names = dict(User.objects.filter(id__in={r["user_id"] for r in rows}).values_list("id", "username"))
+    for row in rows:
+        row["username"] = names.get(row["user_id"], "")
+    return rows
+
+def delete_comments(rows):
+    """Hapus komentar (list dict id/content_id) dan turunkan comment_count per konten."""
+    per_content, per_course = {}, {}
+    for row in rows:
+        per_content[row["content_id"]] = per_content.get(row["content_id"], 0) + 1
+        per_course.setdefault(row["content__course_id"], []).append(row["id"])
+    with tenancy.atomic():
+        deleted, _ = Comment.objects.filter(id__in=[r["id"] for r in rows]).delete()
+        for content_id, n in per_content.items():
+            CourseContent.objects.filter(id=content_id).update(
+                comment_count=F("comment_count") - n
+            )
+        for course_id, ids in per_course.items():
+            events.publish(course_id, "comment.deleted", ids=ids)
+    return deleted
+
+@comment_router.get("/contents/{content_id}/comments", response=CommentPageOut)
+def list_comments(request, content_id: int, limit: int = 20, before: int = None):
+    content = CourseContent.objects.filter(id=content_id).values("course_id", "comment_count").first()
+    if not content or not can_access(request, content["course_id"]):
+        return Response({"detail": "Not found or forbidden"}, status=404)
+
+    limit = max(1, min(limit, COMMENT_PAGE_MAX))
+    qs = Comment.objects.filter(content_id=content_id).order_by("-id")
+    if before:
+        qs = qs.filter(id__lt=before)
+    items = comment_rows(qs[:limit + 1])
+    has_more = len(items) > limit
+    items = items[:limit]
+    return {
+        "count":       content["comment_count"],
+        "next_before": items[-1]["id"] if has_more else None,
+        "items":       items,
+    }
+
+@comment_router.post("/contents/{content_id}/comments", response={201: CommentOut})
+@idempotent
+def add_comment(request, content_id: int, data: CourseCommentIn):
+    content = CourseContent.objects.filter(id=content_id).values("course_id", "course__archived_at").first()
+    if not content:
+        return Response({"detail": "Not found."}, status=404)
+    member_id = (
+        CourseMember.objects.filter(course_id=content["course_id"], user_id=request.user.id)
+        .values_list("id", flat=True)
+        .first()
+    )
+    if not member_id:
+        return Response({"detail": "Forbidden."}, status=403)
+    if content["course__archived_at"]:
+        return archived_conflict()
+
+    with tenancy.atomic():
+        comment = Comment.objects.create(
+            content_id=content_id, member_id=member_id, comment=data.comment
+        )
+        CourseContent.objects.filter(id=content_id).update(comment_count=F("comment_count") + 1)
+        events.publish(content["course_id"], "comment.created",
+                       id=comment.id, content_id=content_id, user_id=request.user.id)
+    return 201, comment_rows(Comment.objects.filter(id=comment.id))[0]
+
+@comment_router.post("/comments/bulk-delete", response=CommentBulkDeleteOut)
+@idempotent
+def bulk_delete_comments(request, data: CommentBulkDeleteIn):
+    rows = list(
+        Comment.objects.filter(id__in=data.ids)
+        .values("id", "content_id", "content__course_id", "member__user_id")
+    )
+    found     = {r["id"] for r in rows}
+    allowed   = [
+        r for r in rows
+        if r["member__user_id"] == request.user.id or is_teacher(request, r["content__course_id"])
+    ]
+    allowed_ids = {r["id"] for r in allowed}
+    deleted = delete_comments(allowed) if allowed else 0
+    return {
+        "deleted":   deleted,
+        "forbidden": sorted(found - allowed_ids),
+        "not_found": sorted(set(data.ids) - found),
+    }
+
+@comment_router.delete("/comments/{comment_id}")
+def delete_comment(request, comment_id: int):
+    row = (
+        Comment.objects.filter(id=comment_id)
+        .values("id", "content_id", "content__course_id", "member__user_id")
+        .first()
+    )
+    if not row:
+        return Response({"detail": "Not found"}, status=404)
+    if row["member__user_id"] != request.user.id and not is_teacher(request, row["content__course_id"]):
+        return Response({"detail": "Forbidden"}, status=403)
+    delete_comments([row])
+    return {"success": True}
+
+apiv1.add_router("", comment_router)
+
+
+# ─── MEDIA ──────────────────────────────────────────────────
+media_router = Router(auth=auth)
+
+def asset_out(asset):
+    return {
+        "sha256":       asset.sha256,
+        "url":          asset.file.url,
+        "content_type": asset.content_type,
+        "size":         asset.size,
+        "width":        asset.width,
+        "height":       asset.height,
+        "status":       asset.status,
+        "thumbnails":   {k: default_storage.url(v) for k, v in asset.thumbnails.items()},
+    }
+
+def _asset_cache_header(request, response):
+    # metadata hanya berubah saat thumbnail selesai; setelah itu isi per sha256 tidak pernah berubah
+    if response.status_code == 200 and getattr(request, "lms_asset_ready", False):
+        response["Cache-Control"] = "private, max-age=86400"
+
+def cache_ready_asset(view_func):
+    return after_response(view_func, _asset_cache_header)
+
+@media_router.post("/media", response={200: MediaAssetOut, 201: MediaAssetOut},
+                   throttle=write_throttle)
+@expensive
+def upload_media(request, file: UploadedFile = File(...)):
+    if file.size > settings.LMS_UPLOAD_MAX_BYTES:
+        return Response({"detail": "File terlalu besar"}, status=413)
+    asset, created = store_upload(request, file)
+    return (201 if created else 200), asset_out(asset)
+
+@media_router.get("/media/{sha256}", response=MediaAssetOut)
+@cache_ready_asset
+def show_media(request, sha256: str):
+    asset = MediaAsset.objects.filter(sha256=sha256).first()
+    if not asset:
+        return Response({"detail": "Not found"}, status=404)
+    request.lms_asset_ready = asset.status != "pending"
+    return asset_out(asset)
+
+apiv1.add_router("", media_router)
+
+
 # ─── PROFILE ────────────────────────────────────────────────
 profile_router = Router(auth=auth)
 
+def profile_version(request, user_id):
+    return aggregate_version(
+        User.objects.filter(id=user_id),
+        fields=("username", "email", "first_name", "last_name",
+                "profile__handphone", "profile__description", "profile__image"),
+        enrolled=(Course.objects.filter(members__user_id=user_id), "updated_at"),
+        created=(Course.objects.filter(teacher_id=user_id), "updated_at"),
+    )
+
 @profile_router.get("/profile/{user_id}", response=ProfileOut)
+@etag(profile_version)
 def show_profile(request, user_id: int):
     user = User.objects.filter(id=user_id).first()
     if not user:
@@ -211,7 +649,16 @@ def show_profile(request, user_id: int):
 def edit_profile(request, data: ProfileEditInput):
     user = request.user
     prof, _ = Profile.objects.get_or_create(user=user)
-    for field, val in data.dict(exclude_unset=True).items():
+    changes = data.dict(exclude_unset=True)
+    if changes.get("profile_image"):
+        asset = MediaAsset.objects.filter(sha256=changes.pop("profile_image")).first()
+        if not asset or not asset.is_image:
+            return Response({"detail": "profile_image harus sha256 gambar dari /media"}, status=400)
+        prof.image = asset.file.name   # pakai file yang sama, tanpa salin
+    elif "profile_image" in changes:
+        changes.pop("profile_image")
+        prof.image = None
+    for field, val in changes.items():
         if hasattr(user, field):
             setattr(user, field, val)
         else:
@@ -240,16 +687,22 @@ apiv1.add_router("", profile_router)
 category_router = Router(auth=auth)
 
 @category_router.post("/categories", response=CategoryOut)
+@idempotent
 def add_category(request, data: CategoryIn):
-    return Category.objects.create(name=data.name, user=request.user)
+    return Category.objects.create(name=data.name, user_id=request.user.id)
 
 @category_router.get("/categories", response=List[CategoryOut])
-def list_categories(request):
-    return list(Category.objects.all())
+def list_categories(request, scope: str = "all"):
+    # scope: all = milik sendiri + global, mine, global
+    if scope not in categories.SCOPES:
+        return Response({"detail": f"scope harus salah satu dari {', '.join(categories.SCOPES)}"},
+                        status=400)
+    return trusted_response(request, categories.category_list(request.user.id, scope))
 
 @category_router.delete("/categories/{cat_id}")
 def delete_category(request, cat_id: int):
-    cat = Category.objects.filter(id=cat_id, user=request.user).first()
+    # kategori global hanya bisa dihapus lewat admin
+    cat = Category.objects.filter(id=cat_id, user_id=request.user.id).first()
     if not cat:
         return Response({"detail": "Not found or forbidden"}, status=404)
     cat.delete()
@@ -262,20 +715,93 @@ apiv1.add_router("", category_router)
 bookmark_router = Router(auth=auth)
 
 @bookmark_router.post("/contents/{content_id}/bookmarks", response=BookmarkOut)
+@idempotent
 def add_bookmark(request, content_id: int, data: BookmarkIn):
-    content = CourseContent.objects.filter(id=content_id).first()
+    content = CourseContent.objects.filter(id=content_id).values("id", "course__archived_at").first()
     if not content:
         return Response({"detail": "Not found."}, status=404)
-    bm, _ = Bookmark.objects.get_or_create(user=request.user, content=content)
-    return bm
+    if content["course__archived_at"]:
+        return archived_conflict()
+    return upsert(
+        Bookmark, {"user_id": request.user.id, "content_id": content["id"]},
+        unique_fields=["user", "content"],
+    )
+
+def bookmarks_version(request):
+    return aggregate_version(
+        User.objects.filter(id=request.user.id),
+        bookmarks=(Bookmark.objects.filter(user_id=request.user.id), "id"),
+    )
 
 @bookmark_router.get("/bookmarks", response=List[BookmarkOut])
+@etag(bookmarks_version)
 def list_bookmarks(request):
-    return list(Bookmark.objects.filter(user=request.user))
+    return trusted_response(
+        request, project(Bookmark.objects.filter(user_id=request.user.id), BookmarkOut)
+    )
+
+def bookmark_details_version(request):
+    uid = request.user.id
+    return aggregate_version(
+        User.objects.filter(id=uid),
+        bookmarks=(Bookmark.objects.filter(user_id=uid), "id"),
+        completions=(CompletionTracking.objects.filter(user_id=uid), "id"),
+        contents=(CourseContent.objects.filter(bookmarks__user_id=uid), "updated_at"),
+        courses=(Course.objects.filter(contents__bookmarks__user_id=uid), "updated_at"),
+    )
+
+@bookmark_router.get("/bookmarks/detailed", response=List[BookmarkDetailOut])
+@etag(bookmark_details_version)
+def list_bookmark_details(request):
+    # satu query JOIN content+course, satu query completion untuk content tersebut
+    rows = list(
+        Bookmark.objects.filter(user_id=request.user.id).order_by("-id").values(
+            "id", "content_id", "created_at",
+            content_name=F("content__name"),
+            course_id=F("content__course_id"),
+            course_name=F("content__course__name"),
+        )
+    )
+    completed = set(
+        CompletionTracking.objects.filter(
+            user_id=request.user.id, content_id__in=[r["content_id"] for r in rows]
+        ).values_list("content_id", flat=True)
+    )
+    for row in rows:
+        row["completed"] = row["content_id"] in completed
+    return trusted_response(request, rows)
+
+@bookmark_router.post("/bookmarks/bulk", response=BookmarkBulkOut)
+@idempotent
+def bulk_toggle_bookmarks(request, data: BookmarkBulkIn):
+    uid = request.user.id
+    wanted = set(data.add) | set(data.remove)
+    rows = CourseContent.objects.filter(id__in=wanted).values_list("id", "course__archived_at")
+    existing_contents = set()
+    for content_id, archived_at in rows:
+        if archived_at:
+            return archived_conflict()
+        existing_contents.add(content_id)
+    add = set(data.add) & existing_contents
+    remove = (set(data.remove) & existing_contents) - add
+    with tenancy.atomic():
+        already = set(
+            Bookmark.objects.filter(user_id=uid, content_id__in=add).values_list("content_id", flat=True)
+        )
+        added = sorted(add - already)
+        Bookmark.objects.bulk_create(
+            [Bookmark(user_id=uid, content_id=cid) for cid in added],
+            batch_size=BULK_CHUNK_SIZE, ignore_conflicts=True,
+        )
+        removed = sorted(
+            Bookmark.objects.filter(user_id=uid, content_id__in=remove).values_list("content_id", flat=True)
+        )
+        Bookmark.objects.filter(user_id=uid, content_id__in=removed).delete()
+    return {"added": added, "removed": removed, "not_found": sorted(wanted - existing_contents)}
 
 @bookmark_router.delete("/bookmarks/{bookmark_id}")
 def delete_bookmark(request, bookmark_id: int):
-    bm = Bookmark.objects.filter(id=bookmark_id, user=request.user).first()
+    bm = Bookmark.objects.filter(id=bookmark_id, user_id=request.user.id).first()
     if not bm:
         return Response({"detail": "Not found"}, status=404)
     bm.delete()
@@ -287,31 +813,117 @@ apiv1.add_router("", bookmark_router)
 # ─── FEEDBACK ──────────────────────────────────────────────
 feedback_router = Router(auth=auth)
 
-@feedback_router.post("/{course_id}/feedback", response=FeedbackOut)
+@feedback_router.post("/{course_id}/feedback", response=FeedbackOut, throttle=write_throttle)
+@idempotent
+@expensive
 def add_feedback(request, course_id: int, data: FeedbackIn):
-    course  = Course.objects.filter(id=course_id).first()
-    allowed = CourseMember.objects.filter(course=course, user=request.user).exists()
-    if not course or not allowed:
+    if not is_member(request, course_id):
         return Response({"detail": "Forbidden or not found"}, status=403)
-    fb, _ = Feedback.objects.update_or_create(
-        course=course,
-        user=request.user,
-        defaults={"message": data.message, "rating": data.rating}
-    )
+    if is_archived(course_id):
+        return archived_conflict()
+    values = {
+        "course_id": course_id, "user_id": request.user.id,
+        "message": data.message, "rating": data.rating,
+    }
+    with tenancy.atomic():
+        fb = insert_ignore(Feedback, values, unique_fields=["course", "user"])
+        created, old_rating = fb is not None, None
+        if not created:
+            # sudah ada: kunci baris lama supaya delta agregat rating konsisten
+            old_rating = (
+                Feedback.objects.select_for_update()
+                .filter(course_id=course_id, user_id=request.user.id)
+                .values_list("rating", flat=True)
+                .first()
+            )
+            fb = upsert(Feedback, values, unique_fields=["course", "user"],
+                        update_fields=["message", "rating", "updated_at"])
+        CourseRating.apply(course_id, old_rating, fb.rating)
+        events.publish(course_id, "feedback.created" if created else "feedback.updated",
+                       id=fb.id, user_id=fb.user_id, rating=fb.rating)
     return fb
 
+@feedback_router.post("/{course_id}/feedback/bulk", response=BulkResultOut)
+@idempotent
+def bulk_import_feedback(request, course_id: int, data: FeedbackBulkIn):
+    started = time.perf_counter()
+    course = Course.objects.filter(id=course_id).first()
+    if not course or not is_teacher(request, course_id):
+        return Response({"detail": "Forbidden"}, status=403)
+    if course.archived_at:
+        return archived_conflict()
+
+    user_ids = {item.user_id for item in data.items}
+    members  = set(
+        CourseMember.objects.filter(course=course, user_id__in=user_ids)
+        .values_list("user_id", flat=True)
+    )
+    existing = {
+        fb.user_id: fb
+        for fb in Feedback.objects.filter(course=course, user_id__in=user_ids)
+    }
+
+    now = timezone.now()
+    results, to_create, to_update, seen = [], [], [], set()
+    for i, item in enumerate(data.items):
+        if item.user_id not in members:
+            results.append({"index": i, "id": None, "status": "error",
+                            "detail": "User is not a member of this course."})
+            continue
+        if item.user_id in seen:
+            results.append({"index": i, "id": None, "status": "error",
+                            "detail": "Duplicate user_id in payload."})
+            continue
+        seen.add(item.user_id)
+
+        fb = existing.get(item.user_id)
+        if fb:
+            fb.message, fb.rating, fb.updated_at = item.message, item.rating, now
+            to_update.append(fb)
+            results.append({"index": i, "id": fb.id, "status": "updated"})
+        else:
+            # bulk_create tidak lewat save(): tenant diisi dari course
+            fb = Feedback(course=course, tenant_id=course.tenant_id, user_id=item.user_id,
+                          message=item.message, rating=item.rating)
+            to_create.append(fb)
+            results.append({"index": i, "obj": fb, "status": "created"})
+
+    with tenancy.atomic():
+        Feedback.objects.bulk_create(to_create, batch_size=BULK_CHUNK_SIZE)
+        Feedback.objects.bulk_update(
+            to_update, ["message", "rating", "updated_at"], batch_size=BULK_CHUNK_SIZE
+        )
+        # satu recompute lebih murah daripada delta per baris
+        CourseRating.rebuild(course.id)
+        if to_create or to_update:
+            events.publish(course.id, "feedback.imported",
+                           created=len(to_create), updated=len(to_update))
+
+    for r in results:
+        if "obj" in r:
+            r["id"] = r.pop("obj").id
+    return bulk_summary(results, started)
+
 @feedback_router.get("/{course_id}/feedback", response=List[FeedbackOut])
 def list_feedback(request, course_id: int):
-    return list(Feedback.objects.filter(course_id=course_id))
+    return trusted_response(
+        request, project(Feedback.objects.filter(course_id=course_id), FeedbackOut)
+    )
 
 @feedback_router.put("/{course_id}/feedback/{fb_id}", response=FeedbackOut)
 def edit_feedback(request, course_id: int, fb_id: int, data: FeedbackIn):
     fb = Feedback.objects.filter(id=fb_id, course_id=course_id, user=request.user).first()
     if not fb:
         return Response({"detail": "Not found or forbidden"}, status=404)
-    fb.message = data.message
-    fb.rating  = data.rating
-    fb.save()
+    if is_archived(course_id):
+        return archived_conflict()
+    with tenancy.atomic():
+        old_rating = fb.rating
+        fb.message = data.message
+        fb.rating  = data.rating
+        fb.save()
+        CourseRating.apply(course_id, old_rating, fb.rating)
+        events.publish(course_id, "feedback.updated", id=fb.id, user_id=fb.user_id, rating=fb.rating)
     return fb
 
 @feedback_router.delete("/{course_id}/feedback/{fb_id}")
@@ -319,21 +931,79 @@ def delete_feedback(request, course_id: int, fb_id: int):
     fb = Feedback.objects.filter(id=fb_id, course_id=course_id, user=request.user).first()
     if not fb:
         return Response({"detail": "Not found or forbidden"}, status=404)
-    fb.delete()
+    if is_archived(course_id):
+        return archived_conflict()
+    with tenancy.atomic():
+        events.publish(course_id, "feedback.deleted", id=fb.id)
+        fb.delete()
+        CourseRating.apply(course_id, fb.rating, None)
     return {"success": True}
 
+@feedback_router.get("/{course_id}/ratings", response=CourseRatingOut)
+def course_ratings(request, course_id: int):
+    if not Course.objects.filter(id=course_id).exists():
+        return Response({"detail": "Not found"}, status=404)
+    rating = CourseRating.objects.filter(course_id=course_id).first()
+    if not rating:
+        rating = CourseRating(course_id=course_id)
+    return {
+        "course_id":    course_id,
+        "rating_count": rating.rating_count,
+        "average":      rating.average,
+        "stddev":       rating.stddev,
+        "histogram":    rating.histogram,
+    }
+
 apiv1.add_router("/courses/", feedback_router)
 
 
+# ─── EVENTS (SSE) ──────────────────────────────────────────
+# async: koneksi idle hanya menunggu di event loop (butuh server ASGI, mis. uvicorn)
+events_router = Router(auth=AsyncJwtAuth())
+
+@events_router.get("/{course_id}/events")
+async def course_events(request, course_id: int):
+    # di bawah WSGI iterator async dikonsumsi sampai habis: request menggantung selamanya
+    if not isinstance(request, ASGIRequest):
+        return Response({"detail": "Stream event butuh server ASGI"}, status=501)
+    if not await sync_to_async(can_access)(request, course_id):
+        return Response({"detail": "Not found or forbidden"}, status=404)
+    if events.broker.subscriber_count() >= settings.LMS_EVENTS_MAX_SUBSCRIBERS:
+        response = Response({"detail": "Terlalu banyak koneksi"}, status=503)
+        response["Retry-After"] = "5"
+        return response
+    last_id = request.headers.get("Last-Event-ID")
+    response = StreamingHttpResponse(
+        events.stream(events.channel_for(course_id), int(last_id) if last_id and last_id.isdigit() else None),
+        content_type="text/event-stream",
+    )
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"
+    return response
+
+apiv1.add_router("/courses/", events_router)
+
+
 # ─── DASHBOARD ─────────────────────────────────────────────
 dashboard_router = Router(auth=auth)
 
+def dashboard_version(request):
+    uid = request.user.id
+    return aggregate_version(
+        User.objects.filter(id=uid),
+        enrolled=(CourseMember.objects.filter(user_id=uid), "id"),
+        created=(Course.objects.filter(teacher_id=uid), "id"),
+        comments=(Comment.objects.filter(member__user_id=uid), "id"),
+        completions=(CompletionTracking.objects.filter(user_id=uid), "id"),
+    )
+
 @dashboard_router.get("/dashboard", response=DashboardOut)
+@etag(dashboard_version)
 def user_dashboard(request):
-    enrolled_count    = CourseMember.objects.filter(user=request.user).count()
-    created_count     = Course.objects.filter(teacher=request.user).count()
-    comments_count    = Comment.objects.filter(member__user=request.user).count()
-    completions_count = CompletionTracking.objects.filter(user=request.user).count()
+    enrolled_count    = CourseMember.objects.filter(user_id=request.user.id).count()
+    created_count     = Course.objects.filter(teacher_id=request.user.id).count()
+    comments_count    = Comment.objects.filter(member__user_id=request.user.id).count()
+    completions_count = CompletionTracking.objects.filter(user_id=request.user.id).count()
     return {
         "courses_enrolled":   enrolled_count,
         "courses_created":    created_count,
@@ -350,22 +1020,144 @@ analytics_router = Router(auth=auth)
 @analytics_router.get("/{course_id}/analytics", response=CourseAnalyticsOut)
 def course_analytics(request, course_id: int):
     course = Course.objects.filter(id=course_id).first()
-    if not course or (
-        course.teacher != request.user and
-        not CourseMember.objects.filter(course=course, user=request.user).exists()
-    ):
+    if not course or not can_access(request, course_id):
         return Response({"detail": "Not found or forbidden"}, status=404)
 
     members_count   = CourseMember.objects.filter(course=course).count()
     contents_count  = CourseContent.objects.filter(course=course).count()
-    comments_count  = Comment.objects.filter(content__course=course).count()
+    comments_count  = CourseContent.objects.filter(course=course).aggregate(
+        n=Sum("comment_count")
+    )["n"] or 0
     feedback_count  = Feedback.objects.filter(course=course).count()
+    rating          = CourseRating.objects.filter(course=course).first()
 
     return {
         "members_count":   members_count,
         "contents_count":  contents_count,
         "comments_count":  comments_count,
         "feedback_count":  feedback_count,
+        "rating_count":    rating.rating_count if rating else 0,
+        "average_rating":  rating.average if rating else None,
+    }
+
+TIMESERIES_MAX_DAYS = 366
+
+@analytics_router.get("/{course_id}/analytics/timeseries", response=CourseTimeseriesOut)
+def course_timeseries(request, course_id: int, start: date = None, end: date = None,
+                      metric: List[str] = Query(None)):
+    if not is_teacher(request, course_id):
+        return Response({"detail": "Not found or forbidden"}, status=404)
+    metrics = [m for m, _ in ROLLUP_METRICS]
+    if metric:
+        unknown = set(metric) - set(metrics)
+        if unknown:
+            return Response({"detail": f"Metric tidak dikenal: {', '.join(sorted(unknown))}"}, status=400)
+        metrics = [m for m in metrics if m in metric]
+    end = end or timezone.now().date()
+    start = start or end - timedelta(days=29)
+    if start > end or (end - start).days >= TIMESERIES_MAX_DAYS:
+        return Response({"detail": f"Rentang tanggal maksimal {TIMESERIES_MAX_DAYS} hari"}, status=400)
+
+    values = {
+        (metric_name, day): value
+        for metric_name, day, value in ActivityRollup.objects.filter(
+            course_id=course_id, metric__in=metrics, day__range=(start, end)
+        ).values_list("metric", "day", "value")
+    }
+    days = [start + timedelta(days=i) for i in range((end - start).days + 1)]
+    return {
+        "course_id":  course_id,
+        "start":      start,
+        "end":        end,
+        "series":     {
+            m: [{"day": d, "value": values.get((m, d), 0)} for d in days] for m in metrics
+        },
+        "updated_at": rollups.watermark_time(),
     }
 
 apiv1.add_router("/courses/", analytics_router)
+
+
+# ─── SIMILAR COURSES ───────────────────────────────────────
+similar_router = Router(auth=auth)
+
+@similar_router.get("/{course_id}/similar", response=List[SimilarCourseOut])
+def similar_courses(request, course_id: int):
+    # daftar sudah dihitung build_similar_courses; subquery Course menjaga batas tenant
+    rows = list(
+        SimilarCourse.objects.filter(
+            course__in=Course.objects.filter(id=course_id), similar__archived_at=None
+        ).order_by("rank").values("similar_id", "similar__name", "score", "shared")
+    )
+    if not rows and not Course.objects.filter(id=course_id).exists():
+        return Response({"detail": "Not found"}, status=404)
+    roles = course_roles(request)
+    return [
+        {"id": r["similar_id"], "name": r["similar__name"], "score": r["score"], "shared": r["shared"]}
+        for r in rows
+        # course yang sudah diikuti/diajar user tidak perlu direkomendasikan
+        if r["similar_id"] not in roles["member"] and r["similar_id"] not in roles["teacher"]
+    ]
+
+apiv1.add_router("/courses/", similar_router)
+
+
+# ─── BATCH ─────────────────────────────────────────────────
+batch_router = Router(auth=AsyncJwtAuth())
+
+@batch_router.post("/batch", response=BatchOut)
+async def run_batch(request, data: BatchIn):
+    started = time.perf_counter()
+    if len(data.requests) > batch.MAX_REQUESTS:
+        return Response({"detail": f"Maksimal {batch.MAX_REQUESTS} request per batch"}, status=400)
+    parallel = await sync_to_async(batch.prepare_parent)(request)
+
+    # GET berurutan dijalankan paralel; request tulis menjadi pembatas dan berjalan sesuai urutan
+    results, reads = [], []
+
+    async def flush_reads():
+        if parallel:
+            results.extend(await asyncio.gather(*(
+                sync_to_async(batch.run_item_in_thread, thread_sensitive=False)(request, item)
+                for item in reads
+            )))
+        else:
+            for item in reads:
+                results.append(await sync_to_async(batch.run_item)(request, item))
+        reads.clear()
+
+    for item in data.requests:
+        if item.method.upper() == "GET":
+            reads.append(item)
+            continue
+        await flush_reads()
+        results.append(await sync_to_async(batch.run_item)(request, item))
+    await flush_reads()
+
+    return {"responses": results, "elapsed_ms": round((time.perf_counter() - started) * 1000, 3)}
+
+apiv1.add_router("", batch_router)
+
+
+# ─── DEBUG PROFILES ────────────────────────────────────────
+debug_router = Router(auth=auth)
+
+@debug_router.get("/debug/profiles", response=List[ProfileFileOut])
+def list_request_profiles(request):
+    if not profiling.is_staff(request):
+        return Response({"detail": "Forbidden"}, status=403)
+    return profiling.list_profiles()
+
+@debug_router.get("/debug/profiles/{name}")
+def download_request_profile(request, name: str):
+    if not profiling.is_staff(request):
+        return Response({"detail": "Forbidden"}, status=403)
+    path = profiling.profile_path(name)
+    if path is None:
+        return Response({"detail": "Not found"}, status=404)
+    return FileResponse(path.open("rb"), as_attachment=True, filename=name)
+
+apiv1.add_router("", debug_router)
+
+# harus setelah semua add_router: membungkus operation yang sudah terdaftar
+profiling.install(apiv1)
@@ -0,0 +1,46 @@
+from asgiref.sync import sync_to_async
+from ninja import Router
+from ninja.security import HttpBearer
+from ninja_simple_jwt.auth.views.schemas import (
+    SignInRequest, MobileSignInResponse,
+    MobileTokenRefreshRequest, MobileTokenRefreshResponse,
+)
+
+# ninja_simple_jwt.auth.* menarik pyjwt + cryptography saat diimpor. Modul ini hanya
+# memakai schema-nya (ringan) dan baru mengimpor sisanya saat token pertama dipakai,
+# supaya boot worker dan management command tidak ikut membayar.
+
+
+class JwtAuth(HttpBearer):
+    _delegate = None
+
+    def authenticate(self, request, token):
+        # sub-request dari /batch: token induk sudah diverifikasi (lihat lms_core/batch.py)
+        if getattr(request, "lms_authenticated", False):
+            return True
+        if JwtAuth._delegate is None:
+            from ninja_simple_jwt.auth.ninja_auth import HttpJwtAuth
+            JwtAuth._delegate = HttpJwtAuth()
+        return JwtAuth._delegate.authenticate(request, token)
+
+
+class AsyncJwtAuth(JwtAuth):
+    """JwtAuth untuk view async; request.user (session) diakses di thread sync."""
+
+    async def __call__(self, request):
+        return await sync_to_async(super().__call__)(request)
+
+
+mobile_auth_router = Router()
+
+
+@mobile_auth_router.post("/sign-in", response=MobileSignInResponse, url_name="mobile_signin")
+def mobile_sign_in(request, payload: SignInRequest):
+    from ninja_simple_jwt.auth.views.api import mobile_sign_in
+    return mobile_sign_in(request, payload)
+
+
+@mobile_auth_router.post("/token-refresh", response=MobileTokenRefreshResponse, url_name="mobile_token_refresh")
+def mobile_token_refresh(request, payload: MobileTokenRefreshRequest):
+    from ninja_simple_jwt.auth.views.api import mobile_token_refresh
+    return mobile_token_refresh(request, payload)
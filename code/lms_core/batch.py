@@ -0,0 +1,129 @@
+"""
+Eksekusi beberapa operation apiv1 dalam satu request (POST /batch).
+
+Tiap sub-request adalah salinan dangkal request induk: user hasil verifikasi JWT,
+cache peran per request (_lms_course_roles) dan header ikut terbawa, sehingga token
+hanya diverifikasi sekali. Operation dipanggil langsung lewat URL resolver, jadi
+auth/throttle/validasi/serialisasi tetap milik operation masing-masing.
+"""
+import copy
+import json
+from io import BytesIO
+
+from django.db import close_old_connections, connections
+from django.http import QueryDict, StreamingHttpResponse
+from django.urls import Resolver404, resolve
+
+from lms_core.permissions import course_roles
+
+API_PREFIX = "/api/v1"
+MAX_REQUESTS = 20
+# endpoint yang tidak bisa dijalankan di dalam batch
+NOT_BATCHABLE = ("/batch", "/media")
+PASSED_HEADERS = ("If-None-Match", "Idempotency-Key")
+RETURNED_HEADERS = ("ETag", "Retry-After", "Idempotent-Replayed")
+
+
+def prepare_parent(request):
+    """Isi cache per request di induk sebelum disalin, supaya semua sub-request memakai objek yang sama.
+
+    Return True kalau GET boleh dijalankan paralel di thread lain. Di dalam transaksi
+    yang sudah terbuka (ATOMIC_REQUESTS, test/benchmark) thread lain memakai koneksi
+    sendiri: tidak melihat data yang belum commit dan di SQLite menunggu lock sampai
+    timeout, jadi GET dijalankan berurutan di koneksi induk.
+    """
+    course_roles(request)
+    request.lms_authenticated = True
+    return not any(conn.in_atomic_block for conn in connections.all(initialized_only=True))
+
+
+def _sub_request(request, item):
+    path, _, query = item.path.partition("?")
+    body = b"" if item.body is None else json.dumps(item.body).encode()
+
+    sub = copy.copy(request)
+    for attr in ("_post", "_files", "GET", "headers", "lms_etag", "auth"):
+        sub.__dict__.pop(attr, None)
+    sub.META = dict(request.META)
+    for name in PASSED_HEADERS:
+        sub.META.pop("HTTP_" + name.upper().replace("-", "_"), None)
+    for name, value in item.headers.items():
+        if name in PASSED_HEADERS:
+            sub.META["HTTP_" + name.upper().replace("-", "_")] = value
+    sub.method = item.method.upper()
+    sub.path = sub.path_info = API_PREFIX + path
+    sub.META.update({
+        "REQUEST_METHOD": sub.method,
+        "PATH_INFO": sub.path_info,
+        "QUERY_STRING": query,
+        "CONTENT_TYPE": "application/json",
+        "CONTENT_LENGTH": str(len(body)),
+    })
+    sub.GET = QueryDict(query)
+    sub._body = body
+    sub._stream = BytesIO(body)
+    sub._read_started = False
+    return sub
+
+
+def select_fields(data, fields):
+    """Pangkas data ke path bertitik di `fields` (mis. ["id", "course.name"]); list dipetakan per item."""
+    tree = {}
+    for field in fields:
+        node = tree
+        for part in field.split("."):
+            node = node.setdefault(part, {})
+    return _prune(data, tree)
+
+
+def _prune(data, tree):
+    if not tree:
+        return data
+    if isinstance(data, list):
+        return [_prune(item, tree) for item in data]
+    if isinstance(data, dict):
+        return {key: _prune(data[key], sub) for key, sub in tree.items() if key in data}
+    return data
+
+
+def _error(item, status, detail):
+    return {"id": item.id, "status": status, "headers": {}, "body": {"detail": detail}}
+
+
+def run_item(request, item):
+    """Jalankan satu sub-request secara sync. Return dict hasil (id, status, headers, body)."""
+    path = item.path.partition("?")[0]
+    if not path.startswith("/") or path.startswith(NOT_BATCHABLE) or path.endswith("/events"):
+        return _error(item, 400, "Path tidak bisa dipakai di batch")
+    try:
+        match = resolve(API_PREFIX + path)
+    except Resolver404:
+        return _error(item, 404, "Not Found")
+
+    sub = _sub_request(request, item)
+    sub.resolver_match = match
+    response = match.func(sub, *match.args, **match.kwargs)
+    if isinstance(response, StreamingHttpResponse):
+        return _error(item, 400, "Response streaming tidak didukung di batch")
+
+    body = None
+    if response.content and response.get("Content-Type", "").startswith("application/json"):
+        body = json.loads(response.content)
+        if item.fields and response.status_code < 300:
+            body = select_fields(body, item.fields)
+    elif response.content:
+        body = response.content.decode(errors="replace")
+    return {
+        "id":      item.id,
+        "status":  response.status_code,
+        "headers": {h: response[h] for h in RETURNED_HEADERS if h in response},
+        "body":    body,
+    }
+
+
+def run_item_in_thread(request, item):
+    # dipakai untuk baca paralel: thread pool punya koneksi DB sendiri
+    try:
+        return run_item(request, item)
+    finally:
+        close_old_connections()
@@ -0,0 +1,74 @@
+"""
+Daftar kategori untuk sidebar: kategori milik user dan/atau kategori global
+(user NULL, dibuat lewat admin), masing-masing dengan jumlah course aktif di tenant
+aktif dari satu query ber-annotate.
+
+Hasil di-cache per (tenant, scope, user). Kunci cache memuat dua generasi:
+- generasi kategori (global), naik saat Category disimpan/dihapus;
+- generasi course per tenant, naik saat Course disimpan/dihapus/di-archive.
+Menaikkan generasi membuat semua entri lama tidak terpakai lagi (kedaluwarsa
+sendiri setelah CATEGORY_CACHE_TTL).
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Q
+
+from lms_core import tenancy
+from lms_core.models import Category
+
+CATEGORY_CACHE_TTL = getattr(settings, "LMS_CATEGORY_CACHE_TTL", 300)
+SCOPES = ("all", "mine", "global")
+
+
+def _category_gen_key():
+    return "lms_categories:gen"
+
+
+def _course_gen_key(tenant_id):
+    return f"lms_categories:gen:{tenant_id}"
+
+
+def _bump(key):
+    # incr atomik; add dulu supaya key yang belum ada / sudah kedaluwarsa tidak error
+    cache.add(key, 0, None)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, 1, None)
+
+
+def invalidate(tenant_id=None):
+    """Buang cache kategori: semua tenant (default) atau hanya jumlah course satu tenant."""
+    _bump(_category_gen_key() if tenant_id is None else _course_gen_key(tenant_id))
+
+
+def _query(user_id, scope, tenant_id):
+    owner = {
+        "all": Q(user_id=user_id) | Q(user=None),
+        "mine": Q(user_id=user_id),
+        "global": Q(user=None),
+    }[scope]
+    return list(
+        Category.objects.filter(owner)
+        .annotate(course_count=Count(
+            "courses", filter=Q(courses__tenant_id=tenant_id, courses__archived_at=None)
+        ))
+        .order_by("name", "id")
+        .values("id", "name", "user_id", "course_count", "created_at", "updated_at")
+    )
+
+
+def category_list(user_id, scope="all"):
+    """Kategori untuk `scope` dengan `course_count`, dari cache kalau ada."""
+    tenant_id = tenancy.current_tenant_id()
+    gen_keys = (_category_gen_key(), _course_gen_key(tenant_id))
+    gens = cache.get_many(gen_keys)
+    key = "lms_categories:{}:{}:{}:{}:{}:{}".format(
+        tenancy.db_alias(), tenant_id, gens.get(gen_keys[0], 0), gens.get(gen_keys[1], 0),
+        scope, "" if scope == "global" else user_id,
+    )
+    rows = cache.get(key)
+    if rows is None:
+        rows = _query(user_id, scope, tenant_id)
+        cache.set(key, rows, CATEGORY_CACHE_TTL)
+    return rows
@@ -0,0 +1,69 @@
+import hashlib
+from functools import wraps
+
+from django.db.models import F, Func, Subquery
+from django.http import HttpResponseNotModified
+
+from lms_core import tenancy
+from lms_core.utils import after_response
+
+
+def _scalar(qs, function, field):
+    # COUNT/MAX sebagai Func biasa supaya Django tidak menambah GROUP BY di subquery
+    return Subquery(
+        qs.order_by().annotate(_v=Func(F(field), function=function)).values("_v")[:1]
+    )
+
+
+def aggregate_version(base, fields=(), **scopes):
+    """
+    Ambil validator murah dalam satu query: kolom `fields` dari baris `base`
+    plus COUNT dan MAX(kolom) untuk tiap scope `name=(queryset, kolom)`.
+    """
+    annotations = {}
+    for name, (qs, field) in scopes.items():
+        annotations[f"{name}_count"] = _scalar(qs, "COUNT", "pk")
+        annotations[f"{name}_last"]  = _scalar(qs, "MAX", field)
+    return base.values(*fields, **annotations).first()
+
+
+def make_etag(request, version):
+    # tenant dan query string ikut di-hash: id dan path yang sama bisa berarti data lain
+    raw = (
+        f"{tenancy.current_tenant_id()}:{getattr(request.user, 'id', None)}:"
+        f"{request.path}?{request.GET.urlencode()}:{version!r}"
+    )
+    return 'W/"%s"' % hashlib.md5(raw.encode(), usedforsecurity=False).hexdigest()
+
+
+def _if_none_match(request):
+    header = request.headers.get("If-None-Match", "")
+    return {tag.strip() for tag in header.split(",") if tag.strip()}
+
+
+def _set_etag_header(request, response):
+    tag = getattr(request, "lms_etag", None)
+    if tag and response.status_code == 200:
+        response["ETag"] = tag
+        response["Cache-Control"] = "private, no-cache"
+
+
+def etag(version_func):
+    """
+    Conditional GET untuk operation ninja. `version_func(request, **path_params)`
+    dijalankan setelah auth; kalau hasilnya cocok dengan If-None-Match, handler
+    dan serialisasi pydantic dilewati dan langsung dijawab 304.
+    """
+    def decorator(view_func):
+        @wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            tag = make_etag(request, version_func(request, **kwargs))
+            request.lms_etag = tag
+            if tag in _if_none_match(request) or "*" in _if_none_match(request):
+                response = HttpResponseNotModified()
+                response["ETag"] = tag
+                return response
+            return view_func(request, *args, **kwargs)
+
+        return after_response(wrapper, _set_etag_header)
+    return decorator
@@ -0,0 +1,152 @@
+"""
+Operasi massal per course: clone (untuk semester baru) dan arsip (course selesai).
+
+Keduanya bekerja dengan bulk_create/delete per potongan, bukan save() per baris.
+"""
+from datetime import timedelta
+
+from django.utils import timezone
+
+from lms_core import categories, tenancy
+from lms_core.models import (
+    Announcement, Comment, CommentArchive, CompletionArchive,
+    CompletionTracking, Course, CourseContent,
+)
+
+ARCHIVE_CHUNK_SIZE = 2000
+
+CONTENT_FIELDS = ("name", "description", "video_url", "file_attachment")
+
+
+class CourseNotFinished(Exception):
+    """Course belum lewat ends_at, jadi belum boleh diarsipkan."""
+
+
+def content_levels(rows):
+    """Kelompokkan konten per kedalaman pohon (root dulu). Parent di luar course dianggap root."""
+    ids = {r["id"] for r in rows}
+    roots, children = [], {}
+    for row in rows:
+        if row["parent_id"] in ids and row["parent_id"] != row["id"]:
+            children.setdefault(row["parent_id"], []).append(row)
+        else:
+            roots.append(row)
+    levels, level, placed = [], roots, 0
+    while level:
+        levels.append(level)
+        placed += len(level)
+        level = [child for row in level for child in children.get(row["id"], [])]
+    if placed < len(rows):
+        # siklus parent (data rusak): salin sebagai tingkat terakhir daripada hilang
+        seen = {r["id"] for lvl in levels for r in lvl}
+        levels.append([r for r in rows if r["id"] not in seen])
+    return levels
+
+
+@tenancy.atomic
+def clone_course(course, teacher_id, name=None, announcements=True, shift_days=0):
+    """Salin course, pohon konten dan pengumuman. Satu bulk_create per tingkat pohon.
+
+    Member, completion, komentar dan feedback tidak ikut (course baru kosong).
+    Return (course_baru, jumlah_konten, jumlah_pengumuman).
+    """
+    # tenant ikut course asal (command tidak punya tenant aktif)
+    new_course = Course.objects.create(
+        tenant_id=course.tenant_id,
+        name=name or course.name,
+        description=course.description,
+        price=course.price,
+        image=course.image.name or None,
+        teacher_id=teacher_id,
+        category_id=course.category_id,
+    )
+
+    rows = list(
+        CourseContent.objects.filter(course=course)
+        .order_by("id").values("id", "parent_id", *CONTENT_FIELDS)
+    )
+    remap = {}
+    for level in content_levels(rows):
+        objs = [
+            CourseContent(
+                tenant_id=new_course.tenant_id,
+                course=new_course,
+                parent_id=remap.get(row["parent_id"]),
+                **{f: row[f] for f in CONTENT_FIELDS},
+            )
+            for row in level
+        ]
+        CourseContent.objects.bulk_create(objs)
+        # bulk_create mengembalikan pk dengan urutan yang sama (PostgreSQL/SQLite RETURNING)
+        remap.update({row["id"]: obj.id for row, obj in zip(level, objs)})
+
+    cloned_announcements = 0
+    if announcements:
+        now = timezone.now()
+        objs = []
+        for ann in Announcement.objects.filter(course=course).order_by("id"):
+            clone = Announcement(
+                tenant_id=new_course.tenant_id,
+                course=new_course,
+                title=ann.title,
+                message=ann.message,
+                publish_date=ann.publish_date + timedelta(days=shift_days),
+            )
+            clone.schedule(now)
+            objs.append(clone)
+        Announcement.objects.bulk_create(objs)
+        cloned_announcements = len(objs)
+
+    return new_course, len(rows), cloned_announcements
+
+
+def _move_chunks(queryset, fields, make_archive, archive_model):
+    moved = 0
+    while True:
+        with tenancy.atomic():
+            rows = list(queryset.order_by("id").values("id", *fields)[:ARCHIVE_CHUNK_SIZE])
+            if not rows:
+                return moved
+            archive_model.objects.bulk_create([make_archive(r) for r in rows])
+            queryset.model.objects.filter(id__in=[r["id"] for r in rows]).delete()
+        moved += len(rows)
+
+
+def archive_course(course_id):
+    """Tandai course read-only lalu pindahkan CompletionTracking & Comment-nya ke tabel arsip.
+
+    Hanya untuk course yang sudah selesai (lewat ends_at); selain itu CourseNotFinished.
+    archived_at diisi dulu supaya endpoint tulis menolak (409) selama pemindahan.
+    Berjalan per potongan ARCHIVE_CHUNK_SIZE (satu transaksi per potongan) supaya
+    lock di tabel utama singkat; aman diulang kalau terhenti di tengah.
+    Return (completion_dipindah, komentar_dipindah).
+    """
+    course = Course.objects.only("id", "ends_at", "archived_at").get(id=course_id)
+    if course.archived_at is None:
+        if not course.is_finished():
+            raise CourseNotFinished(f"Course {course_id} belum selesai (ends_at belum lewat)")
+        with tenancy.atomic():
+            Course.objects.filter(id=course_id, archived_at=None).update(archived_at=timezone.now())
+            # update() tidak mengirim signal: jumlah course per kategori dibuang manual
+            tenancy.on_commit(categories.invalidate)
+
+    completions = _move_chunks(
+        CompletionTracking.objects.filter(content__course_id=course_id),
+        ("content_id", "user_id", "completed_at"),
+        lambda r: CompletionArchive(
+            course_id=course_id, content_id=r["content_id"],
+            user_id=r["user_id"], completed_at=r["completed_at"],
+        ),
+        CompletionArchive,
+    )
+    comments = _move_chunks(
+        Comment.objects.filter(content__course_id=course_id),
+        ("content_id", "member__user_id", "comment", "created_at"),
+        lambda r: CommentArchive(
+            course_id=course_id, content_id=r["content_id"], user_id=r["member__user_id"],
+            comment=r["comment"], created_at=r["created_at"],
+        ),
+        CommentArchive,
+    )
+    CourseContent.objects.filter(course_id=course_id).update(comment_count=0)
+    return completions, comments
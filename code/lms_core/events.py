@@ -0,0 +1,198 @@
+"""
+Pub/sub event per course untuk endpoint SSE /courses/{id}/events.
+
+Handler sync di api.py memanggil publish() (dikirim setelah transaksi commit).
+Subscriber adalah koneksi SSE async; tiap koneksi hanya punya satu asyncio.Queue
+berukuran tetap, jadi ribuan koneksi idle tidak memakan thread.
+
+Tanpa LMS_EVENTS_CACHE, event hanya sampai ke subscriber di proses yang sama.
+Dengan LMS_EVENTS_CACHE, publish() menulis event ke cache dan satu task poller per
+worker meneruskannya ke subscriber lokal.
+"""
+import asyncio
+import itertools
+import json
+import logging
+import threading
+from collections import defaultdict, deque
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import DEFAULT_DB_ALIAS
+
+from lms_core import tenancy
+
+logger = logging.getLogger(__name__)
+
+CACHE_PREFIX = "lms_events"
+EVENT_TTL = 300
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+def channel_for(course_id):
+    # id course hanya unik per database; tenant di database sendiri dapat prefix alias
+    alias = tenancy.db_alias()
+    return f"course:{course_id}" if alias == DEFAULT_DB_ALIAS else f"{alias}:course:{course_id}"
+
+
+class Subscriber:
+    def __init__(self, loop, maxsize):
+        self.loop = loop
+        self.queue = asyncio.Queue(maxsize)
+        self.lagged = False
+
+    def offer(self, event):
+        # dipanggil di event loop subscriber; konsumen lambat kehilangan event terlama
+        # dan diberi tanda supaya client mengambil ulang state lewat REST
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.lagged = True
+        self.queue.put_nowait(event)
+
+
+class Broker:
+    def __init__(self, history=100):
+        self._lock = threading.Lock()
+        self._subs = defaultdict(set)
+        self._history = defaultdict(lambda: deque(maxlen=history))
+        self._seq = itertools.count(1)
+        self._poller = None
+        self._seen = {}
+
+    @property
+    def fanout_cache(self):
+        alias = _setting("LMS_EVENTS_CACHE", None)
+        return caches[alias] if alias else None
+
+    def subscriber_count(self):
+        with self._lock:
+            return sum(len(s) for s in self._subs.values())
+
+    def subscribe(self, channel):
+        loop = asyncio.get_running_loop()
+        sub = Subscriber(loop, _setting("LMS_EVENTS_QUEUE_SIZE", 64))
+        with self._lock:
+            self._subs[channel].add(sub)
+        if self.fanout_cache is not None and (self._poller is None or self._poller.done()):
+            self._poller = loop.create_task(self._poll())
+        return sub
+
+    def unsubscribe(self, channel, sub):
+        with self._lock:
+            subs = self._subs.get(channel)
+            if subs is not None:
+                subs.discard(sub)
+                if not subs:
+                    del self._subs[channel]
+                    self._seen.pop(channel, None)
+
+    def replay(self, channel, last_id):
+        """Event setelah last_id dari riwayat lokal, atau None kalau ada celah (client harus refetch)."""
+        with self._lock:
+            history = self._history.get(channel)
+            history = list(history) if history else []
+            full = len(history) == self._history[channel].maxlen if history else False
+        if not history or last_id >= history[-1]["id"]:
+            return []
+        if last_id < history[0]["id"] and full:
+            return None
+        return [e for e in history if e["id"] > last_id]
+
+    def dispatch(self, channel, event):
+        with self._lock:
+            self._history[channel].append(event)
+            subs = list(self._subs.get(channel, ()))
+        for sub in subs:
+            try:
+                sub.loop.call_soon_threadsafe(sub.offer, event)
+            except RuntimeError:
+                # loop sudah ditutup; subscriber akan dibersihkan saat generatornya selesai
+                pass
+
+    def publish_now(self, channel, event_type, data):
+        payload = json.dumps(data, cls=DjangoJSONEncoder)
+        cache = self.fanout_cache
+        if cache is None:
+            self.dispatch(channel, {"id": next(self._seq), "type": event_type, "data": payload})
+            return
+        seq_key = f"{CACHE_PREFIX}:{channel}:seq"
+        cache.add(seq_key, 0, timeout=None)
+        seq = cache.incr(seq_key)
+        cache.set(f"{CACHE_PREFIX}:{channel}:{seq}",
+                  {"id": seq, "type": event_type, "data": payload}, EVENT_TTL)
+
+    async def _poll(self):
+        cache = self.fanout_cache
+        interval = _setting("LMS_EVENTS_POLL_INTERVAL", 0.5)
+        while True:
+            with self._lock:
+                channels = list(self._subs)
+            if not channels:
+                self._poller = None
+                return
+            try:
+                await self._poll_once(cache, channels)
+            except Exception:
+                logger.exception("Gagal membaca event dari cache")
+            await asyncio.sleep(interval)
+
+    async def _poll_once(self, cache, channels):
+        seqs = await cache.aget_many([f"{CACHE_PREFIX}:{c}:seq" for c in channels])
+        for channel in channels:
+            current = seqs.get(f"{CACHE_PREFIX}:{channel}:seq") or 0
+            seen = self._seen.setdefault(channel, current)
+            if current <= seen:
+                continue
+            wanted = range(seen + 1, current + 1)
+            found = await cache.aget_many([f"{CACHE_PREFIX}:{channel}:{i}" for i in wanted])
+            for i in wanted:
+                event = found.get(f"{CACHE_PREFIX}:{channel}:{i}")
+                if event is None:
+                    # publisher sudah incr tapi belum set; coba lagi di putaran berikut
+                    break
+                self.dispatch(channel, event)
+                self._seen[channel] = i
+
+
+broker = Broker()
+
+
+def publish(course_id, event_type, **data):
+    """Kirim event ke subscriber course setelah transaksi yang sedang berjalan commit."""
+    channel = channel_for(course_id)
+    tenancy.on_commit(lambda: broker.publish_now(channel, event_type, data))
+
+
+def format_sse(event):
+    return f"id: {event['id']}\nevent: {event['type']}\ndata: {event['data']}\n\n"
+
+
+async def stream(channel, last_event_id=None):
+    """Async generator SSE untuk satu koneksi. Berhenti (dan unsubscribe) saat client putus."""
+    heartbeat = _setting("LMS_EVENTS_HEARTBEAT", 15)
+    sub = broker.subscribe(channel)
+    try:
+        yield f"retry: {_setting('LMS_EVENTS_RETRY_MS', 3000)}\n\n"
+        if last_event_id is not None:
+            missed = broker.replay(channel, last_event_id)
+            if missed is None:
+                yield "event: reset\ndata: {}\n\n"
+            else:
+                for event in missed:
+                    yield format_sse(event)
+        while True:
+            try:
+                event = await asyncio.wait_for(sub.queue.get(), heartbeat)
+            except asyncio.TimeoutError:
+                yield ": ping\n\n"
+                continue
+            if sub.lagged:
+                sub.lagged = False
+                yield "event: reset\ndata: {}\n\n"
+            yield format_sse(event)
+    finally:
+        broker.unsubscribe(channel, sub)
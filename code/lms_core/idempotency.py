@@ -0,0 +1,84 @@
+import hashlib
+from datetime import timedelta
+from functools import wraps
+
+from django.conf import settings
+from django.http import HttpResponse
+from django.utils import timezone
+from ninja.responses import Response
+from ninja.utils import contribute_operation_callback
+
+from lms_core import tenancy
+from lms_core.models import IdempotencyKey
+
+HEADER = "Idempotency-Key"
+MAX_KEY_LENGTH = 255
+
+
+def _fingerprint(request):
+    digest = hashlib.sha256(f"{request.method} {request.path}\n".encode())
+    digest.update(request.body)
+    return digest.hexdigest()
+
+
+def _replay(row):
+    response = HttpResponse(bytes(row.body), status=row.status_code, content_type=row.content_type)
+    response["Idempotent-Replayed"] = "true"
+    return response
+
+
+def idempotent(view_func):
+    """
+    Dukungan header Idempotency-Key untuk operation POST ninja.
+
+    Request pertama dengan key tertentu dijalankan dalam satu transaksi bersama
+    baris IdempotencyKey yang dikunci (select_for_update); response-nya (status < 500)
+    disimpan di baris itu. Retry dengan key yang sama mendapat response tersimpan
+    tanpa menjalankan handler. Duplikat yang datang bersamaan menunggu lock baris,
+    lalu ikut mendapat replay. Key yang sama dengan body berbeda ditolak 422.
+    Dipasang di atas @expensive supaya replay tidak memakai slot.
+    """
+    operation = []
+    contribute_operation_callback(view_func, operation.append)
+
+    @wraps(view_func)
+    def wrapper(request, *args, **kwargs):
+        key = request.headers.get(HEADER)
+        if not key:
+            return view_func(request, *args, **kwargs)
+        if len(key) > MAX_KEY_LENGTH:
+            return Response({"detail": f"{HEADER} maksimal {MAX_KEY_LENGTH} karakter"}, status=400)
+
+        now = timezone.now()
+        fingerprint = _fingerprint(request)
+        ttl = timedelta(seconds=getattr(settings, "LMS_IDEMPOTENCY_TTL", 24 * 3600))
+        with tenancy.atomic():
+            row, created = IdempotencyKey.objects.select_for_update().get_or_create(
+                user_id=request.user.id, key=key,
+                defaults={"fingerprint": fingerprint, "expires_at": now + ttl},
+            )
+            if not created:
+                if row.expires_at <= now:
+                    row.fingerprint, row.status_code, row.body = fingerprint, None, None
+                    row.expires_at = now + ttl
+                elif row.fingerprint != fingerprint:
+                    return Response(
+                        {"detail": f"{HEADER} sudah dipakai untuk request yang berbeda"}, status=422
+                    )
+                elif row.status_code is not None:
+                    return _replay(row)
+
+            op = operation[0]
+            result = view_func(request, *args, **kwargs)
+            response = op._result_to_response(request, result, op.api.create_temporal_response(request))
+            if response.status_code >= 500 or response.streaming:
+                # gagal sementara: jangan disimpan, retry boleh menjalankan ulang
+                row.delete()
+                return response
+            row.status_code = response.status_code
+            row.content_type = response.get("Content-Type", "")
+            row.body = response.content
+            row.save()
+            return response
+
+    return wrapper
@@ -0,0 +1,89 @@
+import glob
+import json
+from datetime import datetime, timedelta, timezone
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+
+def percentile(values, pct):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(pct / 100 * (len(values) - 1))))]
+
+
+class Command(BaseCommand):
+    help = (
+        "Ringkas access log JSON (lms.access) per route: jumlah, error 5xx, latensi p50/p95/p99, "
+        "rata-rata waktu DB dan query."
+    )
+    requires_system_checks = []
+
+    def add_arguments(self, parser):
+        parser.add_argument("files", nargs="*",
+                            help="file log (boleh glob); default LMS_LOG_DIR/access.log*")
+        parser.add_argument("--since", type=float, metavar="HOURS", help="hanya N jam terakhir")
+        parser.add_argument("--route", help="hanya route yang mengandung teks ini")
+        parser.add_argument("--sort", choices=["p95", "p99", "count", "total"], default="p95")
+        parser.add_argument("--top", type=int, default=30)
+        parser.add_argument("--json", action="store_true", help="keluaran JSON")
+
+    def handle(self, *args, **opts):
+        patterns = opts["files"] or [str(settings.LMS_LOG_DIR / "access.log*")]
+        paths = sorted({p for pattern in patterns for p in glob.glob(pattern)})
+        if not paths:
+            raise CommandError(f"Tidak ada file log: {', '.join(patterns)}")
+        since = (
+            datetime.now(timezone.utc) - timedelta(hours=opts["since"]) if opts["since"] else None
+        )
+
+        routes, skipped = {}, 0
+        for path in paths:
+            with open(path, encoding="utf-8") as fh:
+                for line in fh:
+                    try:
+                        entry = json.loads(line)
+                        route = f"{entry['method']} {entry['route'] or '<unmatched>'}"
+                        if since and datetime.fromisoformat(entry["ts"]) < since:
+                            continue
+                    except (ValueError, KeyError, TypeError):
+                        skipped += 1
+                        continue
+                    if opts["route"] and opts["route"] not in route:
+                        continue
+                    stats = routes.setdefault(route, {"latency": [], "db_ms": 0.0, "queries": 0, "errors": 0})
+                    stats["latency"].append(entry["latency_ms"])
+                    stats["db_ms"] += entry.get("db_ms", 0)
+                    stats["queries"] += entry.get("queries", 0)
+                    stats["errors"] += entry["status"] >= 500
+
+        rows = []
+        for route, stats in routes.items():
+            n = len(stats["latency"])
+            rows.append({
+                "route":     route,
+                "count":     n,
+                "errors":    stats["errors"],
+                "p50":       round(percentile(stats["latency"], 50), 1),
+                "p95":       round(percentile(stats["latency"], 95), 1),
+                "p99":       round(percentile(stats["latency"], 99), 1),
+                "total":     round(sum(stats["latency"]), 1),
+                "db_ms":     round(stats["db_ms"] / n, 1),
+                "queries":   round(stats["queries"] / n, 1),
+            })
+        rows.sort(key=lambda r: r[opts["sort"]], reverse=True)
+        rows = rows[:opts["top"]]
+
+        if opts["json"]:
+            self.stdout.write(json.dumps(rows, indent=2))
+            return
+        self.stdout.write(
+            f"{'route':<58} {'count':>7} {'5xx':>5} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} "
+            f"{'db ms':>7} {'query':>6}"
+        )
+        for r in rows:
+            self.stdout.write(
+                f"{r['route']:<58} {r['count']:>7} {r['errors']:>5} {r['p50']:>8} {r['p95']:>8} "
+                f"{r['p99']:>8} {r['db_ms']:>7} {r['queries']:>6}"
+            )
+        if skipped:
+            self.stdout.write(self.style.WARNING(f"{skipped} baris tidak terbaca dilewati."))
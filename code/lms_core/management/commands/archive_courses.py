@@ -0,0 +1,67 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Exists, OuterRef
+from django.utils import timezone
+
+from lms_core import tenancy
+from lms_core.course_ops import CourseNotFinished, archive_course
+from lms_core.models import Comment, CompletionTracking, Course
+
+
+class Command(BaseCommand):
+    help = (
+        "Pindahkan completion & komentar course yang sudah selesai (lewat ends_at) ke tabel "
+        "arsip (CompletionArchive/CommentArchive); course jadi read-only."
+    )
+    requires_system_checks = []
+
+    def add_arguments(self, parser):
+        parser.add_argument("--course", type=int, action="append", dest="courses",
+                            help="course id (boleh diulang)")
+        parser.add_argument("--inactive-days", type=int,
+                            help="arsipkan course tanpa completion/komentar baru selama N hari")
+        parser.add_argument("--dry-run", action="store_true", help="hanya tampilkan course yang dipilih")
+        parser.add_argument("--tenant", help="slug tenant (default: semua database tenant)")
+
+    def handle(self, *args, **opts):
+        if not opts["courses"] and opts["inactive_days"] is None:
+            raise CommandError("Pilih --course atau --inactive-days.")
+        contexts = tenancy.maintenance_contexts(opts["tenant"])
+        if opts["courses"] and len(contexts) > 1:
+            # id course hanya unik per database
+            raise CommandError("--course butuh --tenant kalau ada lebih dari satu database tenant.")
+        for label, context in contexts:
+            try:
+                with context:
+                    self._archive(label, opts)
+            except LookupError as exc:
+                raise CommandError(str(exc))
+
+    def _archive(self, label, opts):
+        if opts["courses"]:
+            courses = Course.objects.filter(id__in=opts["courses"])
+        else:
+            cutoff = timezone.now() - timedelta(days=opts["inactive_days"])
+            recent_completion = CompletionTracking.objects.filter(
+                content__course_id=OuterRef("pk"), completed_at__gte=cutoff
+            )
+            recent_comment = Comment.objects.filter(
+                content__course_id=OuterRef("pk"), created_at__gte=cutoff
+            )
+            courses = Course.objects.filter(
+                archived_at__isnull=True, ends_at__lte=timezone.now(), updated_at__lt=cutoff
+            ).exclude(Exists(recent_completion)).exclude(Exists(recent_comment))
+
+        for course_id, name in courses.order_by("id").values_list("id", "name"):
+            if opts["dry_run"]:
+                self.stdout.write(f"{label}\t{course_id}\t{name}")
+                continue
+            try:
+                completions, comments = archive_course(course_id)
+            except CourseNotFinished as exc:
+                self.stderr.write(f"{label}\t{course_id}\t{name}: {exc}, dilewati")
+                continue
+            self.stdout.write(
+                f"{label}\t{course_id}\t{name}: {completions} completion, {comments} komentar diarsipkan"
+            )
@@ -0,0 +1,61 @@
+import statistics
+import time
+
+from django.conf import settings
+from django.contrib import admin
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = "Ukur waktu render changelist admin lms_core (jalankan setelah seed data)."
+    requires_system_checks = []
+
+    def add_arguments(self, parser):
+        parser.add_argument("--repeat", type=int, default=5)
+        parser.add_argument("--model", action="append", dest="models",
+                            help="nama model lms_core (default: semua yang terdaftar)")
+
+    def handle(self, *args, **opts):
+        if "testserver" not in settings.ALLOWED_HOSTS and "*" not in settings.ALLOWED_HOSTS:
+            settings.ALLOWED_HOSTS = [*settings.ALLOWED_HOSTS, "testserver"]
+        models = [
+            m for m in admin.site._registry
+            if m._meta.app_label == "lms_core"
+            and (not opts["models"] or m._meta.model_name in {n.lower() for n in opts["models"]})
+        ]
+        self.stdout.write(f"{'changelist':<24}{'rows':>10}{'median ms':>12}{'queries':>9}")
+        try:
+            # superuser sementara, di-rollback di akhir
+            with transaction.atomic():
+                user = User.objects.create_superuser("__bench_admin", password="x")
+                client = Client()
+                client.force_login(user)
+                for model in models:
+                    self._bench(client, model, opts["repeat"])
+                raise Rollback
+        except Rollback:
+            pass
+
+    def _bench(self, client, model, repeat):
+        url = reverse(f"admin:{model._meta.app_label}_{model._meta.model_name}_changelist")
+        timings = []
+        for _ in range(repeat):
+            with CaptureQueriesContext(connection) as queries:
+                started = time.perf_counter()
+                response = client.get(url)
+                timings.append((time.perf_counter() - started) * 1000)
+            assert response.status_code == 200, (url, response.status_code)
+        rows = model._default_manager.count()
+        self.stdout.write(
+            f"{model._meta.model_name:<24}{rows:>10}{statistics.median(timings):>12.1f}"
+            f"{len(queries.captured_queries):>9}"
+        )
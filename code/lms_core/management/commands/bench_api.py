@@ -0,0 +1,345 @@
+import json
+import statistics
+import time
+import tracemalloc
+from collections import namedtuple
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db.models import Count
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from lms_core.models import Course, CourseMember
+
+API = "/api/v1"
+PASSWORD = "Bench#Pass123"
+
+# view: nama fungsi handler di apiv1 (dipakai untuk cek cakupan & baseline)
+# path/body: fn(ctx) ; prepare: fn(ctx) dijalankan sebelum tiap iterasi, tidak diukur
+Case = namedtuple("Case", "view method path body actor prepare multipart",
+                  defaults=(None, "student", None, None))
+
+
+def _future():
+    return (timezone.now() - timedelta(minutes=1)).isoformat()
+
+
+def _create(ctx, actor, path, body, key="id"):
+    response = ctx["clients"][actor].post(API + path, body, content_type="application/json",
+                                          **ctx["headers"][actor])
+    return json.loads(response.content)[key]
+
+
+def _purge_job(ctx):
+    clone_id = _create(ctx, "teacher", f"/courses/{ctx['course'].id}/clone", {"announcements": False})
+    response = ctx["clients"]["teacher"].delete(f"{API}/courses/{clone_id}", **ctx["headers"]["teacher"])
+    return json.loads(response.content)["job_id"]
+
+
+def _finished_clone(ctx):
+    # archive hanya menerima course yang sudah lewat ends_at
+    clone_id = _create(ctx, "teacher", f"/courses/{ctx['course'].id}/clone", {"announcements": False})
+    Course.objects.filter(id=clone_id).update(ends_at=timezone.now())
+    return clone_id
+
+
+def _next(ctx, name):
+    ctx[name] = ctx.get(name, 0) + 1
+    return ctx[name]
+
+
+CASES = [
+    Case("register", "POST", lambda c: "/auth/register",
+         lambda c: {"username": f"__bench_reg_{_next(c, 'reg')}", "email": "b@x.io", "password": PASSWORD},
+         actor="anon"),
+    Case("mobile_sign_in", "POST", lambda c: "/auth/sign-in",
+         lambda c: {"username": c["student"].username, "password": PASSWORD}, actor="anon"),
+    Case("mobile_token_refresh", "POST", lambda c: "/auth/token-refresh",
+         lambda c: {"refresh": c["refresh"]}, actor="anon"),
+    Case("batch_enroll", "POST", lambda c: "/courses/batch-enroll",
+         lambda c: {"course_id": c["course"].id, "user_ids": c["outsiders"]}, actor="teacher"),
+    Case("clone_course", "POST", lambda c: f"/courses/{c['course'].id}/clone",
+         lambda c: {"name": "bench clone", "shift_days": 182}, actor="teacher"),
+    Case("archive_course", "POST", lambda c: f"/courses/{c['clone_id']}/archive", actor="teacher",
+         prepare=lambda c: c.update(clone_id=_finished_clone(c))),
+    Case("archived_completions", "GET", lambda c: f"/courses/{c['course'].id}/archive/completions",
+         actor="teacher"),
+    Case("archived_comments", "GET", lambda c: f"/courses/{c['course'].id}/archive/comments"),
+    Case("delete_course", "DELETE", lambda c: f"/courses/{c['clone_id']}", actor="teacher",
+         prepare=lambda c: c.update(clone_id=_create(
+             c, "teacher", f"/courses/{c['course'].id}/clone", {"announcements": False}))),
+    Case("purge_job", "GET", lambda c: f"/courses/purge-jobs/{c['job_id']}", actor="teacher",
+         prepare=lambda c: c.setdefault("job_id", _purge_job(c))),
+
+    Case("create_announcement", "POST", lambda c: f"/courses/{c['course'].id}/announcements",
+         lambda c: {"title": "bench", "message": "bench", "publish_date": _future()}, actor="teacher"),
+    Case("list_announcements", "GET", lambda c: f"/courses/{c['course'].id}/announcements"),
+    Case("bulk_create_announcements", "POST", lambda c: f"/courses/{c['course'].id}/announcements/bulk",
+         lambda c: {"items": [{"title": f"b{i}", "message": "m", "publish_date": _future()} for i in range(50)]},
+         actor="teacher"),
+    Case("edit_announcement", "PUT", lambda c: f"/courses/{c['course'].id}/announcements/{c['ann_id']}",
+         lambda c: {"title": "edit", "message": "edit", "publish_date": _future()}, actor="teacher",
+         prepare=lambda c: c.update(ann_id=_create(
+             c, "teacher", f"/courses/{c['course'].id}/announcements",
+             {"title": "x", "message": "x", "publish_date": _future()}))),
+    Case("delete_announcement", "DELETE", lambda c: f"/courses/{c['course'].id}/announcements/{c['ann_id']}",
+         actor="teacher",
+         prepare=lambda c: c.update(ann_id=_create(
+             c, "teacher", f"/courses/{c['course'].id}/announcements",
+             {"title": "x", "message": "x", "publish_date": _future()}))),
+
+    Case("announcement_feed", "GET", lambda c: "/feed"),
+
+    Case("add_completion", "POST", lambda c: "/completions", lambda c: {"content_id": c["content_id"]}),
+    Case("show_completions", "GET", lambda c: f"/courses/{c['course'].id}/completions"),
+    Case("delete_completion", "DELETE", lambda c: f"/completions/{c['comp_id']}",
+         prepare=lambda c: c.update(comp_id=_create(c, "student", "/completions",
+                                                    {"content_id": c["content_id"]}))),
+
+    Case("list_comments", "GET", lambda c: f"/contents/{c['content_id']}/comments"),
+    Case("add_comment", "POST", lambda c: f"/contents/{c['content_id']}/comments",
+         lambda c: {"comment": "bench comment"}),
+    Case("bulk_delete_comments", "POST", lambda c: "/comments/bulk-delete",
+         lambda c: {"ids": c["comment_ids"]}, actor="teacher",
+         prepare=lambda c: c.update(comment_ids=[
+             _create(c, "student", f"/contents/{c['content_id']}/comments", {"comment": "x"})
+             for _ in range(10)
+         ])),
+    Case("delete_comment", "DELETE", lambda c: f"/comments/{c['comment_id']}",
+         prepare=lambda c: c.update(comment_id=_create(
+             c, "student", f"/contents/{c['content_id']}/comments", {"comment": "x"}))),
+
+    Case("show_profile", "GET", lambda c: f"/profile/{c['student'].id}"),
+    Case("edit_profile", "PUT", lambda c: "/profile", lambda c: {
+        "first_name": "Bench", "last_name": "User", "email": "b@x.io",
+        "handphone": "0800", "description": "bench", "profile_image": None,
+    }),
+
+    Case("upload_media", "POST", lambda c: "/media", multipart=lambda c: {
+        "file": SimpleUploadedFile(f"b{_next(c, 'upload')}.bin", b"%d" % c["upload"] * 4096,
+                                   "application/octet-stream"),
+    }),
+    Case("show_media", "GET", lambda c: f"/media/{c['asset']}",
+         prepare=lambda c: c.setdefault("asset", c["clients"]["student"].post(
+             API + "/media", {"file": SimpleUploadedFile("p.bin", b"bench" * 1024)},
+             **c["headers"]["student"]).json()["sha256"])),
+
+    Case("add_category", "POST", lambda c: "/categories", lambda c: {"name": "bench"}),
+    Case("list_categories", "GET", lambda c: "/categories"),
+    Case("delete_category", "DELETE", lambda c: f"/categories/{c['cat_id']}",
+         prepare=lambda c: c.update(cat_id=_create(c, "student", "/categories", {"name": "x"}))),
+
+    Case("add_bookmark", "POST", lambda c: f"/contents/{c['content_id']}/bookmarks", lambda c: {}),
+    Case("list_bookmarks", "GET", lambda c: "/bookmarks"),
+    Case("list_bookmark_details", "GET", lambda c: "/bookmarks/detailed"),
+    Case("bulk_toggle_bookmarks", "POST", lambda c: "/bookmarks/bulk",
+         lambda c: {"add": [c["content_id"]], "remove": [c["content_id"]]}),
+    Case("delete_bookmark", "DELETE", lambda c: f"/bookmarks/{c['bm_id']}",
+         prepare=lambda c: c.update(bm_id=_create(c, "student", f"/contents/{c['content_id']}/bookmarks", {}))),
+
+    Case("add_feedback", "POST", lambda c: f"/courses/{c['course'].id}/feedback",
+         lambda c: {"message": "bench", "rating": 4}),
+    Case("list_feedback", "GET", lambda c: f"/courses/{c['course'].id}/feedback"),
+    Case("bulk_import_feedback", "POST", lambda c: f"/courses/{c['course'].id}/feedback/bulk",
+         lambda c: {"items": [{"user_id": uid, "message": "bulk", "rating": 3} for uid in c["member_ids"]]},
+         actor="teacher"),
+    Case("edit_feedback", "PUT", lambda c: f"/courses/{c['course'].id}/feedback/{c['fb_id']}",
+         lambda c: {"message": "edit", "rating": 5},
+         prepare=lambda c: c.update(fb_id=_create(c, "student", f"/courses/{c['course'].id}/feedback",
+                                                  {"message": "x", "rating": 2}))),
+    Case("delete_feedback", "DELETE", lambda c: f"/courses/{c['course'].id}/feedback/{c['fb_id']}",
+         prepare=lambda c: c.update(fb_id=_create(c, "student", f"/courses/{c['course'].id}/feedback",
+                                                  {"message": "x", "rating": 2}))),
+    Case("course_ratings", "GET", lambda c: f"/courses/{c['course'].id}/ratings"),
+
+    Case("user_dashboard", "GET", lambda c: "/dashboard"),
+    Case("course_analytics", "GET", lambda c: f"/courses/{c['course'].id}/analytics"),
+    Case("run_batch", "POST", lambda c: "/batch", lambda c: {"requests": [
+        {"path": "/dashboard"},
+        {"path": f"/profile/{c['student'].id}", "fields": ["username", "courses_enrolled.name"]},
+        {"path": "/bookmarks"},
+        {"path": f"/courses/{c['course'].id}/announcements", "fields": ["id", "title"]},
+    ]}),
+    Case("course_timeseries", "GET", lambda c: f"/courses/{c['course'].id}/analytics/timeseries",
+         actor="teacher"),
+    Case("similar_courses", "GET", lambda c: f"/courses/{c['course'].id}/similar"),
+]
+
+# endpoint yang sengaja tidak diukur di sini
+NOT_BENCHMARKED = {
+    "course_events": "stream SSE tanpa akhir; butuh server ASGI",
+    "list_request_profiles": "endpoint debug khusus staff",
+    "download_request_profile": "endpoint debug khusus staff",
+}
+
+
+class Rollback(Exception):
+    pass
+
+
+def percentile(values, pct):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(pct / 100 * (len(values) - 1))))]
+
+
+class Command(BaseCommand):
+    help = (
+        "Panggil semua endpoint apiv1 lewat test client pada data yang ada (jalankan seed_lms dulu), "
+        "catat latensi, jumlah query dan memori, lalu bandingkan dengan baseline."
+    )
+    requires_system_checks = []
+
+    def add_arguments(self, parser):
+        parser.add_argument("--repeat", type=int, default=10)
+        parser.add_argument("--only", action="append", help="nama view (boleh diulang)")
+        parser.add_argument("--save-baseline", metavar="PATH")
+        parser.add_argument("--compare", metavar="PATH")
+        parser.add_argument("--threshold", type=float, default=1.5,
+                            help="rasio p50 terhadap baseline yang dianggap regresi")
+        parser.add_argument("--min-delta-ms", type=float, default=2.0,
+                            help="abaikan selisih p50 di bawah ini (noise)")
+
+    def handle(self, *args, **opts):
+        self._check_coverage()
+        cases = [c for c in CASES if not opts["only"] or c.view in opts["only"]]
+        if "testserver" not in settings.ALLOWED_HOSTS and "*" not in settings.ALLOWED_HOSTS:
+            settings.ALLOWED_HOSTS = [*settings.ALLOWED_HOSTS, "testserver"]
+
+        results = {}
+        try:
+            # semua tulisan bench di-rollback di akhir
+            with transaction.atomic(), override_settings(LMS_THROTTLE_ENABLED=False):
+                ctx = self._context()
+                for case in cases:
+                    results[case.view] = self._run(case, ctx, opts["repeat"])
+                raise Rollback
+        except Rollback:
+            pass
+
+        self._report(results)
+        if opts["save_baseline"]:
+            with open(opts["save_baseline"], "w") as f:
+                json.dump(results, f, indent=2, sort_keys=True)
+            self.stdout.write(f"Baseline disimpan ke {opts['save_baseline']}")
+        if opts["compare"]:
+            self._compare(results, opts)
+
+    def _check_coverage(self):
+        from lms_core.api import apiv1
+
+        views = {
+            op.view_func.__name__
+            for _, router in apiv1._routers
+            for path_view in router.path_operations.values()
+            for op in path_view.operations
+        }
+        missing = sorted(views - {c.view for c in CASES} - set(NOT_BENCHMARKED))
+        if missing:
+            self.stderr.write(self.style.WARNING("Endpoint tanpa skenario bench: " + ", ".join(missing)))
+
+    def _context(self):
+        from ninja_simple_jwt.jwt.token_operations import (
+            get_access_token_for_user, get_refresh_token_for_user,
+        )
+
+        course = (
+            Course.objects.annotate(n=Count("members")).filter(n__gt=1, contents__isnull=False)
+            .order_by("-n").first()
+        )
+        if not course:
+            raise CommandError("Tidak ada course dengan member dan konten; jalankan seed_lms dulu.")
+        member_ids = list(CourseMember.objects.filter(course=course).values_list("user_id", flat=True))
+        student = User.objects.get(id=member_ids[0])
+        student.set_password(PASSWORD)
+        student.save()
+        teacher = course.teacher
+        outsiders = list(
+            User.objects.exclude(id__in=member_ids).exclude(id=teacher.id).values_list("id", flat=True)[:50]
+        )
+
+        clients, headers = {"anon": Client()}, {"anon": {}}
+        for actor, user in (("student", student), ("teacher", teacher)):
+            # force_login + JWT: sebagian handler lama masih membandingkan request.user sebagai model
+            clients[actor] = Client()
+            clients[actor].force_login(user)
+            headers[actor] = {"HTTP_AUTHORIZATION": "Bearer " + get_access_token_for_user(user)[0]}
+
+        return {
+            "course": course, "student": student, "teacher": teacher,
+            "member_ids": member_ids[:100], "outsiders": outsiders,
+            "content_id": course.contents.values_list("id", flat=True).first(),
+            "refresh": get_refresh_token_for_user(student)[0],
+            "clients": clients, "headers": headers,
+        }
+
+    def _request(self, case, ctx):
+        client = ctx["clients"][case.actor]
+        method = getattr(client, case.method.lower())
+        kwargs = dict(ctx["headers"][case.actor])
+        if case.body:
+            kwargs.update(data=case.body(ctx), content_type="application/json")
+        elif case.multipart:
+            kwargs.update(data=case.multipart(ctx))
+        return method(API + case.path(ctx), **kwargs)
+
+    def _run(self, case, ctx, repeat):
+        latencies, queries, statuses = [], [], set()
+        for _ in range(repeat):
+            if case.prepare:
+                case.prepare(ctx)
+            with CaptureQueriesContext(connection) as captured:
+                started = time.perf_counter()
+                response = self._request(case, ctx)
+                latencies.append((time.perf_counter() - started) * 1000)
+            queries.append(len(captured.captured_queries))
+            statuses.add(response.status_code)
+
+        # memori diukur terpisah supaya overhead tracemalloc tidak masuk latensi
+        if case.prepare:
+            case.prepare(ctx)
+        tracemalloc.start()
+        self._request(case, ctx)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        return {
+            "p50_ms": round(statistics.median(latencies), 3),
+            "p95_ms": round(percentile(latencies, 95), 3),
+            "queries": int(statistics.median(queries)),
+            "peak_kb": round(peak / 1024, 1),
+            "status": sorted(statuses),
+        }
+
+    def _report(self, results):
+        self.stdout.write(f"{'view':<28}{'p50 ms':>9}{'p95 ms':>9}{'queries':>9}{'peak KB':>10}  status")
+        for view, r in results.items():
+            bad = any(s >= 400 for s in r["status"])
+            line = (f"{view:<28}{r['p50_ms']:>9.1f}{r['p95_ms']:>9.1f}{r['queries']:>9}"
+                    f"{r['peak_kb']:>10.1f}  {','.join(map(str, r['status']))}")
+            self.stdout.write(self.style.ERROR(line) if bad else line)
+
+    def _compare(self, results, opts):
+        with open(opts["compare"]) as f:
+            baseline = json.load(f)
+        regressions = []
+        for view, r in results.items():
+            base = baseline.get(view)
+            if not base:
+                continue
+            slower = (r["p50_ms"] > base["p50_ms"] * opts["threshold"]
+                      and r["p50_ms"] - base["p50_ms"] > opts["min_delta_ms"])
+            if slower:
+                regressions.append(f"{view}: p50 {base['p50_ms']:.1f} -> {r['p50_ms']:.1f} ms")
+            if r["queries"] > base["queries"]:
+                regressions.append(f"{view}: queries {base['queries']} -> {r['queries']}")
+        if regressions:
+            for line in regressions:
+                self.stdout.write(self.style.ERROR("REGRESI " + line))
+            raise SystemExit(1)
+        self.stdout.write(self.style.SUCCESS("Tidak ada regresi terhadap baseline."))
@@ -0,0 +1,109 @@
+import time
+from datetime import timedelta
+from typing import List
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+from ninja import Schema
+from ninja.renderers import JSONRenderer
+
+from lms_core.models import Announcement, Course
+from lms_core.renderers import ORJSONRenderer, orjson, project
+from lms_core.schema import AnnouncementOut
+
+
+class Rollback(Exception):
+    pass
+
+
+def timed(func, repeat):
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+class Command(BaseCommand):
+    help = "Bandingkan ms per 10k baris: jalur pydantic+json saat ini vs values()+orjson."
+    requires_system_checks = []  # lewati import URLconf/apiv1 dan cek Pillow
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=10000)
+        parser.add_argument("--repeat", type=int, default=5)
+
+    def handle(self, *args, **opts):
+        rows, repeat = opts["rows"], opts["repeat"]
+        try:
+            with transaction.atomic():
+                self._seed(rows)
+                results = self._run(rows, repeat)
+                raise Rollback
+        except Rollback:
+            pass
+
+        scale = 10000 / rows
+        self.stdout.write(f"{'path':<32}{'ms/10k rows':>14}")
+        for name, seconds in results:
+            self.stdout.write(f"{name:<32}{seconds * 1000 * scale:>14.1f}")
+
+    def _seed(self, rows):
+        teacher, _ = User.objects.get_or_create(username="__bench_teacher")
+        self.course = Course.objects.create(
+            name="bench", description="bench", price=0, teacher=teacher
+        )
+        past = timezone.now() - timedelta(days=1)
+        Announcement.objects.bulk_create(
+            [
+                Announcement(course=self.course, title=f"title {i}", message="lorem ipsum " * 8,
+                             publish_date=past, published_at=past, announced=True)
+                for i in range(rows)
+            ],
+            batch_size=1000,
+        )
+
+    def _run(self, rows, repeat):
+        # selalu .all() di dalam fungsi supaya result cache queryset tidak ikut terukur
+        qs = Announcement.objects.filter(course=self.course)
+        response_model = type(
+            "BenchResponse", (Schema,), {"__annotations__": {"response": List[AnnouncementOut]}}
+        )
+        json_renderer = JSONRenderer()
+
+        def current_path():
+            # sama dengan Operation._result_to_response: instance ORM -> pydantic -> json
+            objs = list(qs.all())
+            data = response_model.model_validate({"response": objs}).model_dump()["response"]
+            json_renderer.render(None, data, response_status=200)
+
+        def sql_instances():
+            list(qs.all())
+
+        def sql_values():
+            list(project(qs, AnnouncementOut))
+
+        results = [
+            ("sql only (model instances)", timed(sql_instances, repeat)),
+            ("sql only (values)", timed(sql_values, repeat)),
+            ("current: pydantic + json", timed(current_path, repeat)),
+        ]
+
+        def values_json():
+            data = list(project(qs, AnnouncementOut))
+            json_renderer.render(None, data, response_status=200)
+
+        results.append(("fast: values + json", timed(values_json, repeat)))
+
+        if orjson:
+            fast_renderer = ORJSONRenderer()
+
+            def values_orjson():
+                data = list(project(qs, AnnouncementOut))
+                fast_renderer.render(None, data, response_status=200)
+
+            results.append(("fast: values + orjson", timed(values_orjson, repeat)))
+        return results
@@ -0,0 +1,111 @@
+import json
+import statistics
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.test import Client, override_settings
+
+from lms_core.models import (
+    Bookmark, CompletionTracking, Course, CourseContent, CourseMember, CourseRating, Feedback,
+)
+from lms_core.purge import purge_user
+
+API = "/api/v1"
+PREFIX = "__upsert_"
+
+
+class Command(BaseCommand):
+    help = (
+        "Uji konkurensi upsert: banyak thread memanggil POST completion/bookmark/feedback "
+        "untuk pasangan (user, konten) yang sama, lalu cek tidak ada error dan baris ganda."
+    )
+    requires_system_checks = []
+
+    def add_arguments(self, parser):
+        parser.add_argument("--threads", type=int, default=16)
+        parser.add_argument("--requests", type=int, default=25, help="request per thread per endpoint")
+        parser.add_argument("--keep", action="store_true", help="jangan hapus data uji")
+
+    def handle(self, *args, **opts):
+        from ninja_simple_jwt.jwt.token_operations import get_access_token_for_user
+
+        if "testserver" not in settings.ALLOWED_HOSTS and "*" not in settings.ALLOWED_HOSTS:
+            settings.ALLOWED_HOSTS = [*settings.ALLOWED_HOSTS, "testserver"]
+        if User.objects.filter(username__startswith=PREFIX).exists():
+            raise CommandError(f"Data uji lama ({PREFIX}*) masih ada; hapus dulu dengan purge_data.")
+
+        teacher = User.objects.create_user(f"{PREFIX}teacher")
+        student = User.objects.create_user(f"{PREFIX}student")
+        course = Course.objects.create(name=f"{PREFIX}course", description="-", price=0, teacher=teacher)
+        content = CourseContent.objects.create(name="upsert", course=course)
+        CourseMember.objects.create(course=course, user=student)
+        headers = {"HTTP_AUTHORIZATION": "Bearer " + get_access_token_for_user(student)[0]}
+
+        cases = [
+            ("add_completion", "/completions", lambda i: {"content_id": content.id}),
+            ("add_bookmark", f"/contents/{content.id}/bookmarks", lambda i: {}),
+            ("add_feedback", f"/courses/{course.id}/feedback",
+             lambda i: {"message": f"m{i}", "rating": i % 5 + 1}),
+        ]
+        try:
+            with override_settings(LMS_THROTTLE_ENABLED=False):
+                for view, path, body in cases:
+                    self._hammer(view, path, body, headers, opts)
+            self._check(student, course, content)
+        finally:
+            if not opts["keep"]:
+                purge_user(teacher.id, with_courses=True)
+                purge_user(student.id)
+
+    def _hammer(self, view, path, body, headers, opts):
+        statuses, latencies = Counter(), []
+        lock = threading.Lock()
+        start = threading.Barrier(opts["threads"])
+
+        def worker():
+            client = Client()
+            start.wait()
+            try:
+                for i in range(opts["requests"]):
+                    began = time.perf_counter()
+                    response = client.post(API + path, json.dumps(body(i)),
+                                           content_type="application/json", **headers)
+                    elapsed = (time.perf_counter() - began) * 1000
+                    with lock:
+                        statuses[response.status_code] += 1
+                        latencies.append(elapsed)
+            finally:
+                connections.close_all()
+
+        threads = [threading.Thread(target=worker) for _ in range(opts["threads"])]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.stdout.write(
+            f"{view:<16} {sum(statuses.values()):>5} request  "
+            f"p50 {statistics.median(latencies):7.1f} ms  status {dict(statuses)}"
+        )
+
+    def _check(self, student, course, content):
+        rating = CourseRating.objects.get(course_id=course.id)
+        expected = CourseRating.compute(course.id)
+        checks = {
+            "completion tunggal": CompletionTracking.objects.filter(user=student, content=content).count() == 1,
+            "bookmark tunggal": Bookmark.objects.filter(user=student, content=content).count() == 1,
+            "feedback tunggal": Feedback.objects.filter(user=student, course=course).count() == 1,
+            "agregat rating cocok": (
+                rating.rating_count == expected["rating_count"]
+                and abs(rating.rating_sum - expected["rating_sum"]) < 1e-6
+            ),
+        }
+        for name, ok in checks.items():
+            style = self.style.SUCCESS if ok else self.style.ERROR
+            self.stdout.write(style(f"{'OK ' if ok else 'GAGAL'} {name}"))
+        if not all(checks.values()):
+            raise CommandError("Upsert tidak konsisten di bawah konkurensi.")
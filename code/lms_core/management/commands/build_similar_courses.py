@@ -0,0 +1,44 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from lms_core import similarity, tenancy
+from lms_core.models import Tenant
+
+
+class Command(BaseCommand):
+    help = (
+        "Bangun daftar course serupa (co-enrollment) per tenant. Default incremental: hanya "
+        "course yang belum punya daftar atau jumlah membernya berubah lebih dari --ratio."
+    )
+    requires_system_checks = []
+
+    def add_arguments(self, parser):
+        parser.add_argument("--full", action="store_true", help="hitung ulang semua course")
+        parser.add_argument("--course", type=int, action="append", dest="courses",
+                            help="hanya course id ini (boleh diulang)")
+        parser.add_argument("--ratio", type=float, default=None,
+                            help=f"ambang perubahan member (default {similarity.REFRESH_RATIO})")
+        parser.add_argument("--tenant", help="slug tenant (default: semua tenant)")
+
+    def handle(self, *args, **opts):
+        slugs = [opts["tenant"]] if opts["tenant"] else list(Tenant.objects.values_list("slug", flat=True))
+        for slug in slugs:
+            try:
+                with tenancy.tenant_context(slug):
+                    self._build(slug, opts)
+            except LookupError as exc:
+                raise CommandError(str(exc))
+
+    def _build(self, slug, opts):
+        started = time.perf_counter()
+        if opts["full"]:
+            built = similarity.build()
+        elif opts["courses"]:
+            built = similarity.build(opts["courses"])
+        else:
+            built = similarity.refresh(opts["ratio"])
+        self.stdout.write(
+            f"{slug}: {built} course dihitung ulang [{similarity.backend()}] "
+            f"({time.perf_counter() - started:.2f}s)"
+        )
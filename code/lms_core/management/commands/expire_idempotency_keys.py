@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from lms_core import tenancy
+from lms_core.models import IdempotencyKey
+
+
+class Command(BaseCommand):
+    help = "Hapus IdempotencyKey yang sudah kedaluwarsa (jalankan berkala, mis. tiap jam)."
+    requires_system_checks = []
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=5000)
+
+    def handle(self, *args, **opts):
+        now = timezone.now()
+        for alias, context in tenancy.maintenance_contexts():
+            total = 0
+            with context:
+                while True:
+                    ids = list(
+                        IdempotencyKey.objects.filter(expires_at__lt=now)
+                        .values_list("id", flat=True)[:opts["batch_size"]]
+                    )
+                    if not ids:
+                        break
+                    total += IdempotencyKey.objects.filter(id__in=ids).delete()[0]
+            self.stdout.write(f"{alias}: {total} idempotency key dihapus")
@@ -0,0 +1,61 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS, close_old_connections
+from django.utils import timezone
+
+from lms_core import events, tenancy
+from lms_core.models import Announcement
+
+
+class Command(BaseCommand):
+    help = (
+        "Kirim event announcement.created untuk pengumuman terjadwal yang publish_date-nya "
+        "sudah lewat (pengumumannya sendiri sudah terbaca tanpa command ini). Jalankan dari "
+        "cron, atau dengan --loop sebagai scheduler yang terus berjalan."
+    )
+    requires_system_checks = []
+
+    def add_arguments(self, parser):
+        parser.add_argument("--loop", action="store_true",
+                            help="jalan terus, bangun tepat saat pengumuman berikutnya jatuh tempo")
+        parser.add_argument("--max-sleep", type=float, default=30.0,
+                            help="batas tidur (detik) di mode --loop, untuk menangkap jadwal baru")
+
+    def handle(self, *args, **opts):
+        if not opts["loop"]:
+            self.publish_all()
+            return
+        while True:
+            close_old_connections()
+            next_due = self.publish_all()
+            delay = opts["max_sleep"]
+            if next_due:
+                delay = min(delay, max((next_due - timezone.now()).total_seconds(), 0.05))
+            time.sleep(delay)
+
+    def publish_all(self):
+        """Jalankan publish() di tiap database tenant. Return jadwal berikutnya (atau None)."""
+        next_due = []
+        for alias, context in tenancy.maintenance_contexts():
+            with context:
+                self.publish(alias)
+                next_due += (
+                    Announcement.objects.filter(announced=False)
+                    .order_by("published_at").values_list("published_at", flat=True)[:1]
+                )
+        return min(next_due, default=None)
+
+    def publish(self, alias=DEFAULT_DB_ALIAS):
+        due = Announcement.announce_due()
+        per_course = {}
+        for ann_id, course_id in due:
+            per_course.setdefault(course_id, []).append(ann_id)
+        # hanya sampai ke client SSE kalau LMS_EVENTS_CACHE dipakai bersama oleh worker web
+        for course_id, ids in per_course.items():
+            events.publish(course_id, "announcement.created", ids=ids)
+        if due:
+            self.stdout.write(
+                f"{timezone.now():%Y-%m-%d %H:%M:%S} {alias}: {len(due)} pengumuman diumumkan"
+            )
+        return len(due)
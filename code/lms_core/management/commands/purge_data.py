@@ -0,0 +1,60 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from lms_core import tenancy
+from lms_core.models import Course
+from lms_core.purge import PURGE_CHUNK_SIZE, PurgeBlocked, purge_course, purge_user
+
+
+class Command(BaseCommand):
+    help = (
+        "Hapus permanen course/user beserta semua datanya, per potongan "
+        "(lebih cepat & hemat memori daripada delete() lewat admin)."
+    )
+    requires_system_checks = []
+
+    def add_arguments(self, parser):
+        parser.add_argument("--course", type=int, action="append", dest="courses", default=[],
+                            help="course id (boleh diulang)")
+        parser.add_argument("--user", type=int, action="append", dest="users", default=[],
+                            help="user id (boleh diulang)")
+        parser.add_argument("--with-courses", action="store_true",
+                            help="ikut hapus course yang diajar user")
+        parser.add_argument("--chunk-size", type=int, default=PURGE_CHUNK_SIZE)
+        parser.add_argument("--tenant", help="slug tenant pemilik --course (user selalu dihapus "
+                                              "dari semua database tenant)")
+        parser.add_argument("--noinput", "--no-input", action="store_false", dest="interactive",
+                            help="jangan minta konfirmasi")
+
+    def handle(self, *args, **opts):
+        if not opts["courses"] and not opts["users"]:
+            raise CommandError("Pilih --course atau --user.")
+        contexts = tenancy.maintenance_contexts(opts["tenant"])
+        if opts["courses"] and len(contexts) > 1:
+            # id course hanya unik per database
+            raise CommandError("--course butuh --tenant kalau ada lebih dari satu database tenant.")
+        targets = [("course", i) for i in opts["courses"]] + [("user", i) for i in opts["users"]]
+        if opts["interactive"]:
+            names = ", ".join(f"{kind} {i}" for kind, i in targets)
+            if input(f"Hapus permanen {names}? Ketik 'yes' untuk lanjut: ") != "yes":
+                raise CommandError("Dibatalkan.")
+
+        def progress(step, deleted):
+            self.stdout.write(f"  {step}: {deleted}")
+
+        for kind, target_id in targets:
+            self.stdout.write(f"{kind} {target_id}")
+            try:
+                if kind == "course":
+                    _, context = tenancy.maintenance_contexts(opts["tenant"])[0]
+                    with context:
+                        # turunan dihapus lewat join tanpa filter tenant: pastikan course-nya milik tenant ini
+                        if not Course.objects.filter(id=target_id).exists():
+                            raise CommandError(f"Course {target_id} tidak ditemukan")
+                        counts = purge_course(target_id, progress, opts["chunk_size"])
+                else:
+                    counts = purge_user(target_id, opts["with_courses"], progress, opts["chunk_size"])
+            except PurgeBlocked as exc:
+                raise CommandError(f"{exc} (pakai --with-courses)")
+            except LookupError as exc:
+                raise CommandError(str(exc))
+            self.stdout.write(f"{kind} {target_id}: {sum(counts.values())} baris dihapus")
@@ -0,0 +1,63 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from lms_core import tenancy
+from lms_core.models import Course, CourseRating
+
+
+class Command(BaseCommand):
+    help = "Bandingkan agregat CourseRating dengan hitung ulang penuh dari Feedback, lalu perbaiki."
+    requires_system_checks = []  # lewati import URLconf/apiv1 dan cek Pillow
+
+    def add_arguments(self, parser):
+        parser.add_argument("--course", type=int, action="append", dest="courses",
+                            help="hanya course id ini (boleh diulang)")
+        parser.add_argument("--check", action="store_true",
+                            help="hanya verifikasi, jangan tulis perubahan")
+        parser.add_argument("--tolerance", type=float, default=1e-6,
+                            help="toleransi selisih float untuk sum/sum_sq")
+        parser.add_argument("--tenant", help="slug tenant (default: semua database tenant)")
+
+    def handle(self, *args, **opts):
+        checked = mismatched = 0
+        for label, context in tenancy.maintenance_contexts(opts["tenant"]):
+            try:
+                with context:
+                    n, bad = self._rebuild(label, opts)
+            except LookupError as exc:
+                raise CommandError(str(exc))
+            checked += n
+            mismatched += bad
+
+        if opts["check"] and mismatched:
+            raise CommandError(f"{checked} course diperiksa, {mismatched} tidak cocok ditemukan.")
+        verb = "ditemukan" if opts["check"] else "diperbaiki"
+        self.stdout.write(self.style.SUCCESS(
+            f"{checked} course diperiksa, {mismatched} tidak cocok {verb}."
+        ))
+
+    def _rebuild(self, label, opts):
+        # --course bisa berisi id dari database tenant lain; hanya course yang ada di sini
+        courses = Course.objects.filter(id__in=opts["courses"]) if opts["courses"] else Course.objects
+        course_ids = list(courses.order_by("id").values_list("id", flat=True))
+        stored = {
+            r.course_id: r
+            for r in CourseRating.objects.filter(course_id__in=course_ids)
+        }
+        mismatched = 0
+        checked = 0
+        for course_id in course_ids:
+            checked += 1
+            expected = CourseRating.compute(course_id)
+            current = stored.get(course_id) or CourseRating(course_id=course_id)
+            diffs = [
+                f"{field}={getattr(current, field)} (expected {value})"
+                for field, value in expected.items()
+                if abs(getattr(current, field) - value) > opts["tolerance"]
+            ]
+            if not diffs:
+                continue
+            mismatched += 1
+            self.stdout.write(f"{label} course #{course_id}: " + ", ".join(diffs))
+            if not opts["check"]:
+                CourseRating.rebuild(course_id)
+        return checked, mismatched
@@ -0,0 +1,43 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from lms_core import rollups, tenancy
+
+
+class Command(BaseCommand):
+    help = (
+        "Perbarui rollup harian (active_learners, completions, comments) dari baris baru "
+        "sejak watermark terakhir. Jalankan berkala (cron) atau dengan --loop."
+    )
+    requires_system_checks = []
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, default=5000)
+        parser.add_argument("--settle", type=int, default=5,
+                            help="lewati baris yang lebih muda dari N detik (transaksi belum commit)")
+        parser.add_argument("--rebuild", action="store_true",
+                            help="hapus semua rollup & watermark lalu hitung ulang dari awal")
+        parser.add_argument("--loop", type=float, metavar="SECONDS",
+                            help="ulangi terus dengan jeda ini")
+
+    def handle(self, *args, **opts):
+        contexts = tenancy.maintenance_contexts()
+        if opts["rebuild"]:
+            for alias, context in contexts:
+                with context:
+                    rollups.reset()
+            self.stdout.write("Rollup dikosongkan.")
+        while True:
+            close_old_connections()
+            for alias, context in tenancy.maintenance_contexts():
+                started = time.perf_counter()
+                with context:
+                    processed = rollups.run(opts["chunk_size"], opts["settle"])
+                if any(processed.values()) or not opts["loop"]:
+                    summary = ", ".join(f"{k}={v}" for k, v in processed.items())
+                    self.stdout.write(f"{alias}: {summary} ({time.perf_counter() - started:.2f}s)")
+            if not opts["loop"]:
+                return
+            time.sleep(opts["loop"])
@@ -0,0 +1,156 @@
+import random
+import time
+from datetime import timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from lms_core import tenancy
+from lms_core.models import (
+    Announcement, Bookmark, Comment, CompletionTracking, Course, CourseContent,
+    CourseMember, CourseRating, Feedback, Tenant,
+)
+
+
+class Command(BaseCommand):
+    help = "Generate dataset sintetis (deterministik per --seed) dengan bulk insert."
+    requires_system_checks = []
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=1000)
+        parser.add_argument("--courses", type=int, default=50)
+        parser.add_argument("--contents-per-course", type=int, default=20)
+        parser.add_argument("--members-per-course", type=int, default=100)
+        parser.add_argument("--comments-per-content", type=int, default=5)
+        parser.add_argument("--completion-rate", type=float, default=0.3,
+                            help="peluang member menyelesaikan tiap konten")
+        parser.add_argument("--bookmark-rate", type=float, default=0.05)
+        parser.add_argument("--feedback-rate", type=float, default=0.2)
+        parser.add_argument("--announcements-per-course", type=int, default=5)
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument("--prefix", default="seed", help="prefix username")
+        parser.add_argument("--password", default="Seed#Pass123")
+        parser.add_argument("--batch-size", type=int, default=2000)
+        parser.add_argument("--tenant", help="slug tenant tujuan (dibuat kalau belum ada)")
+
+    def handle(self, *args, **opts):
+        self.rng = random.Random(opts["seed"])
+        self.batch_size = opts["batch_size"]
+        prefix = opts["prefix"]
+        if User.objects.filter(username__startswith=f"{prefix}_").exists():
+            raise CommandError(f"User dengan prefix '{prefix}_' sudah ada, pakai --prefix lain.")
+
+        if opts["tenant"]:
+            Tenant.objects.get_or_create(slug=opts["tenant"], defaults={"name": opts["tenant"]})
+            with tenancy.tenant_context(opts["tenant"]):
+                self._seed(prefix, opts)
+        else:
+            self._seed(prefix, opts)
+
+    def _seed(self, prefix, opts):
+        started = time.perf_counter()
+        with tenancy.atomic():
+            users   = self._users(prefix, opts["users"], opts["password"])
+            courses = self._courses(prefix, users, opts["courses"])
+            members = self._members(courses, users, opts["members_per_course"])
+            contents = self._contents(courses, opts["contents_per_course"])
+            self._activity(courses, members, contents, opts)
+            self._announcements(courses, opts["announcements_per_course"])
+            for course in courses:
+                CourseRating.rebuild(course.id)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Selesai dalam {time.perf_counter() - started:.1f}s (seed={opts['seed']})."
+        ))
+
+    def _bulk(self, model, objs, **kwargs):
+        created = model.objects.bulk_create(objs, batch_size=self.batch_size, **kwargs)
+        self.stdout.write(f"  {model.__name__:<20}{len(objs):>10}")
+        return created
+
+    def _users(self, prefix, n, password):
+        hashed = make_password(password)  # hash sekali, dipakai semua user
+        return self._bulk(User, [
+            User(username=f"{prefix}_user_{i}", email=f"{prefix}_user_{i}@example.com",
+                 first_name="Seed", last_name=str(i), password=hashed)
+            for i in range(n)
+        ])
+
+    def _courses(self, prefix, users, n):
+        teachers = users[: max(1, len(users) // 20)]
+        return self._bulk(Course, [
+            Course(name=f"{prefix} course {i}", description="Generated course",
+                   price=self.rng.randrange(0, 500_000, 5_000),
+                   teacher=self.rng.choice(teachers))
+            for i in range(n)
+        ])
+
+    def _members(self, courses, users, per_course):
+        members, objs = {}, []
+        for course in courses:
+            sample = self.rng.sample(users, min(per_course, len(users)))
+            for user in sample:
+                if user.id == course.teacher_id:
+                    continue
+                objs.append(CourseMember(course=course, user=user,
+                                         roles="ast" if self.rng.random() < 0.05 else "std"))
+        self._bulk(CourseMember, objs)
+        for m in objs:
+            members.setdefault(m.course_id, []).append(m)
+        return members
+
+    def _contents(self, courses, per_course):
+        objs = [
+            CourseContent(course=course, name=f"Bab {i + 1}", description="Generated content",
+                          video_url=f"https://video.example.com/{course.id}/{i}")
+            for course in courses for i in range(per_course)
+        ]
+        self._bulk(CourseContent, objs)
+        contents = {}
+        for c in objs:
+            contents.setdefault(c.course_id, []).append(c)
+        return contents
+
+    def _activity(self, courses, members, contents, opts):
+        comments, completions, bookmarks, feedback = [], [], [], []
+        comment_counts = {}
+        for course in courses:
+            course_members = members.get(course.id, [])
+            if not course_members:
+                continue
+            for content in contents.get(course.id, []):
+                for _ in range(opts["comments_per_content"]):
+                    comments.append(Comment(content=content, member=self.rng.choice(course_members),
+                                            comment="Lorem ipsum dolor sit amet."))
+                comment_counts[content.id] = opts["comments_per_content"]
+                for member in course_members:
+                    if self.rng.random() < opts["completion_rate"]:
+                        completions.append(CompletionTracking(user_id=member.user_id, content=content))
+                    if self.rng.random() < opts["bookmark_rate"]:
+                        bookmarks.append(Bookmark(user_id=member.user_id, content=content))
+            for member in course_members:
+                if self.rng.random() < opts["feedback_rate"]:
+                    feedback.append(Feedback(course=course, user_id=member.user_id, message="Mantap",
+                                             rating=float(self.rng.randint(1, 5))))
+
+        self._bulk(Comment, comments)
+        self._bulk(CompletionTracking, completions)
+        self._bulk(Bookmark, bookmarks)
+        self._bulk(Feedback, feedback)
+        # comment_count didenormalisasi; tulis sekali per konten
+        updates = [CourseContent(id=cid, comment_count=n) for cid, n in comment_counts.items()]
+        CourseContent.objects.bulk_update(updates, ["comment_count"], batch_size=self.batch_size)
+
+    def _announcements(self, courses, per_course):
+        now = timezone.now()
+        announcements = [
+            Announcement(course=course, title=f"Pengumuman {i + 1}", message="Generated",
+                         publish_date=now + timedelta(days=self.rng.randint(-30, 7)))
+            for course in courses for i in range(per_course)
+        ]
+        for ann in announcements:
+            ann.published_at = ann.publish_date
+            ann.announced = ann.publish_date <= now
+        self._bulk(Announcement, announcements)
@@ -0,0 +1,33 @@
+# Generated by Django 5.1.6 on 2026-10-19 01:20
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lms_core', '0002_category_created_at_category_updated_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CourseRating',
+            fields=[
+                ('course', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='rating', serialize=False, to='lms_core.course')),
+                ('rating_count', models.PositiveIntegerField(default=0)),
+                ('rating_sum', models.FloatField(default=0)),
+                ('rating_sum_sq', models.FloatField(default=0)),
+                ('bucket_1', models.PositiveIntegerField(default=0)),
+                ('bucket_2', models.PositiveIntegerField(default=0)),
+                ('bucket_3', models.PositiveIntegerField(default=0)),
+                ('bucket_4', models.PositiveIntegerField(default=0)),
+                ('bucket_5', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Rating Matkul',
+                'verbose_name_plural': 'Rating Matkul',
+            },
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.1.6 on 2026-10-19 01:26
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_comment_count(apps, schema_editor):
+    CourseContent = apps.get_model('lms_core', 'CourseContent')
+    Comment = apps.get_model('lms_core', 'Comment')
+    counts = (
+        Comment.objects.filter(content=OuterRef('pk'))
+        .order_by().values('content').annotate(n=Count('pk')).values('n')
+    )
+    CourseContent.objects.update(comment_count=Coalesce(Subquery(counts), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lms_core', '0003_courserating'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='coursecontent',
+            name='comment_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='jumlah komentar'),
+        ),
+        migrations.RunPython(backfill_comment_count, migrations.RunPython.noop),
+    ]
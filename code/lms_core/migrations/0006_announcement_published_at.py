@@ -0,0 +1,35 @@
+# Generated by Django 5.1.6 on 2026-10-19 01:35
+
+from django.db import migrations, models
+from django.db.models import F
+from django.utils import timezone
+
+
+def backfill_published_at(apps, schema_editor):
+    # pengumuman lama yang sudah jatuh tempo dianggap tampil sejak publish_date
+    Announcement = apps.get_model('lms_core', 'Announcement')
+    Announcement.objects.filter(publish_date__lte=timezone.now()).update(published_at=F('publish_date'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lms_core', '0005_mediaasset'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='announcement',
+            name='published_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.RunPython(backfill_published_at, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='announcement',
+            index=models.Index(fields=['course', 'published_at', 'id'], name='announcement_feed_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='announcement',
+            index=models.Index(condition=models.Q(('published_at__isnull', True)), fields=['publish_date'], name='announcement_due_idx'),
+        ),
+    ]
@@ -0,0 +1,47 @@
+# Generated by Django 5.1.6 on 2026-10-19 01:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lms_core', '0006_announcement_published_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CommentArchive',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('course_id', models.BigIntegerField(db_index=True)),
+                ('content_id', models.BigIntegerField()),
+                ('user_id', models.BigIntegerField()),
+                ('comment', models.TextField()),
+                ('created_at', models.DateTimeField()),
+            ],
+            options={
+                'verbose_name': 'Arsip Komentar',
+                'verbose_name_plural': 'Arsip Komentar',
+            },
+        ),
+        migrations.CreateModel(
+            name='CompletionArchive',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('course_id', models.BigIntegerField(db_index=True)),
+                ('content_id', models.BigIntegerField()),
+                ('user_id', models.BigIntegerField()),
+                ('completed_at', models.DateTimeField()),
+            ],
+            options={
+                'verbose_name': 'Arsip Completion',
+                'verbose_name_plural': 'Arsip Completion',
+            },
+        ),
+        migrations.AddField(
+            model_name='course',
+            name='archived_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True, verbose_name='Diarsipkan pada'),
+        ),
+    ]
@@ -0,0 +1,90 @@
+# Generated by Django 5.1.6 on 2026-10-19 01:52
+
+import django.db.models.deletion
+import lms_core.tenancy
+from django.conf import settings
+from django.db import migrations, models
+
+
+def create_default_tenant(apps, schema_editor):
+    # semua data lama masuk tenant default; AddField di bawah mengisi tenant_id-nya
+    Tenant = apps.get_model('lms_core', 'Tenant')
+    slug = getattr(settings, 'LMS_DEFAULT_TENANT', 'default')
+    Tenant.objects.using(schema_editor.connection.alias).get_or_create(
+        slug=slug, defaults={'name': slug.title()}
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lms_core', '0009_idempotency_key'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Tenant',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('slug', models.SlugField(unique=True)),
+                ('name', models.CharField(max_length=200)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        # Tenant hanya ada di database default (TenantRouter.allow_migrate)
+        migrations.RunPython(create_default_tenant, migrations.RunPython.noop, hints={'model_name': 'tenant'}),
+        migrations.RemoveIndex(
+            model_name='announcement',
+            name='announcement_feed_idx',
+        ),
+        migrations.AddField(
+            model_name='announcement',
+            name='tenant',
+            field=models.ForeignKey(db_constraint=False, default=lms_core.tenancy.current_tenant_id, on_delete=django.db.models.deletion.PROTECT, related_name='+', to='lms_core.tenant'),
+        ),
+        migrations.AddField(
+            model_name='course',
+            name='tenant',
+            field=models.ForeignKey(db_constraint=False, default=lms_core.tenancy.current_tenant_id, on_delete=django.db.models.deletion.PROTECT, related_name='+', to='lms_core.tenant'),
+        ),
+        migrations.AddField(
+            model_name='coursecontent',
+            name='tenant',
+            field=models.ForeignKey(db_constraint=False, default=lms_core.tenancy.current_tenant_id, on_delete=django.db.models.deletion.PROTECT, related_name='+', to='lms_core.tenant'),
+        ),
+        migrations.AddField(
+            model_name='coursemember',
+            name='tenant',
+            field=models.ForeignKey(db_constraint=False, default=lms_core.tenancy.current_tenant_id, on_delete=django.db.models.deletion.PROTECT, related_name='+', to='lms_core.tenant'),
+        ),
+        migrations.AddField(
+            model_name='feedback',
+            name='tenant',
+            field=models.ForeignKey(db_constraint=False, default=lms_core.tenancy.current_tenant_id, on_delete=django.db.models.deletion.PROTECT, related_name='+', to='lms_core.tenant'),
+        ),
+        migrations.AddIndex(
+            model_name='announcement',
+            index=models.Index(fields=['tenant', 'course', 'published_at', 'id'], name='announcement_feed_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='course',
+            index=models.Index(fields=['tenant', '-created_at'], name='course_tenant_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='course',
+            index=models.Index(fields=['tenant', 'teacher'], name='course_tenant_teacher_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='coursecontent',
+            index=models.Index(fields=['tenant', 'course'], name='content_tenant_course_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='coursemember',
+            index=models.Index(fields=['tenant', 'user'], name='member_tenant_user_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='feedback',
+            index=models.Index(fields=['tenant', 'course'], name='feedback_tenant_course_idx'),
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 5.1.6 on 2026-10-19 01:58
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lms_core', '0010_tenants'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SimilarityState',
+            fields=[
+                ('course', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='similarity_state', serialize=False, to='lms_core.course')),
+                ('member_count', models.PositiveIntegerField(default=0)),
+                ('built_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='SimilarCourse',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('rank', models.PositiveSmallIntegerField()),
+                ('score', models.FloatField()),
+                ('shared', models.PositiveIntegerField()),
+                ('course', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='similar_courses', to='lms_core.course')),
+                ('similar', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='lms_core.course')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('course', 'rank'), name='similar_course_rank')],
+            },
+        ),
+    ]
@@ -0,0 +1,49 @@
+from django.db import migrations
+
+RATING_BUCKETS = 5
+BATCH_SIZE = 1000
+
+
+def backfill_ratings(apps, schema_editor):
+    """Isi CourseRating dari Feedback yang sudah ada (sama dengan CourseRating.compute)."""
+    Feedback = apps.get_model("lms_core", "Feedback")
+    CourseRating = apps.get_model("lms_core", "CourseRating")
+    db = schema_editor.connection.alias
+
+    aggregates = {}
+    ratings = (
+        Feedback.objects.using(db).filter(rating__isnull=False)
+        .order_by().values_list("course_id", "rating")
+    )
+    for course_id, rating in ratings.iterator(chunk_size=BATCH_SIZE):
+        values = aggregates.setdefault(course_id, {
+            "rating_count": 0, "rating_sum": 0.0, "rating_sum_sq": 0.0,
+            **{f"bucket_{b}": 0 for b in range(1, RATING_BUCKETS + 1)},
+        })
+        values["rating_count"]  += 1
+        values["rating_sum"]    += rating
+        values["rating_sum_sq"] += rating * rating
+        values[f"bucket_{min(max(int(round(rating)), 1), RATING_BUCKETS)}"] += 1
+
+    if not aggregates:
+        return
+    existing = set(CourseRating.objects.using(db).values_list("course_id", flat=True))
+    fields = list(next(iter(aggregates.values())))
+    CourseRating.objects.using(db).bulk_update(
+        [CourseRating(course_id=c, **v) for c, v in aggregates.items() if c in existing],
+        fields, batch_size=BATCH_SIZE,
+    )
+    CourseRating.objects.using(db).bulk_create(
+        [CourseRating(course_id=c, **v) for c, v in aggregates.items() if c not in existing],
+        batch_size=BATCH_SIZE,
+    )
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lms_core', '0012_category_global'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_ratings, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,47 @@
+# Generated by Django 5.1.6 on 2026-10-19 09:12
+
+from django.db import migrations, models
+from django.db.models import F
+
+
+def backfill_visible_from(apps, schema_editor):
+    # published_at terisi = event sudah dikirim; baris terjadwal tampil sejak publish_date
+    Announcement = apps.get_model('lms_core', 'Announcement')
+    db = schema_editor.connection.alias
+    Announcement.objects.using(db).filter(published_at__isnull=False).update(announced=True)
+    Announcement.objects.using(db).filter(published_at__isnull=True).update(published_at=F('publish_date'))
+
+
+def restore_scheduled(apps, schema_editor):
+    Announcement = apps.get_model('lms_core', 'Announcement')
+    db = schema_editor.connection.alias
+    Announcement.objects.using(db).filter(announced=False).update(published_at=None)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lms_core', '0013_backfill_course_ratings'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='announcement',
+            name='announcement_due_idx',
+        ),
+        migrations.AddField(
+            model_name='announcement',
+            name='announced',
+            field=models.BooleanField(default=False, editable=False),
+        ),
+        migrations.RunPython(backfill_visible_from, restore_scheduled),
+        migrations.AlterField(
+            model_name='announcement',
+            name='published_at',
+            field=models.DateTimeField(editable=False),
+        ),
+        migrations.AddIndex(
+            model_name='announcement',
+            index=models.Index(condition=models.Q(('announced', False)), fields=['published_at'], name='announcement_due_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.6 on 2026-10-19 02:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lms_core', '0015_user_fk_without_constraint'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='course',
+            name='ends_at',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='Berakhir pada'),
+        ),
+    ]
@@ -0,0 +1,57 @@
+# Generated by Django 5.1.6 on 2026-10-19 02:34
+
+import django.db.models.deletion
+import lms_core.tenancy
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def copy_tenant_from_content(apps, schema_editor):
+    # AddField mengisi tenant default; samakan dengan tenant konten (= tenant course)
+    CourseContent = apps.get_model('lms_core', 'CourseContent')
+    db = schema_editor.connection.alias
+    content_tenant = Subquery(
+        CourseContent.objects.using(db).filter(id=OuterRef('content_id')).values('tenant_id')[:1]
+    )
+    for name in ('Comment', 'CompletionTracking', 'Bookmark'):
+        apps.get_model('lms_core', name).objects.using(db).update(tenant_id=content_tenant)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lms_core', '0016_course_ends_at'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='bookmark',
+            name='tenant',
+            field=models.ForeignKey(db_constraint=False, default=lms_core.tenancy.current_tenant_id, on_delete=django.db.models.deletion.PROTECT, related_name='+', to='lms_core.tenant'),
+        ),
+        migrations.AddField(
+            model_name='comment',
+            name='tenant',
+            field=models.ForeignKey(db_constraint=False, default=lms_core.tenancy.current_tenant_id, on_delete=django.db.models.deletion.PROTECT, related_name='+', to='lms_core.tenant'),
+        ),
+        migrations.AddField(
+            model_name='completiontracking',
+            name='tenant',
+            field=models.ForeignKey(db_constraint=False, default=lms_core.tenancy.current_tenant_id, on_delete=django.db.models.deletion.PROTECT, related_name='+', to='lms_core.tenant'),
+        ),
+        migrations.RunPython(copy_tenant_from_content, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='bookmark',
+            index=models.Index(fields=['tenant', 'user'], name='bookmark_tenant_user_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(fields=['tenant', 'content'], name='comment_tenant_content_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='completiontracking',
+            index=models.Index(fields=['tenant', 'user'], name='completion_tenant_user_idx'),
+        ),
+    ]
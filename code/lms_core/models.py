@@ -1,6 +1,10 @@
 from django.db import models
+from django.utils import timezone
 from django.contrib.auth.models import User
 
+from lms_core.tenancy import TenantManager, current_tenant_id
+from lms_core.upsert import insert_ignore
+
 class Profile(models.Model):
     user = models.OneToOneField(
         User, on_delete=models.CASCADE, related_name="profile"
@@ -15,8 +19,10 @@ class Profile(models.Model):
 
 class Category(models.Model):
     name = models.CharField(max_length=100)
+    # NULL = kategori global (dibuat lewat admin), terlihat oleh semua user
     user = models.ForeignKey(
-        User, on_delete=models.CASCADE, related_name="categories"
+        User, on_delete=models.CASCADE, related_name="categories", null=True, blank=True,
+        db_constraint=False,
     )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -28,7 +34,53 @@ class Category(models.Model):
         return self.name
 
 
-class Course(models.Model):
+class Tenant(models.Model):
+    """Institusi. Data course dipisah per tenant; lihat lms_core/tenancy.py."""
+    slug       = models.SlugField(max_length=50, unique=True)
+    name       = models.CharField(max_length=200)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return self.name
+
+
+class TenantScoped(models.Model):
+    """Model milik satu tenant. `objects` memfilter tenant aktif; `all_objects` tidak."""
+    # tanpa FK constraint: baris bisa tinggal di database tenant tanpa salinan tabel Tenant
+    tenant = models.ForeignKey(
+        Tenant, on_delete=models.PROTECT, default=current_tenant_id,
+        db_constraint=False, related_name="+",
+    )
+
+    objects     = TenantManager()
+    all_objects = models.Manager()
+
+    # field FK (ke Course/CourseContent) yang tenant-nya disalin ke baris baru, bukan tenant aktif
+    tenant_parent = None
+
+    class Meta:
+        abstract = True
+
+    def inherit_tenant(self):
+        """Isi tenant_id dari baris induk `tenant_parent` (dipakai untuk baris baru)."""
+        field = self._meta.get_field(self.tenant_parent)
+        if field.is_cached(self):
+            parent = getattr(self, self.tenant_parent)
+            self.tenant_id = parent.tenant_id if parent else self.tenant_id
+        elif getattr(self, field.attname) is not None:
+            self.tenant_id = (
+                field.related_model.all_objects.filter(id=getattr(self, field.attname))
+                .values_list("tenant_id", flat=True).first()
+                or self.tenant_id
+            )
+
+    def save(self, *args, **kwargs):
+        if self._state.adding and self.tenant_parent:
+            self.inherit_tenant()
+        super().save(*args, **kwargs)
+
+
+class Course(TenantScoped):
     name        = models.CharField("Nama Kursus", max_length=255)
     description = models.TextField("Deskripsi")
     price       = models.IntegerField("Harga")
@@ -40,6 +92,9 @@ class Course(models.Model):
         verbose_name="Pengajar",
         on_delete=models.RESTRICT,
         related_name="courses_created",
+        # user tinggal di database default; FK ke auth_user di model yang dirouting ke
+        # database tenant dibuat tanpa constraint (sama dengan kolom tenant)
+        db_constraint=False,
     )
     category    = models.ForeignKey(
         Category,
@@ -49,6 +104,10 @@ class Course(models.Model):
         blank=True,
         related_name="courses",
     )
+    # course hanya bisa diarsipkan setelah lewat ends_at (kosong = belum dijadwalkan selesai)
+    ends_at     = models.DateTimeField("Berakhir pada", null=True, blank=True)
+    # diisi di awal archive_course: course read-only, completion & komentar pindah ke tabel arsip
+    archived_at = models.DateTimeField("Diarsipkan pada", null=True, blank=True, editable=False)
     created_at  = models.DateTimeField("Dibuat pada", auto_now_add=True)
     updated_at  = models.DateTimeField("Diperbarui pada", auto_now=True)
 
@@ -56,12 +115,20 @@ class Course(models.Model):
         verbose_name = "Mata Kuliah"
         verbose_name_plural = "Data Mata Kuliah"
         ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["tenant", "-created_at"], name="course_tenant_created_idx"),
+            models.Index(fields=["tenant", "teacher"], name="course_tenant_teacher_idx"),
+        ]
 
     def __str__(self):
         return self.name
 
+    def is_finished(self, now=None) -> bool:
+        return self.ends_at is not None and self.ends_at <= (now or timezone.now())
+
     def is_member(self, user: User) -> bool:
-        return self.members.filter(user=user).exists()
+        # query langsung: cache peran (lms_core.permissions) hanya untuk pengecekan di API
+        return self.members.filter(user_id=user.id).exists()
 
 
 ROLE_OPTIONS = [
@@ -70,27 +137,32 @@ ROLE_OPTIONS = [
 ]
 
 
-class CourseMember(models.Model):
+class CourseMember(TenantScoped):
     course  = models.ForeignKey(
         Course, on_delete=models.RESTRICT, related_name="members"
     )
     user    = models.ForeignKey(
-        User, on_delete=models.RESTRICT, related_name="enrollments"
+        User, on_delete=models.RESTRICT, related_name="enrollments", db_constraint=False
     )
     roles   = models.CharField("peran", max_length=3, choices=ROLE_OPTIONS, default="std")
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    tenant_parent = "course"
+
     class Meta:
         verbose_name = "Subscriber Matkul"
         verbose_name_plural = "Subscriber Matkul"
         unique_together = ("course", "user")
+        indexes = [
+            models.Index(fields=["tenant", "user"], name="member_tenant_user_idx"),
+        ]
 
     def __str__(self):
         return f"{self.user.username} in {self.course.name} as {self.roles}"
 
 
-class CourseContent(models.Model):
+class CourseContent(TenantScoped):
     name            = models.CharField("judul konten", max_length=200)
     description     = models.TextField("deskripsi", default="-")
     video_url       = models.CharField("URL Video", max_length=200, null=True, blank=True)
@@ -102,18 +174,24 @@ class CourseContent(models.Model):
         "self", on_delete=models.RESTRICT,
         null=True, blank=True, related_name="children"
     )
+    comment_count   = models.PositiveIntegerField("jumlah komentar", default=0, editable=False)
     created_at      = models.DateTimeField(auto_now_add=True)
     updated_at      = models.DateTimeField(auto_now=True)
 
+    tenant_parent = "course"
+
     class Meta:
         verbose_name = "Konten Matkul"
         verbose_name_plural = "Konten Matkul"
+        indexes = [
+            models.Index(fields=["tenant", "course"], name="content_tenant_course_idx"),
+        ]
 
     def __str__(self):
         return f"{self.course.name} → {self.name}"
 
 
-class Comment(models.Model):
+class Comment(TenantScoped):
     content    = models.ForeignKey(
         CourseContent, on_delete=models.CASCADE, related_name="comments"
     )
@@ -124,75 +202,409 @@ class Comment(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    tenant_parent = "content"
+
     class Meta:
         verbose_name = "Komentar"
         verbose_name_plural = "Komentar"
+        indexes = [
+            models.Index(fields=["tenant", "content"], name="comment_tenant_content_idx"),
+        ]
 
     def __str__(self):
         return f"{self.member.user.username}: {self.comment[:30]}"
 
 
-class Announcement(models.Model):
+class Announcement(TenantScoped):
     course       = models.ForeignKey(
         Course, on_delete=models.CASCADE, related_name="announcements"
     )
     title        = models.CharField(max_length=255)
     message      = models.TextField()
     publish_date = models.DateTimeField()
+    # saat pengumuman mulai tampil: publish_date kalau masih di depan, selain itu waktu
+    # disimpan. Baris dengan published_at <= now() terbaca tanpa menunggu scheduler;
+    # dipakai juga sebagai cursor feed.
+    published_at = models.DateTimeField(editable=False)
+    # event announcement.created sudah dikirim (langsung, atau oleh publish_announcements)
+    announced    = models.BooleanField(default=False, editable=False)
     created_at   = models.DateTimeField(auto_now_add=True)
     updated_at   = models.DateTimeField(auto_now=True)
 
+    tenant_parent = "course"
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["tenant", "course", "published_at", "id"], name="announcement_feed_idx"),
+            models.Index(
+                fields=["published_at"], name="announcement_due_idx",
+                condition=models.Q(announced=False),
+            ),
+        ]
+
     def __str__(self):
         return f"[{self.course.name}] {self.title}"
 
-
-class CompletionTracking(models.Model):
+    def schedule(self, now=None):
+        """Sesuaikan published_at dengan publish_date (sebelum save).
+
+        Return True kalau pengumuman baru tampil sekarang; pemanggil yang mengirim
+        event announcement.created.
+        """
+        now = now or timezone.now()
+        if self.publish_date > now:
+            self.published_at = self.publish_date
+            self.announced = False
+        elif self.published_at is None or self.published_at > now:
+            self.published_at = now
+            self.announced = True
+            return True
+        return False
+
+    def save(self, *args, **kwargs):
+        # admin dan pemanggil lain tidak perlu memanggil schedule() sendiri; bulk_create tetap harus
+        self.schedule()
+        super().save(*args, **kwargs)
+
+    def is_visible(self, now=None):
+        return self.published_at <= (now or timezone.now())
+
+    @classmethod
+    def announce_due(cls, now=None):
+        """Tandai pengumuman terjadwal yang sudah tampil tapi belum dikirim event-nya.
+
+        Return list (id, course_id) yang baru ditandai.
+        """
+        now = now or timezone.now()
+        due = list(
+            cls.objects.filter(announced=False, published_at__lte=now)
+            .values_list("id", "course_id")
+        )
+        if due:
+            cls.objects.filter(
+                id__in=[ann_id for ann_id, _ in due], announced=False
+            ).update(announced=True)
+        return due
+
+
+class CompletionTracking(TenantScoped):
     user         = models.ForeignKey(
-        User, on_delete=models.CASCADE, related_name="completions"
+        User, on_delete=models.CASCADE, related_name="completions", db_constraint=False
     )
     content      = models.ForeignKey(
         CourseContent, on_delete=models.CASCADE, related_name="completions"
     )
     completed_at = models.DateTimeField(auto_now_add=True)
 
+    tenant_parent = "content"
+
     class Meta:
         unique_together = ("user", "content")
         ordering = ["-completed_at"]
+        indexes = [
+            models.Index(fields=["tenant", "user"], name="completion_tenant_user_idx"),
+        ]
 
     def __str__(self):
         return f"{self.user.username} completed {self.content.name}"
 
 
-class Bookmark(models.Model):
+class Bookmark(TenantScoped):
     user       = models.ForeignKey(
-        User, on_delete=models.CASCADE, related_name="bookmarks"
+        User, on_delete=models.CASCADE, related_name="bookmarks", db_constraint=False
     )
     content    = models.ForeignKey(
         CourseContent, on_delete=models.CASCADE, related_name="bookmarks"
     )
     created_at = models.DateTimeField(auto_now_add=True)
 
+    tenant_parent = "content"
+
     class Meta:
         unique_together = ("user", "content")
+        indexes = [
+            models.Index(fields=["tenant", "user"], name="bookmark_tenant_user_idx"),
+        ]
 
     def __str__(self):
         return f"🔖 {self.user.username} → {self.content.name}"
 
 
-class Feedback(models.Model):
+class Feedback(TenantScoped):
     course     = models.ForeignKey(
         Course, on_delete=models.CASCADE, related_name="feedbacks"
     )
     user       = models.ForeignKey(
-        User, on_delete=models.CASCADE, related_name="feedbacks"
+        User, on_delete=models.CASCADE, related_name="feedbacks", db_constraint=False
     )
     message    = models.TextField()
     rating     = models.FloatField(null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    tenant_parent = "course"
+
     class Meta:
         unique_together = ("course", "user")
+        indexes = [
+            models.Index(fields=["tenant", "course"], name="feedback_tenant_course_idx"),
+        ]
 
     def __str__(self):
         return f"{self.user.username} → {self.course.name}"
+
+
+RATING_BUCKETS = 5
+
+
+def rating_bucket(rating: float) -> int:
+    # bucket histogram 1..RATING_BUCKETS, rating di luar rentang di-clamp
+    return min(max(int(round(rating)), 1), RATING_BUCKETS)
+
+
+class CourseRating(models.Model):
+    course       = models.OneToOneField(
+        Course, on_delete=models.CASCADE, primary_key=True, related_name="rating"
+    )
+    rating_count = models.PositiveIntegerField(default=0)
+    rating_sum   = models.FloatField(default=0)
+    rating_sum_sq = models.FloatField(default=0)
+    bucket_1     = models.PositiveIntegerField(default=0)
+    bucket_2     = models.PositiveIntegerField(default=0)
+    bucket_3     = models.PositiveIntegerField(default=0)
+    bucket_4     = models.PositiveIntegerField(default=0)
+    bucket_5     = models.PositiveIntegerField(default=0)
+    updated_at   = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Rating Matkul"
+        verbose_name_plural = "Rating Matkul"
+
+    def __str__(self):
+        return f"course #{self.course_id}: {self.average} ({self.rating_count})"
+
+    @property
+    def average(self):
+        if not self.rating_count:
+            return None
+        return self.rating_sum / self.rating_count
+
+    @property
+    def stddev(self):
+        if not self.rating_count:
+            return None
+        mean = self.rating_sum / self.rating_count
+        return max(self.rating_sum_sq / self.rating_count - mean * mean, 0) ** 0.5
+
+    @property
+    def histogram(self):
+        return {
+            str(b): getattr(self, f"bucket_{b}") for b in range(1, RATING_BUCKETS + 1)
+        }
+
+    @classmethod
+    def apply(cls, course_id, old_rating=None, new_rating=None):
+        """Geser agregat dari old_rating ke new_rating (None = tidak ada rating)."""
+        if old_rating == new_rating:
+            return
+        changes = {}
+        count_delta = sum_delta = sq_delta = 0
+        if old_rating is not None:
+            count_delta -= 1
+            sum_delta   -= old_rating
+            sq_delta    -= old_rating * old_rating
+            changes[f"bucket_{rating_bucket(old_rating)}"] = -1
+        if new_rating is not None:
+            count_delta += 1
+            sum_delta   += new_rating
+            sq_delta    += new_rating * new_rating
+            key = f"bucket_{rating_bucket(new_rating)}"
+            changes[key] = changes.get(key, 0) + 1
+
+        insert_ignore(cls, {"course_id": course_id}, unique_fields=["course"])
+        updates = {
+            "rating_count":  models.F("rating_count") + count_delta,
+            "rating_sum":    models.F("rating_sum") + sum_delta,
+            "rating_sum_sq": models.F("rating_sum_sq") + sq_delta,
+        }
+        for key, delta in changes.items():
+            if delta:
+                updates[key] = models.F(key) + delta
+        cls.objects.filter(course_id=course_id).update(**updates)
+
+    @classmethod
+    def compute(cls, course_id):
+        """Hitung ulang agregat dari tabel Feedback (full recompute)."""
+        values = {
+            "rating_count": 0, "rating_sum": 0.0, "rating_sum_sq": 0.0,
+            **{f"bucket_{b}": 0 for b in range(1, RATING_BUCKETS + 1)},
+        }
+        ratings = Feedback.objects.filter(
+            course_id=course_id, rating__isnull=False
+        ).values_list("rating", flat=True)
+        for rating in ratings.iterator():
+            values["rating_count"]  += 1
+            values["rating_sum"]    += rating
+            values["rating_sum_sq"] += rating * rating
+            values[f"bucket_{rating_bucket(rating)}"] += 1
+        return values
+
+    @classmethod
+    def rebuild(cls, course_id):
+        values = cls.compute(course_id)
+        obj, _ = cls.objects.update_or_create(course_id=course_id, defaults=values)
+        return obj
+
+
+ASSET_STATUS = [
+    ("pending", "Diproses"),
+    ("ready", "Siap"),
+    ("failed", "Gagal"),
+]
+
+
+class MediaAsset(models.Model):
+    """File unggahan yang dialamatkan lewat sha256 isinya (satu file fisik per isi)."""
+    sha256       = models.CharField(max_length=64, unique=True)
+    file         = models.FileField(upload_to="assets/", max_length=255)
+    content_type = models.CharField(max_length=100)
+    size         = models.PositiveBigIntegerField()
+    width        = models.PositiveIntegerField(null=True, blank=True)
+    height       = models.PositiveIntegerField(null=True, blank=True)
+    # {"256": "thumbs/<sha>_256.webp", ...} — diisi worker di lms_core.tasks
+    thumbnails   = models.JSONField(default=dict, blank=True)
+    status       = models.CharField(max_length=10, choices=ASSET_STATUS, default="ready")
+    uploaded_by  = models.ForeignKey(
+        User, on_delete=models.SET_NULL, null=True, blank=True, related_name="media_assets",
+        db_constraint=False,
+    )
+    created_at   = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.sha256[:12]} ({self.content_type})"
+
+    @property
+    def is_image(self):
+        return self.width is not None
+
+
+# ─── Arsip ────────────────────────────────────────────────────
+# Baris completion/komentar dari course yang sudah selesai dipindah ke sini oleh
+# lms_core.course_ops.archive_course. Sengaja tanpa FK (id polos) dan tanpa index
+# selain course_id supaya ringkas dan tidak ikut dicek saat menghapus user/konten.
+
+class CompletionArchive(models.Model):
+    course_id    = models.BigIntegerField(db_index=True)
+    content_id   = models.BigIntegerField()
+    user_id      = models.BigIntegerField()
+    completed_at = models.DateTimeField()
+
+    class Meta:
+        verbose_name = "Arsip Completion"
+        verbose_name_plural = "Arsip Completion"
+
+
+class CommentArchive(models.Model):
+    course_id  = models.BigIntegerField(db_index=True)
+    content_id = models.BigIntegerField()
+    user_id    = models.BigIntegerField()
+    comment    = models.TextField()
+    created_at = models.DateTimeField()
+
+    class Meta:
+        verbose_name = "Arsip Komentar"
+        verbose_name_plural = "Arsip Komentar"
+
+
+# ─── Rollup aktivitas ────────────────────────────────────────
+# Diisi incremental oleh `manage.py rollup_activity` (lms_core/rollups.py).
+
+ROLLUP_METRICS = [
+    ("active_learners", "Learner aktif"),
+    ("completions", "Completion"),
+    ("comments", "Komentar"),
+]
+
+
+class ActivityRollup(models.Model):
+    course = models.ForeignKey(Course, on_delete=models.CASCADE, related_name="activity_rollups")
+    day    = models.DateField()
+    metric = models.CharField(max_length=20, choices=ROLLUP_METRICS)
+    value  = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["course", "metric", "day"], name="activity_rollup_key"),
+        ]
+
+    def __str__(self):
+        return f"{self.course_id} {self.day} {self.metric}={self.value}"
+
+
+class LearnerActivityDay(models.Model):
+    """Pasangan (course, hari, user) unik; sumber hitungan active_learners per hari."""
+    course = models.ForeignKey(Course, on_delete=models.CASCADE, related_name="+")
+    day    = models.DateField()
+    user   = models.ForeignKey(User, on_delete=models.CASCADE, related_name="+", db_constraint=False)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["course", "day", "user"], name="learner_activity_day_key"),
+        ]
+
+
+class RollupWatermark(models.Model):
+    """Id terakhir yang sudah dihitung per tabel sumber."""
+    source     = models.CharField(max_length=30, primary_key=True)
+    last_id    = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.source} ≤ {self.last_id}"
+
+
+class IdempotencyKey(models.Model):
+    """Response pertama untuk header Idempotency-Key per user; lihat lms_core/idempotency.py."""
+    user_id      = models.BigIntegerField()
+    key          = models.CharField(max_length=255)
+    fingerprint  = models.CharField(max_length=64)          # sha256 method + path + body
+    status_code  = models.PositiveSmallIntegerField(null=True)
+    content_type = models.CharField(max_length=100, blank=True)
+    body         = models.BinaryField(null=True)
+    created_at   = models.DateTimeField(auto_now_add=True)
+    expires_at   = models.DateTimeField(db_index=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["user_id", "key"], name="idempotency_user_key"),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id}:{self.key} → {self.status_code}"
+
+
+class SimilarCourse(models.Model):
+    """Top-K course yang paling sering diambil bersama `course`; diisi lms_core/similarity.py."""
+    course  = models.ForeignKey(Course, on_delete=models.CASCADE, related_name="similar_courses")
+    rank    = models.PositiveSmallIntegerField()
+    similar = models.ForeignKey(Course, on_delete=models.CASCADE, related_name="+")
+    score   = models.FloatField()                    # cosine co-enrollment, 0..1
+    shared  = models.PositiveIntegerField()          # jumlah user yang ikut keduanya
+
+    class Meta:
+        constraints = [
+            # sekaligus index untuk GET /courses/{id}/similar
+            models.UniqueConstraint(fields=["course", "rank"], name="similar_course_rank"),
+        ]
+
+    def __str__(self):
+        return f"{self.course_id} #{self.rank} → {self.similar_id} ({self.score:.3f})"
+
+
+class SimilarityState(models.Model):
+    """Jumlah member course saat daftar SimilarCourse-nya terakhir dibangun."""
+    course       = models.OneToOneField(
+        Course, on_delete=models.CASCADE, primary_key=True, related_name="similarity_state"
+    )
+    member_count = models.PositiveIntegerField(default=0)
+    built_at     = models.DateTimeField(auto_now=True)
@@ -0,0 +1,79 @@
+from django.conf import settings
+from django.core.cache import cache
+
+from lms_core import tenancy
+from lms_core.models import Course, CourseMember
+
+ROLE_CACHE_TTL = getattr(settings, "LMS_ROLE_CACHE_TTL", 30)
+# method yang boleh memakai peran dari cache; selain ini peran dibaca ulang dari database
+CACHED_METHODS = ("GET", "HEAD", "OPTIONS")
+
+
+def _cache_key(user_id, using=None):
+    # per database: tenant di database lain punya id course sendiri
+    return f"lms_roles:{using or tenancy.db_alias()}:{user_id}"
+
+
+def roles_for_user(user_id, fresh=False):
+    """
+    {course_id: tenant_id} tempat user jadi member / pengajar, di semua tenant pada
+    database aktif. Disimpan di cache lintas request selama ROLE_CACHE_TTL detik dan
+    dibuang oleh signal enrollment/course. `fresh=True` selalu membaca database (lalu
+    memperbarui cache). Pakai `course_roles()` untuk cek izin: hasilnya sudah
+    dibatasi ke tenant aktif; request tulis di sana selalu memakai `fresh`.
+    """
+    roles = None if fresh else cache.get(_cache_key(user_id))
+    if roles is None:
+        roles = {
+            "member": dict(
+                CourseMember.all_objects.filter(user_id=user_id).values_list("course_id", "tenant_id")
+            ),
+            "teacher": dict(
+                Course.all_objects.filter(teacher_id=user_id).values_list("id", "tenant_id")
+            ),
+        }
+        cache.set(_cache_key(user_id), roles, ROLE_CACHE_TTL)
+    return roles
+
+
+def _in_tenant(courses, tenant):
+    if tenant is None or tenant.id is None:
+        return frozenset(courses)
+    return frozenset(c for c, tenant_id in courses.items() if tenant_id == tenant.id)
+
+
+def course_roles(request):
+    # cache per request di atas cache lintas request; course tenant lain tidak dihitung,
+    # jadi tulisan dengan course_id= tidak bisa menyasar course di luar tenant aktif
+    roles = getattr(request, "_lms_course_roles", None)
+    if roles is None:
+        tenant = tenancy.current_tenant()
+        roles = {
+            role: _in_tenant(courses, tenant)
+            for role, courses in roles_for_user(
+                request.user.id, fresh=request.method not in CACHED_METHODS
+            ).items()
+        }
+        request._lms_course_roles = roles
+    return roles
+
+
+def member_course_ids(request):
+    return course_roles(request)["member"]
+
+
+def is_member(request, course_id):
+    return course_id in course_roles(request)["member"]
+
+
+def is_teacher(request, course_id):
+    return course_id in course_roles(request)["teacher"]
+
+
+def can_access(request, course_id):
+    roles = course_roles(request)
+    return course_id in roles["member"] or course_id in roles["teacher"]
+
+
+def invalidate_user(*user_ids, using=None):
+    cache.delete_many([_cache_key(uid, using) for uid in user_ids if uid is not None])
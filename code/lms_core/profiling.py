@@ -0,0 +1,298 @@
+"""
+Profiling per request untuk semua operation sync apiv1.
+
+Dua cara memicu:
+- on-demand: header `X-Profile` (atau query `?_profile=`) dari user staff; dicek
+  setelah auth JWT dan throttle operation lolos, jadi user biasa tidak bisa
+  membuat server memprofil request-nya;
+- sampling: 1 dari LMS_PROFILE_SAMPLE_EVERY request (0 = mati). Request lain hanya
+  membayar satu increment counter.
+
+Hasil disimpan di LMS_PROFILE_DIR (file terlama dibuang di atas LMS_PROFILE_KEEP) dan
+namanya dikirim lewat header `X-Profile-Id`; unduh lewat GET /debug/profiles/{name}.
+
+Format:
+- `speedscope` (default): stack sampler bawaan, JSON untuk https://www.speedscope.app;
+  berisi profil "sampled" Python plus profil "evented" SQL di timeline yang sama;
+- `collapsed`: stack sampler, format `a;b;c jumlah` untuk flamegraph.pl/inferno;
+- `pstats`: cProfile deterministik (overhead lebih besar), buka dengan snakeviz/pstats.
+
+Pada sampel yang diambil saat query berjalan, frame paling dalam adalah `SQL: ...`,
+sehingga waktu tunggu database terlihat di flamegraph di bawah pemanggilnya.
+"""
+import cProfile
+import itertools
+import json
+import os
+import sys
+import threading
+import time
+import uuid
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db import DEFAULT_DB_ALIAS, connections
+from ninja.operation import AsyncOperation
+
+from lms_core import tenancy
+
+HEADER = "X-Profile"
+QUERY_PARAM = "_profile"
+FORMATS = {"speedscope": ".speedscope.json", "collapsed": ".collapsed.txt", "pstats": ".prof"}
+SQL_LABEL_LENGTH = 120
+
+_counter = itertools.count(1)
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+def profile_dir():
+    return Path(_setting("LMS_PROFILE_DIR", Path(settings.BASE_DIR) / "profiles"))
+
+
+class StackSampler:
+    """Ambil stack thread target tiap `interval` detik dari thread terpisah."""
+
+    def __init__(self, thread_id, interval, root_code):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.root_code = root_code
+        self.samples = []          # (waktu, stack tuple, sql atau None)
+        self.current_sql = None
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._loop, name="lms-profiler", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _loop(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                if code is self.root_code:
+                    break
+                stack.append((code.co_name, code.co_filename, code.co_firstlineno))
+                frame = frame.f_back
+            if stack:
+                stack.reverse()
+                self.samples.append((time.perf_counter(), tuple(stack), self.current_sql))
+
+
+class Capture:
+    """Satu request yang sedang diprofil."""
+
+    def __init__(self, fmt, reason, root_code):
+        self.fmt = fmt
+        self.reason = reason
+        self.started = time.perf_counter()
+        self.queries = []          # (mulai, durasi, sql) relatif terhadap started
+        self.sampler = None
+        self.profiler = None
+        self._connections = [connections[alias] for alias in {DEFAULT_DB_ALIAS, tenancy.db_alias()}]
+        if fmt == "pstats":
+            self.profiler = cProfile.Profile()
+        else:
+            self.sampler = StackSampler(
+                threading.get_ident(), _setting("LMS_PROFILE_INTERVAL", 0.001), root_code
+            )
+
+    def _record_sql(self, execute, sql, params, many, context):
+        began = time.perf_counter()
+        if self.sampler:
+            self.sampler.current_sql = " ".join(sql.split())[:SQL_LABEL_LENGTH]
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            if self.sampler:
+                self.sampler.current_sql = None
+            self.queries.append((began - self.started, time.perf_counter() - began, sql))
+
+    def start(self):
+        for connection in self._connections:
+            connection.execute_wrappers.append(self._record_sql)
+        if self.profiler:
+            self.profiler.enable()
+        else:
+            self.sampler.start()
+
+    def stop(self):
+        if self.profiler:
+            self.profiler.disable()
+        else:
+            self.sampler.stop()
+        for connection in self._connections:
+            connection.execute_wrappers.remove(self._record_sql)
+        self.elapsed = time.perf_counter() - self.started
+
+    # ─── Output ───
+
+    @staticmethod
+    def _frame_label(frame):
+        name, filename, line = frame
+        head, sep, tail = filename.rpartition("site-packages" + os.sep)
+        path = tail if sep else os.path.relpath(filename, settings.BASE_DIR)
+        return f"{name} ({path}:{line})"
+
+    def _stacks(self):
+        """(stack label, bobot ms) per sampel; SQL jadi frame paling dalam."""
+        previous = self.started
+        for at, stack, sql in self.sampler.samples:
+            labels = [self._frame_label(f) for f in stack]
+            if sql:
+                labels.append(f"SQL: {sql}")
+            yield labels, (at - previous) * 1000
+            previous = at
+
+    def collapsed(self):
+        counts = {}
+        for labels, _ in self._stacks():
+            key = ";".join(labels)
+            counts[key] = counts.get(key, 0) + 1
+        return "".join(f"{stack} {n}\n" for stack, n in counts.items())
+
+    def speedscope(self, name):
+        frames, index = [], {}
+
+        def frame_id(label):
+            if label not in index:
+                index[label] = len(frames)
+                frames.append({"name": label})
+            return index[label]
+
+        samples, weights = [], []
+        for labels, weight in self._stacks():
+            samples.append([frame_id(label) for label in labels])
+            weights.append(round(weight, 3))
+        events = []
+        for began, duration, sql in self.queries:
+            fid = frame_id("SQL: " + " ".join(sql.split())[:SQL_LABEL_LENGTH])
+            events.append({"type": "O", "frame": fid, "at": round(began * 1000, 3)})
+            events.append({"type": "C", "frame": fid, "at": round((began + duration) * 1000, 3)})
+        end = round(self.elapsed * 1000, 3)
+        return json.dumps({
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "name": name,
+            "exporter": "lms_core.profiling",
+            "shared": {"frames": frames},
+            "profiles": [
+                {"type": "sampled", "name": "python", "unit": "milliseconds",
+                 "startValue": 0, "endValue": end, "samples": samples, "weights": weights},
+                {"type": "evented", "name": f"sql ({len(self.queries)} query)", "unit": "milliseconds",
+                 "startValue": 0, "endValue": end, "events": events},
+            ],
+        })
+
+    def save(self, view_name, status):
+        directory = profile_dir()
+        directory.mkdir(parents=True, exist_ok=True)
+        name = "{}-{}_{}_{}_{}_{:.0f}ms{}".format(
+            time.strftime("%Y%m%dT%H%M%S"), uuid.uuid4().hex[:6], self.reason,
+            view_name, status, self.elapsed * 1000, FORMATS[self.fmt],
+        )
+        path = directory / name
+        if self.fmt == "pstats":
+            self.profiler.dump_stats(path)
+        elif self.fmt == "collapsed":
+            path.write_text(self.collapsed())
+        else:
+            path.write_text(self.speedscope(f"{view_name} {status}"))
+        _rotate(directory)
+        return name
+
+    def server_timing(self):
+        sql_ms = sum(d for _, d, _ in self.queries) * 1000
+        return (f'total;dur={self.elapsed * 1000:.1f}, '
+                f'sql;dur={sql_ms:.1f};desc="{len(self.queries)} query"')
+
+
+def _rotate(directory):
+    keep = _setting("LMS_PROFILE_KEEP", 200)
+    files = sorted(directory.iterdir(), key=lambda p: p.stat().st_mtime)
+    for old in files[:-keep] if keep else []:
+        old.unlink(missing_ok=True)
+
+
+def list_profiles():
+    directory = profile_dir()
+    if not directory.is_dir():
+        return []
+    files = sorted(directory.iterdir(), key=lambda p: p.stat().st_mtime, reverse=True)
+    return [{"name": p.name, "size": p.stat().st_size} for p in files]
+
+
+def profile_path(name):
+    """Path file profil, atau None kalau nama tidak valid / tidak ada."""
+    if "/" in name or "\\" in name or name.startswith("."):
+        return None
+    path = profile_dir() / name
+    return path if path.is_file() else None
+
+
+def is_staff(request):
+    user_id = getattr(request.user, "id", None)
+    return user_id is not None and User.objects.filter(id=user_id, is_staff=True).exists()
+
+
+def _requested_format(request):
+    value = request.headers.get(HEADER) or request.GET.get(QUERY_PARAM)
+    if not value:
+        return None
+    return value if value in FORMATS else "speedscope"
+
+
+def _decide(request):
+    """(format, alasan) kalau request ini diprofil, atau None."""
+    fmt = _requested_format(request)
+    if fmt and is_staff(request):
+        return fmt, "demand"
+    every = _setting("LMS_PROFILE_SAMPLE_EVERY", 0)
+    if every and next(_counter) % every == 0:
+        return "speedscope", "sample"
+    return None
+
+
+def install(api):
+    """Pasang hook profiling di semua operation sync `api` (panggil setelah semua router ditambah)."""
+    for _, router in api._routers:
+        for path_view in router.path_operations.values():
+            for operation in path_view.operations:
+                if not isinstance(operation, AsyncOperation):
+                    _wrap(operation)
+
+
+def _wrap(operation):
+    run, run_checks = operation.run, operation._run_checks
+    view_name = operation.view_func.__name__
+
+    def checks_then_start(request):
+        error = run_checks(request)
+        if error is None:
+            decision = _decide(request)
+            if decision:
+                capture = request._lms_profile = Capture(*decision, profiled_run.__code__)
+                capture.start()
+        return error
+
+    def profiled_run(request, *args, **kwargs):
+        try:
+            response = run(request, *args, **kwargs)
+        finally:
+            capture = request.__dict__.pop("_lms_profile", None)
+            if capture:
+                capture.stop()
+        if capture:
+            response["X-Profile-Id"] = capture.save(view_name, response.status_code)
+            response["Server-Timing"] = capture.server_timing()
+        return response
+
+    operation._run_checks = checks_then_start
+    operation.run = profiled_run
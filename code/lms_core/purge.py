@@ -0,0 +1,240 @@
+"""
+Hapus permanen course atau user beserta semua datanya, tanpa collector Django.
+
+Course.delete()/User.delete() biasa memuat setiap baris turunan ke memori dan
+mengirim signal per baris; untuk course besar itu makan menit dan RAM besar.
+Di sini turunan dihapus dengan DELETE ... WHERE id IN (...) per potongan, urut
+dari daun ke akar, satu transaksi per potongan. Counter (comment_count,
+CourseRating) ikut dikoreksi di transaksi yang sama, jadi kalau purge berhenti di
+tengah, data yang tersisa tetap konsisten dan purge aman diulang.
+
+Baris terakhir (course/user) tetap dihapus lewat ORM: saat itu turunannya sudah
+kosong, dan signal/cascade kecil lain (LogEntry, m2m group) tetap jalan.
+"""
+import logging
+import uuid
+
+from django.core.cache import cache
+from django.db import connections, transaction
+from django.db.models import F, Q
+from django.contrib.auth.models import User
+from django.utils import timezone
+
+from lms_core import categories, tenancy
+from lms_core.models import (
+    ActivityRollup, Announcement, Bookmark, Category, Comment, CommentArchive,
+    CompletionArchive, CompletionTracking, Course, CourseContent, CourseMember,
+    CourseRating, Feedback, IdempotencyKey, LearnerActivityDay, MediaAsset, Profile,
+    SimilarCourse, SimilarityState,
+)
+from lms_core.permissions import invalidate_user
+from lms_core.tasks import enqueue
+
+logger = logging.getLogger(__name__)
+
+PURGE_CHUNK_SIZE = 2000
+JOB_PREFIX = "lms_purge"
+JOB_TTL = 24 * 3600
+
+
+class PurgeBlocked(Exception):
+    """Purge tidak bisa dijalankan (mis. user masih mengajar course)."""
+
+
+def _noop(step, deleted):
+    pass
+
+
+def delete_chunks(queryset, step, progress=_noop, chunk_size=PURGE_CHUNK_SIZE,
+                  fields=(), on_chunk=None):
+    """Hapus baris `queryset` per potongan dengan DELETE berdasarkan pk.
+
+    `on_chunk(rows)` dipanggil di transaksi yang sama sebelum DELETE (rows berisi
+    pk dan `fields`), untuk koreksi counter. Return jumlah baris terhapus.
+    """
+    model = queryset.model
+    conn = connections[queryset.db]
+    table = conn.ops.quote_name(model._meta.db_table)
+    pk = conn.ops.quote_name(model._meta.pk.column)
+    deleted = 0
+    while True:
+        with transaction.atomic(using=queryset.db):
+            rows = list(queryset.order_by("pk").values("pk", *fields)[:chunk_size])
+            if not rows:
+                return deleted
+            if on_chunk:
+                on_chunk(rows)
+            ids = [row["pk"] for row in rows]
+            with conn.cursor() as cursor:
+                cursor.execute(
+                    f"DELETE FROM {table} WHERE {pk} IN ({', '.join(['%s'] * len(ids))})", ids
+                )
+        deleted += len(ids)
+        progress(step, deleted)
+
+
+def _uncount_comments(rows):
+    per_content = {}
+    for row in rows:
+        per_content[row["content_id"]] = per_content.get(row["content_id"], 0) + 1
+    for content_id, n in per_content.items():
+        CourseContent.objects.filter(id=content_id).update(comment_count=F("comment_count") - n)
+
+
+def _invalidate_members(rows):
+    tenancy.on_commit(lambda: invalidate_user(*{row["user_id"] for row in rows}))
+
+
+def _unrate(rows):
+    for row in rows:
+        if row["rating"] is not None:
+            CourseRating.apply(row["course_id"], row["rating"], None)
+
+
+def purge_course(course_id, progress=_noop, chunk_size=PURGE_CHUNK_SIZE):
+    """Hapus course dan semua turunannya. Return {step: jumlah_baris}."""
+    counts = {}
+
+    def run(step, queryset, **kwargs):
+        counts[step] = delete_chunks(queryset, step, progress, chunk_size, **kwargs)
+
+    contents = CourseContent.objects.filter(course_id=course_id)
+    run("comments", Comment.objects.filter(Q(content__course_id=course_id) | Q(member__course_id=course_id)),
+        fields=("content_id",), on_chunk=_uncount_comments)
+    run("completions", CompletionTracking.objects.filter(content__course_id=course_id))
+    run("bookmarks", Bookmark.objects.filter(content__course_id=course_id))
+    run("feedback", Feedback.objects.filter(course_id=course_id))
+    run("announcements", Announcement.objects.filter(course_id=course_id))
+    run("activity_rollups", ActivityRollup.objects.filter(course_id=course_id))
+    run("learner_days", LearnerActivityDay.objects.filter(course_id=course_id))
+    run("completion_archive", CompletionArchive.objects.filter(course_id=course_id))
+    run("comment_archive", CommentArchive.objects.filter(course_id=course_id))
+    run("similar_courses", SimilarCourse.objects.filter(Q(course_id=course_id) | Q(similar_id=course_id)))
+
+    # parent RESTRICT: lepas dulu semua link parent ke konten course ini
+    CourseContent.objects.filter(Q(course_id=course_id) | Q(parent__course_id=course_id)).exclude(
+        parent=None
+    ).update(parent=None)
+    run("contents", contents)
+    run("members", CourseMember.objects.filter(course_id=course_id),
+        fields=("user_id",), on_chunk=_invalidate_members)
+
+    with tenancy.atomic():
+        CourseRating.objects.filter(course_id=course_id).delete()
+        SimilarityState.objects.filter(course_id=course_id).delete()
+        # signal post_delete Course membuang cache peran pengajar
+        counts["course"] = Course.objects.filter(id=course_id).delete()[0]
+    progress("course", counts["course"])
+    return counts
+
+
+def purge_user(user_id, with_courses=False, progress=_noop, chunk_size=PURGE_CHUNK_SIZE):
+    """Hapus user dan semua datanya di setiap database tenant. Course yang diajar ikut
+    dihapus kalau `with_courses`."""
+    aliases = tenancy.database_aliases()
+    taught = {}
+    for alias in aliases:
+        with tenancy.database_context(alias):
+            taught[alias] = list(Course.objects.filter(teacher_id=user_id).values_list("id", flat=True))
+    n_taught = sum(len(ids) for ids in taught.values())
+    if n_taught and not with_courses:
+        raise PurgeBlocked(f"User {user_id} masih mengajar {n_taught} course")
+
+    counts = {}
+    for alias in aliases:
+        with tenancy.database_context(alias):
+            _purge_user_rows(user_id, taught[alias], counts, progress, chunk_size)
+    categories.invalidate()
+
+    with transaction.atomic():
+        Profile.objects.filter(user_id=user_id).delete()
+        counts["user"] = User.objects.filter(id=user_id).delete()[0]
+    for alias in aliases:
+        invalidate_user(user_id, using=alias)
+    progress("user", counts["user"])
+    return counts
+
+
+def _purge_user_rows(user_id, taught, counts, progress, chunk_size):
+    """Data user di database tenant aktif; `counts` dijumlahkan antar database."""
+    def run(step, queryset, **kwargs):
+        counts[step] = counts.get(step, 0) + delete_chunks(queryset, step, progress, chunk_size, **kwargs)
+
+    for course_id in taught:
+        for step, n in purge_course(course_id, progress, chunk_size).items():
+            counts[f"course:{step}"] = counts.get(f"course:{step}", 0) + n
+
+    run("comments", Comment.objects.filter(member__user_id=user_id),
+        fields=("content_id",), on_chunk=_uncount_comments)
+    run("completions", CompletionTracking.objects.filter(user_id=user_id))
+    run("bookmarks", Bookmark.objects.filter(user_id=user_id))
+    run("feedback", Feedback.objects.filter(user_id=user_id),
+        fields=("course_id", "rating"), on_chunk=_unrate)
+    run("learner_days", LearnerActivityDay.objects.filter(user_id=user_id))
+    run("completion_archive", CompletionArchive.objects.filter(user_id=user_id))
+    run("comment_archive", CommentArchive.objects.filter(user_id=user_id))
+    run("idempotency_keys", IdempotencyKey.objects.filter(user_id=user_id))
+    run("memberships", CourseMember.objects.filter(user_id=user_id))
+
+    Course.objects.filter(category__user_id=user_id).update(category=None)
+    run("categories", Category.objects.filter(user_id=user_id))
+    MediaAsset.objects.filter(uploaded_by_id=user_id).update(uploaded_by=None)
+
+
+# ─── Job background ───────────────────────────────────────────
+# Progress disimpan di cache default: {status, kind, target_id, step, deleted, ...}.
+
+PURGES = {"course": purge_course, "user": purge_user}
+
+
+def _job_key(job_id):
+    return f"{JOB_PREFIX}:{job_id}"
+
+
+def _active_key(kind, target_id):
+    return f"{JOB_PREFIX}:active:{tenancy.db_alias()}:{kind}:{target_id}"
+
+
+def job_status(job_id):
+    return cache.get(_job_key(job_id))
+
+
+def _run_job(job_id, kind, target_id, options):
+    job = job_status(job_id)
+    job.update(status="running", started_at=timezone.now())
+    cache.set(_job_key(job_id), job, JOB_TTL)
+
+    def progress(step, deleted):
+        job["step"] = step
+        job["deleted"][step] = deleted
+        cache.set(_job_key(job_id), job, JOB_TTL)
+
+    try:
+        PURGES[kind](target_id, progress=progress, **options)
+        job["status"] = "done"
+    except Exception as exc:
+        logger.exception("Purge %s %s gagal", kind, target_id)
+        job.update(status="failed", error=str(exc))
+    finally:
+        job["finished_at"] = timezone.now()
+        cache.set(_job_key(job_id), job, JOB_TTL)
+        cache.delete(_active_key(kind, target_id))
+
+
+def start_job(kind, target_id, requested_by=None, **options):
+    """Antrekan purge di worker (lms_core.tasks). Purge yang sedang berjalan untuk
+    target yang sama dipakai ulang. Return dict status job."""
+    job_id = uuid.uuid4().hex
+    if not cache.add(_active_key(kind, target_id), job_id, JOB_TTL):
+        existing = job_status(cache.get(_active_key(kind, target_id)))
+        if existing is not None:
+            return existing
+        cache.set(_active_key(kind, target_id), job_id, JOB_TTL)
+    job = {
+        "job_id": job_id, "kind": kind, "target_id": target_id, "requested_by": requested_by,
+        "status": "queued", "step": None, "deleted": {}, "error": None,
+        "created_at": timezone.now(), "started_at": None, "finished_at": None,
+    }
+    cache.set(_job_key(job_id), job, JOB_TTL)
+    enqueue(_run_job, job_id, kind, target_id, options)
+    return job
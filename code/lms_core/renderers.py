@@ -0,0 +1,52 @@
+from django.db.models import F
+from django.http import HttpResponse
+from ninja.renderers import BaseRenderer, JSONRenderer
+from ninja.responses import NinjaJSONEncoder
+
+try:
+    import orjson
+except ImportError:  # orjson opsional, fallback ke json stdlib
+    orjson = None
+
+
+class ORJSONRenderer(BaseRenderer):
+    media_type = "application/json"
+
+    def __init__(self):
+        # tipe yang tidak dikenal orjson (Decimal, lazy str, pydantic model) -> encoder ninja.
+        # datetime/date/time juga lewat encoder ninja (OPT_PASSTHROUGH_DATETIME) supaya
+        # formatnya sama dengan JSONRenderer: presisi milidetik dan akhiran "Z".
+        self._fallback = NinjaJSONEncoder().default
+
+    def render(self, request, data, *, response_status):
+        return orjson.dumps(
+            data,
+            default=self._fallback,
+            option=orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS,
+        )
+
+
+default_renderer = ORJSONRenderer() if orjson else JSONRenderer()
+
+
+def project(qs, schema, **paths):
+    """
+    Proyeksi queryset langsung ke field `schema` lewat values().
+    Field yang namanya beda dengan kolom ORM dipetakan via `paths`
+    (contoh: content_name="content__name").
+    """
+    direct = [name for name in schema.model_fields if name not in paths]
+    return qs.values(*direct, **{name: F(path) for name, path in paths.items()})
+
+
+def trusted_response(request, data, status=200):
+    """
+    Render data yang berasal dari ORM (sudah sesuai schema) tanpa validasi
+    pydantic per item. Schema `response=` pada route tetap dipakai untuk OpenAPI.
+    """
+    content = default_renderer.render(request, list(data), response_status=status)
+    return HttpResponse(
+        content,
+        status=status,
+        content_type=f"{default_renderer.media_type}; charset={default_renderer.charset}",
+    )
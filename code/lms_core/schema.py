@@ -1,6 +1,6 @@
 from ninja import Schema
-from typing import Optional, List
-from datetime import datetime
+from typing import Any, Optional, List, Dict
+from datetime import date, datetime
 
 # -------- User and Auth Schemas --------
 class UserOut(Schema):
@@ -43,9 +43,52 @@ class AnnouncementOut(Schema):
     title: str
     message: str
     publish_date: datetime
+    published_at: datetime
     created_at: datetime
     updated_at: datetime
 
+# -------- Feed Schemas --------
+class FeedItemOut(Schema):
+    id: int
+    course_id: int
+    course_name: str
+    title: str
+    message: str
+    publish_date: datetime
+    published_at: datetime
+
+class FeedPageOut(Schema):
+    items: List[FeedItemOut]
+    cursor: Optional[str]        # kirim sebagai ?since= untuk polling item baru
+    next_before: Optional[str]   # kirim sebagai ?before= untuk halaman lebih lama
+
+# -------- Bulk Ingestion --------
+class AnnouncementBulkIn(Schema):
+    items: List[AnnouncementIn]
+
+class FeedbackBulkItem(Schema):
+    user_id: int
+    message: str
+    rating: Optional[float] = None
+
+class FeedbackBulkIn(Schema):
+    items: List[FeedbackBulkItem]
+
+class BulkItemResult(Schema):
+    index: int                 # posisi item pada payload
+    id: Optional[int]
+    status: str                # created / updated / error
+    detail: Optional[str] = None
+
+class BulkResultOut(Schema):
+    success: bool
+    created: int
+    updated: int
+    failed: int
+    elapsed_ms: float
+    items_per_second: float
+    results: List[BulkItemResult]
+
 # -------- Course Schemas --------
 class CourseSchemaIn(Schema):
     name: str
@@ -68,6 +111,59 @@ class CourseMemberOut(Schema):
     user_id: int      # simplified to just the user primary key
     roles: str
 
+class CourseCloneIn(Schema):
+    name: Optional[str] = None           # default: nama course asal
+    announcements: bool = True
+    shift_days: int = 0                  # geser publish_date pengumuman (mis. 182 untuk semester)
+
+class CourseCloneOut(Schema):
+    id: int
+    name: str
+    contents: int
+    announcements: int
+    elapsed_ms: float
+
+class CourseArchiveOut(Schema):
+    course_id: int
+    completions_archived: int
+    comments_archived: int
+    archived_at: datetime
+    elapsed_ms: float
+
+# arsip course (read-only); id = id baris arsip, dipakai sebagai ?before=
+class ArchivedCompletionOut(Schema):
+    id: int
+    content_id: int
+    user_id: int
+    completed_at: datetime
+
+class ArchivedCompletionPageOut(Schema):
+    next_before: Optional[int]
+    items: List[ArchivedCompletionOut]
+
+class ArchivedCommentOut(Schema):
+    id: int
+    content_id: int
+    user_id: int
+    comment: str
+    created_at: datetime
+
+class ArchivedCommentPageOut(Schema):
+    next_before: Optional[int]
+    items: List[ArchivedCommentOut]
+
+class PurgeJobOut(Schema):
+    job_id: str
+    kind: str                  # "course" / "user"
+    target_id: int
+    status: str                # queued, running, done, failed
+    step: Optional[str]
+    deleted: Dict[str, int]    # baris terhapus per langkah
+    error: Optional[str]
+    created_at: datetime
+    started_at: Optional[datetime]
+    finished_at: Optional[datetime]
+
 # -------- Content Schemas --------
 class CourseContentMini(Schema):
     id: int
@@ -99,6 +195,29 @@ class CourseCommentOut(Schema):
     created_at: datetime
     updated_at: datetime
 
+class CommentOut(Schema):
+    id: int
+    content_id: int
+    member_id: int
+    user_id: int
+    username: str
+    comment: str
+    created_at: datetime
+    updated_at: datetime
+
+class CommentPageOut(Schema):
+    count: int                 # dari CourseContent.comment_count, tanpa COUNT(*)
+    next_before: Optional[int] # kirim sebagai ?before= untuk halaman berikutnya
+    items: List[CommentOut]
+
+class CommentBulkDeleteIn(Schema):
+    ids: List[int]
+
+class CommentBulkDeleteOut(Schema):
+    deleted: int
+    forbidden: List[int]
+    not_found: List[int]
+
 # -------- Completion Tracking --------
 class CompletionInput(Schema):
     content_id: int
@@ -127,7 +246,45 @@ class ProfileEditInput(Schema):
     email: Optional[str]
     handphone: Optional[str]
     description: Optional[str]
-    profile_image: Optional[str]
+    profile_image: Optional[str]   # sha256 MediaAsset dari POST /media
+
+# -------- Batch --------
+class BatchRequestItem(Schema):
+    id: Optional[str] = None              # dikembalikan apa adanya untuk mencocokkan hasil
+    method: str = "GET"
+    path: str                             # relatif terhadap /api/v1, boleh dengan query string
+    body: Optional[Any] = None
+    headers: Dict[str, str] = {}          # hanya If-None-Match dan Idempotency-Key
+    fields: Optional[List[str]] = None    # path bertitik yang dipertahankan, mis. "course.name"
+
+class BatchIn(Schema):
+    requests: List[BatchRequestItem]
+
+class BatchItemOut(Schema):
+    id: Optional[str]
+    status: int
+    headers: Dict[str, str]
+    body: Any
+
+class BatchOut(Schema):
+    responses: List[BatchItemOut]
+    elapsed_ms: float
+
+# -------- Profiling Schemas --------
+class ProfileFileOut(Schema):
+    name: str                  # dipakai di GET /debug/profiles/{name}
+    size: int
+
+# -------- Media Schemas --------
+class MediaAssetOut(Schema):
+    sha256: str
+    url: str
+    content_type: str
+    size: int
+    width: Optional[int]
+    height: Optional[int]
+    status: str
+    thumbnails: Dict[str, str]   # sisi terpanjang (px) -> url
 
 # -------- Category Schemas --------
 class CategoryIn(Schema):
@@ -136,7 +293,8 @@ class CategoryIn(Schema):
 class CategoryOut(Schema):
     id: int
     name: str
-    user_id: int
+    user_id: Optional[int]     # None = kategori global
+    course_count: int = 0      # course aktif di tenant ini
     created_at: datetime
     updated_at: datetime
 
@@ -150,6 +308,24 @@ class BookmarkOut(Schema):
     content_id: int
     created_at: datetime
 
+class BookmarkDetailOut(Schema):
+    id: int
+    content_id: int
+    content_name: str
+    course_id: int
+    course_name: str
+    completed: bool
+    created_at: datetime
+
+class BookmarkBulkIn(Schema):
+    add: List[int] = []       # content id
+    remove: List[int] = []    # content id
+
+class BookmarkBulkOut(Schema):
+    added: List[int]          # content id yang baru dibookmark
+    removed: List[int]        # content id yang bookmark-nya dihapus
+    not_found: List[int]
+
 # -------- Feedback Schemas --------
 class FeedbackIn(Schema):
     message: str
@@ -164,6 +340,19 @@ class FeedbackOut(Schema):
     created_at: datetime
     updated_at: datetime
 
+class CourseRatingOut(Schema):
+    course_id: int
+    rating_count: int
+    average: Optional[float]
+    stddev: Optional[float]
+    histogram: Dict[str, int]  # bucket "1".."5" -> jumlah rating
+
+class SimilarCourseOut(Schema):
+    id: int
+    name: str
+    score: float               # cosine co-enrollment, 0..1
+    shared: int                # jumlah user yang mengambil kedua course
+
 # -------- Dashboard --------
 class DashboardOut(Schema):
     courses_enrolled: int
@@ -171,8 +360,21 @@ class DashboardOut(Schema):
     comments_count: int
     completions_count: int
 
+class TimeseriesPoint(Schema):
+    day: date
+    value: int
+
+class CourseTimeseriesOut(Schema):
+    course_id: int
+    start: date
+    end: date
+    series: Dict[str, List[TimeseriesPoint]]   # metric -> satu titik per hari (0 kalau kosong)
+    updated_at: Optional[datetime]             # terakhir rollup_activity berjalan
+
 class CourseAnalyticsOut(Schema):
     members_count: int         # total enrolled in this course
     contents_count: int        # total content items in this course
     comments_count: int        # total comments on this course
     feedback_count: int        # total feedback entries on this course
+    rating_count: int          # feedback entries that carry a rating
+    average_rating: Optional[float]
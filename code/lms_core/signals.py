@@ -0,0 +1,39 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from lms_core import categories
+from lms_core.models import Category, Course, CourseMember
+from lms_core.permissions import invalidate_user
+
+
+@receiver(post_save, sender=CourseMember)
+@receiver(post_delete, sender=CourseMember)
+def enrollment_changed(sender, instance, **kwargs):
+    invalidate_user(instance.user_id, using=instance._state.db)
+
+
+@receiver(pre_save, sender=Course)
+def remember_old_teacher(sender, instance, **kwargs):
+    if instance.pk:
+        instance._old_teacher_id = (
+            Course.all_objects.filter(pk=instance.pk).values_list("teacher_id", flat=True).first()
+        )
+
+
+@receiver(post_save, sender=Course)
+@receiver(post_delete, sender=Course)
+def course_changed(sender, instance, **kwargs):
+    invalidate_user(instance.teacher_id, getattr(instance, "_old_teacher_id", None),
+                    using=instance._state.db)
+
+
+@receiver(post_save, sender=Course)
+@receiver(post_delete, sender=Course)
+def category_counts_changed(sender, instance, **kwargs):
+    categories.invalidate(instance.tenant_id)
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def category_changed(sender, instance, **kwargs):
+    categories.invalidate()
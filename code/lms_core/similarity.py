@@ -0,0 +1,191 @@
+"""
+Rekomendasi "yang mengambil course ini juga mengambil" dari CourseMember.
+
+Membership dibaca sebagai matriks biner user × course M; co-occurrence C = Mᵀ·M
+(C[a, b] = jumlah user yang ikut course a dan b). Skornya cosine
+C[a, b] / sqrt(n_a · n_b), supaya course yang sangat besar tidak selalu menang.
+Per course disimpan TOP_K teratas (minimal MIN_SHARED user bersama) di
+SimilarCourse, jadi GET /courses/{id}/similar cukup satu query ber-index.
+
+Dengan numpy + scipy terpasang, perhitungan memakai matriks sparse; tanpa keduanya
+dipakai fallback Python murni dengan hasil yang sama (lebih lambat untuk data besar).
+
+Refresh incremental: SimilarityState mencatat jumlah member saat daftar dibangun,
+dan `refresh()` hanya menghitung ulang course yang jumlah membernya berubah lebih
+dari REFRESH_RATIO. Hanya baris course tersebut yang dihitung (C[T, :] = M[:, T]ᵀ·M),
+sehingga yang dibaca hanya membership user yang ikut course di T. Course archived
+tidak direkomendasikan dan tidak punya daftar.
+"""
+import heapq
+import math
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count
+
+from lms_core import tenancy
+from lms_core.models import Course, CourseMember, SimilarCourse, SimilarityState
+
+try:
+    import numpy as np
+    from scipy import sparse
+except ImportError:  # numpy/scipy opsional, fallback Python murni
+    np = sparse = None
+
+TOP_K = getattr(settings, "LMS_SIMILAR_TOP_K", 10)
+MIN_SHARED = getattr(settings, "LMS_SIMILAR_MIN_SHARED", 2)
+REFRESH_RATIO = getattr(settings, "LMS_SIMILAR_REFRESH_RATIO", 0.2)
+BLOCK_SIZE = 500          # course target per perkalian matriks / transaksi tulis
+
+
+def backend():
+    return "scipy" if sparse is not None else "python"
+
+
+def _member_counts():
+    """{course_id: jumlah member} untuk semua course aktif (tidak archived)."""
+    return dict(
+        Course.objects.filter(archived_at=None)
+        .annotate(n=Count("members")).order_by().values_list("id", "n")
+    )
+
+
+def _memberships(targets=None):
+    """Iterator (user_id, course_id) course aktif; dengan `targets` hanya user yang ikut salah satunya."""
+    qs = CourseMember.objects.filter(course__archived_at=None)
+    if targets is not None:
+        qs = qs.filter(user_id__in=CourseMember.objects.filter(course_id__in=targets).values("user_id"))
+    return qs.order_by().values_list("user_id", "course_id").iterator(chunk_size=20000)
+
+
+def _top_k_sparse(pairs, targets, counts):
+    rows = np.fromiter(pairs, dtype=[("user", "i8"), ("course", "i8")])
+    course_ids = np.array(sorted(counts), dtype="i8")
+    # course yang dibuat/di-archive di antara dua query dilewati
+    rows = rows[np.isin(rows["course"], course_ids)]
+    result = {a: [] for a in targets}
+    if not len(rows):
+        return result
+    _, user_idx = np.unique(rows["user"], return_inverse=True)
+    m = sparse.csr_matrix(
+        (np.ones(len(rows), dtype="i4"), (user_idx, np.searchsorted(course_ids, rows["course"]))),
+        shape=(user_idx.max() + 1, len(course_ids)),
+    )
+    mt = m.T.tocsr()
+    sizes = np.array([counts[c] for c in course_ids], dtype="f8")
+    target_idx = np.searchsorted(course_ids, np.array(targets, dtype="i8"))
+    for start in range(0, len(target_idx), BLOCK_SIZE):
+        block = target_idx[start:start + BLOCK_SIZE]
+        co = (mt[block] @ m).tocsr()          # |block| × course, isinya jumlah user bersama
+        for i, a in enumerate(block):
+            cols = co.indices[co.indptr[i]:co.indptr[i + 1]]
+            shared = co.data[co.indptr[i]:co.indptr[i + 1]]
+            keep = (cols != a) & (shared >= MIN_SHARED)
+            cols, shared = cols[keep], shared[keep]
+            scores = shared / np.sqrt(sizes[a] * sizes[cols])
+            best = np.lexsort((course_ids[cols], -shared, -scores))[:TOP_K]
+            result[int(course_ids[a])] = [
+                (int(course_ids[cols[j]]), float(scores[j]), int(shared[j])) for j in best
+            ]
+    return result
+
+
+def _top_k_python(pairs, targets, counts):
+    wanted = set(targets)
+    by_user = {}
+    for user_id, course_id in pairs:
+        if course_id in counts:
+            by_user.setdefault(user_id, []).append(course_id)
+    co = {a: {} for a in targets}
+    for courses in by_user.values():
+        for a in courses:
+            if a in wanted:
+                row = co[a]
+                for b in courses:
+                    if b != a:
+                        row[b] = row.get(b, 0) + 1
+    result = {}
+    for a, row in co.items():
+        best = heapq.nsmallest(TOP_K, (
+            (-(n / math.sqrt(counts[a] * counts[b])), -n, b)
+            for b, n in row.items() if n >= MIN_SHARED
+        ))
+        result[a] = [(b, -score, -n) for score, n, b in best]
+    return result
+
+
+def _store(lists, counts):
+    """Ganti daftar SimilarCourse untuk course di `lists` dan catat jumlah membernya."""
+    ids = sorted(lists)
+    for start in range(0, len(ids), BLOCK_SIZE):
+        block = ids[start:start + BLOCK_SIZE]
+        with tenancy.atomic():
+            SimilarCourse.objects.filter(course_id__in=block).delete()
+            SimilarCourse.objects.bulk_create([
+                SimilarCourse(course_id=a, rank=rank, similar_id=b, score=score, shared=shared)
+                for a in block for rank, (b, score, shared) in enumerate(lists[a], 1)
+            ])
+            SimilarityState.objects.filter(course_id__in=block).delete()
+            SimilarityState.objects.bulk_create(
+                [SimilarityState(course_id=a, member_count=counts[a]) for a in block]
+            )
+
+
+def build(course_ids=None):
+    """Hitung ulang daftar course `course_ids` (None = semua course tenant aktif).
+    Return jumlah course yang dihitung."""
+    counts = _member_counts()
+    top_k = _top_k_sparse if sparse is not None else _top_k_python
+    if course_ids is None:
+        # course yang sudah di-archive tidak punya daftar lagi
+        archived = Course.objects.exclude(archived_at=None).values("id")
+        with tenancy.atomic():
+            SimilarCourse.objects.filter(course__in=archived).delete()
+            SimilarityState.objects.filter(course__in=archived).delete()
+        targets = sorted(counts)
+        if targets:
+            _store(top_k(_memberships(), targets, counts), counts)
+        return len(targets)
+
+    targets = sorted(c for c in set(course_ids) if c in counts)
+    for start in range(0, len(targets), BLOCK_SIZE):
+        block = targets[start:start + BLOCK_SIZE]
+        _store(top_k(_memberships(block), block, counts), counts)
+    return len(targets)
+
+
+def _changed_a_lot(built, current, ratio):
+    return built is None or abs(current - built) > ratio * max(built, 1)
+
+
+def stale_courses(ratio=None):
+    """Course aktif yang belum punya daftar atau jumlah membernya berubah lebih dari `ratio`."""
+    ratio = REFRESH_RATIO if ratio is None else ratio
+    counts = _member_counts()
+    built = dict(
+        SimilarityState.objects.filter(course__in=Course.objects.values("id"))
+        .values_list("course_id", "member_count")
+    )
+    return [c for c, n in counts.items() if _changed_a_lot(built.get(c), n, ratio)]
+
+
+def refresh(ratio=None):
+    """Hitung ulang hanya course yang basi. Return jumlah course yang dihitung."""
+    return build(stale_courses(ratio))
+
+
+def refresh_if_stale(course_id):
+    """Task setelah enrollment: hitung ulang daftar satu course kalau membernya berubah banyak."""
+    key = f"lms_similar:{tenancy.db_alias()}:{course_id}"
+    if not cache.add(key, 1, 300):
+        return
+    try:
+        current = CourseMember.objects.filter(course_id=course_id).count()
+        built = (
+            SimilarityState.objects.filter(course_id=course_id)
+            .values_list("member_count", flat=True).first()
+        )
+        if _changed_a_lot(built, current, REFRESH_RATIO):
+            build([course_id])
+    finally:
+        cache.delete(key)
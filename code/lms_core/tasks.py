@@ -0,0 +1,43 @@
+import contextvars
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import close_old_connections
+
+from lms_core import tenancy
+
+logger = logging.getLogger(__name__)
+
+_executor = None
+
+
+def executor():
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=getattr(settings, "LMS_TASK_WORKERS", 2),
+            thread_name_prefix="lms-task",
+        )
+    return _executor
+
+
+def _run(func, args):
+    close_old_connections()
+    try:
+        func(*args)
+    except Exception:
+        logger.exception("Task %s gagal", func.__name__)
+    finally:
+        close_old_connections()
+
+
+def enqueue(func, *args):
+    """Jalankan func(*args) di worker pool setelah transaksi saat ini commit.
+
+    Worker berjalan di proses yang sama; kalau proses mati sebelum task selesai,
+    task hilang — caller harus bisa menjalankan ulang (mis. status tetap "pending").
+    Tenant aktif ikut terbawa ke worker.
+    """
+    context = contextvars.copy_context()
+    tenancy.on_commit(lambda: executor().submit(context.run, _run, func, args))
@@ -0,0 +1,221 @@
+"""
+Multi-tenant: beberapa institusi dalam satu deployment.
+
+Tenant aktif disimpan di contextvar (di-set TenantMiddleware dari header X-Tenant
+untuk path API, atau lewat `tenant_context()` di command/worker). Selama ada tenant
+aktif:
+
+- manager `objects` model bertenant (Course dan turunan langsungnya) otomatis
+  memfilter tenant_id, dan baris baru otomatis diberi tenant aktif;
+- TenantRouter mengarahkan model lms_core ke alias database tenant tersebut
+  (LMS_TENANT_DATABASES), sehingga tenant besar bisa dipindah ke database sendiri
+  cukup lewat settings. Transaksi di kode lms_core memakai `atomic()`/`on_commit()`
+  dari modul ini supaya ikut alias yang sama.
+
+Tanpa tenant aktif (admin) manager tidak memfilter dan semua query memakai
+database default, sama seperti sebelum ada tenant. Management command pemeliharaan
+berjalan per database lewat `maintenance_contexts()`: `database_context(alias)`
+mengarahkan query ke alias itu tanpa memfilter tenant.
+"""
+import contextvars
+from contextlib import ContextDecorator, contextmanager
+from typing import NamedTuple, Optional
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, models, transaction
+from django.http import JsonResponse
+from django.utils.cache import patch_vary_headers
+
+TENANT_HEADER = "X-Tenant"
+# model lms_core yang tetap di database default (data milik user, bukan milik tenant)
+SHARED_MODELS = {"tenant", "profile"}
+
+
+class CurrentTenant(NamedTuple):
+    id: Optional[int]        # None: hanya alias database (database_context), tanpa filter tenant
+    slug: Optional[str]
+    db_alias: str
+
+
+_current: contextvars.ContextVar[Optional[CurrentTenant]] = contextvars.ContextVar(
+    "lms_tenant", default=None
+)
+_by_slug = {}
+
+
+def current_tenant():
+    return _current.get()
+
+
+def db_alias():
+    tenant = _current.get()
+    return tenant.db_alias if tenant else DEFAULT_DB_ALIAS
+
+
+def resolve(slug):
+    """CurrentTenant untuk slug (di-cache per proses), atau None kalau tidak ada."""
+    tenant = _by_slug.get(slug)
+    if tenant is None:
+        from lms_core.models import Tenant
+
+        row = Tenant.objects.filter(slug=slug).values_list("id", flat=True).first()
+        if row is None:
+            return None
+        aliases = getattr(settings, "LMS_TENANT_DATABASES", {})
+        tenant = _by_slug[slug] = CurrentTenant(row, slug, aliases.get(slug, DEFAULT_DB_ALIAS))
+    return tenant
+
+
+def default_tenant():
+    return resolve(getattr(settings, "LMS_DEFAULT_TENANT", "default"))
+
+
+@contextmanager
+def tenant_context(tenant):
+    """Aktifkan tenant (CurrentTenant atau slug) selama blok berjalan."""
+    if isinstance(tenant, str):
+        slug, tenant = tenant, resolve(tenant)
+        if tenant is None:
+            raise LookupError(f"Tenant {slug!r} tidak ada")
+    token = _current.set(tenant)
+    try:
+        yield tenant
+    finally:
+        _current.reset(token)
+
+
+def current_tenant_id():
+    """Default kolom tenant: tenant aktif, atau tenant default kalau tidak ada."""
+    tenant = _current.get()
+    if tenant is None or tenant.id is None:
+        tenant = default_tenant()
+    return tenant.id if tenant else None
+
+
+# ─── Per database (management command) ───────────────────────
+
+def database_aliases():
+    """Alias database yang berisi data tenant: default dan isi LMS_TENANT_DATABASES."""
+    aliases = set(getattr(settings, "LMS_TENANT_DATABASES", {}).values()) - {DEFAULT_DB_ALIAS}
+    return [DEFAULT_DB_ALIAS, *sorted(aliases)]
+
+
+@contextmanager
+def database_context(alias):
+    """Arahkan model lms_core ke database `alias` tanpa memfilter tenant."""
+    token = _current.set(CurrentTenant(None, None, alias))
+    try:
+        yield alias
+    finally:
+        _current.reset(token)
+
+
+def maintenance_contexts(tenant=None):
+    """[(label, context manager)] untuk command pemeliharaan: hanya tenant `tenant`
+    (slug) kalau diberikan, selain itu tiap database di `database_aliases()`."""
+    if tenant:
+        return [(tenant, tenant_context(tenant))]
+    return [(alias, database_context(alias)) for alias in database_aliases()]
+
+
+# ─── Transaksi mengikuti alias tenant ────────────────────────
+
+class _Atomic(ContextDecorator):
+    def __init__(self, **kwargs):
+        self.kwargs = kwargs
+
+    def _recreate_cm(self):
+        # instance baru per pemanggilan: dipakai sebagai decorator di banyak thread
+        return _Atomic(**self.kwargs)
+
+    def __enter__(self):
+        self.atomic = transaction.atomic(using=db_alias(), **self.kwargs)
+        return self.atomic.__enter__()
+
+    def __exit__(self, *exc):
+        return self.atomic.__exit__(*exc)
+
+
+def atomic(func=None, **kwargs):
+    """transaction.atomic() pada database tenant aktif; bisa dipakai sebagai decorator."""
+    if callable(func):
+        return _Atomic(**kwargs)(func)
+    return _Atomic(**kwargs)
+
+
+def on_commit(func):
+    transaction.on_commit(func, using=db_alias())
+
+
+# ─── Manager ─────────────────────────────────────────────────
+
+class TenantManager(models.Manager):
+    def get_queryset(self):
+        qs = super().get_queryset()
+        tenant = _current.get()
+        return qs.filter(tenant_id=tenant.id) if tenant and tenant.id is not None else qs
+
+
+# ─── Middleware & router ─────────────────────────────────────
+
+class TenantMiddleware:
+    """Aktifkan tenant dari header X-Tenant (tanpa header: LMS_DEFAULT_TENANT) untuk
+    path di LMS_TENANT_PATHS. Path lain (admin) tidak dibatasi tenant."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.paths = tuple(getattr(settings, "LMS_TENANT_PATHS", ("/api/",)))
+
+    def __call__(self, request):
+        if not request.path.startswith(self.paths):
+            return self.get_response(request)
+        slug = request.headers.get(TENANT_HEADER) or getattr(settings, "LMS_DEFAULT_TENANT", "default")
+        tenant = resolve(slug)
+        if tenant is None:
+            return JsonResponse({"detail": "Unknown tenant"}, status=404)
+        request.tenant = tenant
+        with tenant_context(tenant):
+            response = self.get_response(request)
+        patch_vary_headers(response, [TENANT_HEADER])
+        return response
+
+
+class TenantRouter:
+    """Model lms_core (kecuali SHARED_MODELS) ke alias database tenant aktif; model
+    lain (auth, SHARED_MODELS) selalu di database default."""
+
+    def _shared(self, meta):
+        return meta.app_label != "lms_core" or meta.model_name in SHARED_MODELS
+
+    def _alias(self, model, hints):
+        if self._shared(model._meta):
+            # tanpa ini Django mengikuti database instance di hints, mis. course.teacher
+            # dari course di database tenant akan mencari auth_user di sana
+            return DEFAULT_DB_ALIAS
+        instance = hints.get("instance")
+        if instance is not None and instance._state.db and not self._shared(instance._meta):
+            return instance._state.db
+        tenant = _current.get()
+        return tenant.db_alias if tenant else None
+
+    def db_for_read(self, model, **hints):
+        return self._alias(model, hints)
+
+    def db_for_write(self, model, **hints):
+        return self._alias(model, hints)
+
+    def allow_relation(self, obj1, obj2, **hints):
+        if obj1._state.db == obj2._state.db:
+            return True
+        # user/data bersama (database default) boleh direlasikan dengan data tenant di
+        # database lain (FK tanpa constraint); data tenant antar database tidak
+        shared1, shared2 = self._shared(obj1._meta), self._shared(obj2._meta)
+        if shared1 != shared2:
+            shared = obj1 if shared1 else obj2
+            return shared._state.db == DEFAULT_DB_ALIAS
+        return False
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if app_label != "lms_core" or model_name in SHARED_MODELS:
+            return db == DEFAULT_DB_ALIAS
+        return db in database_aliases()
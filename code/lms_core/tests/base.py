@@ -0,0 +1,44 @@
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase
+from ninja_simple_jwt.jwt.token_operations import get_access_token_for_user
+
+from lms_core import tenancy
+from lms_core.models import Course, CourseContent, CourseMember
+
+API = "/api/v1"
+
+
+class ApiClientMixin:
+    """Helper request ber-JWT (self.client) dengan header tenant opsional."""
+
+    def headers(self, user, tenant=None):
+        headers = {"Authorization": "Bearer " + get_access_token_for_user(user)[0]}
+        if tenant:
+            headers[tenancy.TENANT_HEADER] = tenant
+        return headers
+
+    def post(self, path, data, user, tenant=None, client=None):
+        return (client or self.client).post(
+            API + path, data, content_type="application/json", headers=self.headers(user, tenant)
+        )
+
+    def get(self, path, user, tenant=None):
+        return self.client.get(API + path, headers=self.headers(user, tenant))
+
+
+class ApiTestCase(ApiClientMixin, TestCase):
+    """Course dengan satu pengajar dan satu member, plus helper request ber-JWT."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.teacher = User.objects.create_user("teacher", password="x")
+        cls.student = User.objects.create_user("student", password="x")
+        cls.course = Course.objects.create(name="Kursus", description="d", price=0, teacher=cls.teacher)
+        cls.content = CourseContent.objects.create(course=cls.course, name="Materi 1", description="d")
+        CourseMember.objects.create(course=cls.course, user=cls.student)
+
+    def setUp(self):
+        # cache peran dan slug tenant berumur per proses; id bisa terpakai ulang antar test
+        cache.clear()
+        tenancy._by_slug.clear()
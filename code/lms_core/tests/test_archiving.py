@@ -0,0 +1,37 @@
+from django.utils import timezone
+
+from lms_core.models import Announcement, Bookmark, Course
+from lms_core.tests.base import API, ApiTestCase
+
+
+class ArchivedCourseWriteTests(ApiTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.announcement = Announcement.objects.create(
+            course=cls.course, title="t", message="m", publish_date=timezone.now()
+        )
+        Course.objects.filter(id=cls.course.id).update(archived_at=timezone.now())
+
+    def announcement_data(self):
+        return {"title": "t", "message": "m", "publish_date": timezone.now().isoformat()}
+
+    def test_announcement_writes_conflict(self):
+        path = f"/courses/{self.course.id}/announcements"
+        self.assertEqual(self.post(path, self.announcement_data(), self.teacher).status_code, 409)
+        bulk = {"items": [self.announcement_data()]}
+        self.assertEqual(self.post(path + "/bulk", bulk, self.teacher).status_code, 409)
+        item = f"{API}{path}/{self.announcement.id}"
+        headers = self.headers(self.teacher)
+        response = self.client.put(item, self.announcement_data(), content_type="application/json",
+                                   headers=headers)
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(self.client.delete(item, headers=headers).status_code, 409)
+        self.assertEqual(Announcement.objects.count(), 1)
+
+    def test_bookmark_writes_conflict(self):
+        response = self.post(f"/contents/{self.content.id}/bookmarks", {}, self.student)
+        self.assertEqual(response.status_code, 409)
+        response = self.post("/bookmarks/bulk", {"add": [self.content.id]}, self.student)
+        self.assertEqual(response.status_code, 409)
+        self.assertFalse(Bookmark.objects.exists())
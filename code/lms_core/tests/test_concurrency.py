@@ -0,0 +1,66 @@
+from concurrent.futures import ThreadPoolExecutor
+from threading import Barrier
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.test import Client, TransactionTestCase, override_settings
+
+from lms_core import tenancy
+from lms_core.models import (
+    Bookmark, CompletionTracking, Course, CourseContent, CourseMember, CourseRating, Feedback, Tenant,
+)
+from lms_core.tests.base import ApiClientMixin
+
+THREADS = 8
+
+
+@override_settings(LMS_THROTTLE_ENABLED=False)
+class ConcurrentWriteTests(ApiClientMixin, TransactionTestCase):
+    """Request paralel untuk pasangan (user, content) yang sama: upsert tidak boleh
+    menghasilkan baris ganda, IntegrityError, atau agregat rating yang melenceng."""
+
+    def setUp(self):
+        cache.clear()
+        tenancy._by_slug.clear()
+        # flush TransactionTestCase ikut menghapus tenant default dari migration
+        Tenant.objects.get_or_create(slug="default", defaults={"name": "Default"})
+        self.teacher = User.objects.create_user("teacher", password="x")
+        self.student = User.objects.create_user("student", password="x")
+        self.course = Course.objects.create(name="Kursus", description="d", price=0, teacher=self.teacher)
+        self.content = CourseContent.objects.create(course=self.course, name="Materi 1", description="d")
+        CourseMember.objects.create(course=self.course, user=self.student)
+
+    def hammer(self, path, payload):
+        barrier = Barrier(THREADS)
+
+        def send(i):
+            client = Client(raise_request_exception=True)
+            try:
+                barrier.wait()
+                return self.post(path, payload(i), self.student, client=client).status_code
+            finally:
+                connection.close()
+
+        with ThreadPoolExecutor(THREADS) as pool:
+            return list(pool.map(send, range(THREADS)))
+
+    def test_parallel_writes_keep_one_row(self):
+        statuses = self.hammer("/completions", lambda i: {"content_id": self.content.id})
+        self.assertEqual(statuses, [200] * THREADS)
+        statuses = self.hammer(f"/contents/{self.content.id}/bookmarks", lambda i: {})
+        self.assertEqual(statuses, [200] * THREADS)
+        statuses = self.hammer(f"/courses/{self.course.id}/feedback",
+                               lambda i: {"message": f"m{i}", "rating": i % 5 + 1})
+        self.assertEqual(statuses, [200] * THREADS)
+
+        self.assertEqual(CompletionTracking.objects.count(), 1)
+        self.assertEqual(Bookmark.objects.count(), 1)
+        self.assertEqual(Feedback.objects.count(), 1)
+
+        rating = CourseRating.objects.get(course=self.course)
+        incremental = (rating.rating_count, rating.rating_sum)
+        CourseRating.rebuild(self.course.id)
+        rating.refresh_from_db()
+        self.assertEqual(incremental, (rating.rating_count, rating.rating_sum))
+        self.assertEqual(incremental, (1, Feedback.objects.get().rating))
@@ -0,0 +1,93 @@
+from django.utils import timezone
+
+from lms_core import tenancy
+from lms_core.models import (
+    Announcement, Bookmark, Course, CourseContent, CourseMember, Feedback, Tenant,
+)
+from lms_core.tests.base import ApiTestCase
+
+
+class TenantScopingTests(ApiTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.tenant_b = Tenant.objects.create(slug="kampus-b", name="Kampus B")
+        with tenancy.tenant_context(tenancy.CurrentTenant(cls.tenant_b.id, "kampus-b", "default")):
+            cls.course_b = Course.objects.create(name="Kursus B", description="d", price=0, teacher=cls.teacher)
+            CourseMember.objects.create(course=cls.course_b, user=cls.student)
+            cls.content_b = CourseContent.objects.create(course=cls.course_b, name="Materi B", description="d")
+
+    def announce(self, course, tenant=None):
+        data = {"title": "t", "message": "m", "publish_date": timezone.now().isoformat()}
+        return self.post(f"/courses/{course.id}/announcements", data, self.teacher, tenant)
+
+    def test_manager_filters_active_tenant(self):
+        with tenancy.tenant_context("kampus-b"):
+            self.assertEqual(list(Course.objects.all()), [self.course_b])
+            self.assertEqual(Course.all_objects.count(), 2)
+        with tenancy.tenant_context("default"):
+            self.assertEqual(list(Course.objects.all()), [self.course])
+
+    def test_database_context_does_not_filter_tenant(self):
+        with tenancy.database_context("default"):
+            self.assertEqual(Course.objects.count(), 2)
+        labels = [label for label, _ in tenancy.maintenance_contexts()]
+        self.assertEqual(labels, ["default"])
+        self.assertEqual([label for label, _ in tenancy.maintenance_contexts("kampus-b")], ["kampus-b"])
+
+    def test_unknown_tenant_is_404(self):
+        response = self.get(f"/courses/{self.course.id}/announcements", self.student, tenant="nope")
+        self.assertEqual(response.status_code, 404)
+
+    def test_write_to_other_tenant_course_is_refused(self):
+        self.assertEqual(self.announce(self.course_b).status_code, 403)
+        response = self.post(f"/courses/{self.course_b.id}/feedback", {"message": "m", "rating": 4}, self.student)
+        self.assertEqual(response.status_code, 403)
+        self.assertFalse(Announcement.all_objects.exists())
+        self.assertFalse(Feedback.all_objects.exists())
+
+    def test_write_in_own_tenant_stores_course_tenant(self):
+        self.assertEqual(self.announce(self.course_b, tenant="kampus-b").status_code, 200)
+        response = self.post(f"/courses/{self.course_b.id}/feedback", {"message": "m", "rating": 4},
+                             self.student, tenant="kampus-b")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(Announcement.all_objects.get().tenant_id, self.tenant_b.id)
+        self.assertEqual(Feedback.all_objects.get().tenant_id, self.tenant_b.id)
+
+    def test_new_rows_copy_tenant_from_course(self):
+        # tenant aktif berbeda dengan tenant course: baris baru tetap ikut course
+        with tenancy.tenant_context("default"):
+            ann = Announcement.objects.create(
+                course_id=self.course_b.id, title="t", message="m", publish_date=timezone.now()
+            )
+        self.assertEqual(ann.tenant_id, self.tenant_b.id)
+        self.assertEqual(CourseMember.all_objects.get(course=self.course_b).tenant_id, self.tenant_b.id)
+
+    def test_reads_are_scoped(self):
+        self.announce(self.course_b, tenant="kampus-b")
+        self.assertEqual(self.get(f"/courses/{self.course_b.id}/announcements", self.student).json(), [])
+        items = self.get(f"/courses/{self.course_b.id}/announcements", self.student, tenant="kampus-b").json()
+        self.assertEqual(len(items), 1)
+
+    def test_bookmarks_are_scoped(self):
+        with tenancy.tenant_context("default"):
+            Bookmark.objects.create(user=self.student, content_id=self.content_b.id)
+        self.assertEqual(Bookmark.all_objects.get().tenant_id, self.tenant_b.id)
+        self.assertEqual(self.get("/bookmarks", self.student).json(), [])
+        self.assertEqual(len(self.get("/bookmarks", self.student, tenant="kampus-b").json()), 1)
+
+    def test_router_keeps_users_and_shared_models_on_default(self):
+        router = tenancy.TenantRouter()
+        self.assertTrue(router.allow_migrate("default", "auth", "user"))
+        self.assertFalse(router.allow_migrate("kampus_b", "auth", "user"))
+        self.assertFalse(router.allow_migrate("kampus_b", "lms_core", "tenant"))
+        with self.settings(LMS_TENANT_DATABASES={"kampus-b": "kampus_b"}):
+            self.assertTrue(router.allow_migrate("kampus_b", "lms_core", "course"))
+        with tenancy.tenant_context(tenancy.CurrentTenant(self.tenant_b.id, "kampus-b", "kampus_b")):
+            self.assertEqual(router.db_for_read(Course), "kampus_b")
+            self.assertEqual(router.db_for_read(type(self.teacher), instance=self.course_b), "default")
+
+    def test_etag_differs_per_tenant(self):
+        default_tag = self.get("/bookmarks", self.student)["ETag"]
+        self.assertNotEqual(self.get("/bookmarks", self.student, tenant="kampus-b")["ETag"], default_tag)
+        self.assertNotEqual(self.get("/bookmarks?x=1", self.student)["ETag"], default_tag)
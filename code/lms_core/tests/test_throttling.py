@@ -0,0 +1,28 @@
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import RequestFactory, SimpleTestCase
+
+from lms_core.throttling import IPWindowThrottle
+
+
+class WindowThrottleTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        self.request = RequestFactory().get("/", REMOTE_ADDR="10.0.0.1")
+        # di tengah jendela menit supaya test tidak melintasi batas jendela
+        clock = mock.patch("lms_core.throttling.time.time", return_value=1_800_000_030.0)
+        clock.start()
+        self.addCleanup(clock.stop)
+
+    def test_limit_per_window(self):
+        throttle = IPWindowThrottle("t", rate="3/m")
+        self.assertEqual([throttle.allow_request(self.request) for _ in range(4)], [True, True, True, False])
+        self.assertEqual(throttle.wait(), 30)
+
+    def test_parallel_requests_share_one_counter(self):
+        throttle = IPWindowThrottle("t", rate="50/m")
+        with ThreadPoolExecutor(8) as pool:
+            allowed = list(pool.map(lambda _: throttle.allow_request(self.request), range(80)))
+        self.assertEqual(allowed.count(True), 50)
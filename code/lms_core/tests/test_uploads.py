@@ -0,0 +1,43 @@
+from io import BytesIO
+from unittest import mock
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import override_settings
+from PIL import Image
+
+from lms_core.models import MediaAsset
+from lms_core.tests.base import API, ApiTestCase
+from lms_core.uploads import HashingUploadHandler, UploadRejected
+
+
+def png(size=(4, 4)):
+    buf = BytesIO()
+    Image.new("RGB", size).save(buf, "PNG")
+    return buf.getvalue()
+
+
+@override_settings(LMS_THROTTLE_ENABLED=False)
+class MediaUploadTests(ApiTestCase):
+    def upload(self, data, name="a.png"):
+        return self.client.post(
+            API + "/media", {"file": SimpleUploadedFile(name, data, "image/png")},
+            headers=self.headers(self.student),
+        )
+
+    @override_settings(LMS_UPLOAD_MAX_BYTES=1024)
+    def test_oversized_file_is_rejected_while_streaming(self):
+        handler = HashingUploadHandler()
+        handler.new_file("file", "a.bin", "application/octet-stream", None)
+        handler.receive_data_chunk(b"x" * 1000, 0)
+        with self.assertRaises(UploadRejected):
+            handler.receive_data_chunk(b"x" * 1000, 1000)
+
+        response = self.upload(b"x" * 4096, name="a.bin")
+        self.assertEqual(response.status_code, 413)
+        self.assertFalse(MediaAsset.objects.exists())
+
+    def test_decompression_bomb_is_rejected(self):
+        with mock.patch.object(Image, "MAX_IMAGE_PIXELS", 10), mock.patch("lms_core.uploads.enqueue"):
+            response = self.upload(png((100, 100)))
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(MediaAsset.objects.exists())
@@ -0,0 +1,67 @@
+from lms_core import tenancy
+from lms_core.models import Bookmark, CompletionTracking, CourseRating, Feedback, Tenant
+from lms_core.tests.base import ApiTestCase
+from lms_core.upsert import insert_ignore, upsert
+
+
+class UpsertHelperTests(ApiTestCase):
+    def values(self, **extra):
+        return {"course_id": self.course.id, "user_id": self.student.id, "message": "a", **extra}
+
+    def test_upsert_inserts_new_row(self):
+        fb = upsert(Feedback, self.values(rating=4), unique_fields=["course", "user"])
+        self.assertIsNotNone(fb.pk)
+        self.assertEqual(Feedback.objects.get().rating, 4)
+
+    def test_upsert_updates_given_fields_on_conflict(self):
+        first = upsert(Feedback, self.values(rating=4), unique_fields=["course", "user"])
+        second = upsert(Feedback, self.values(message="b", rating=2), unique_fields=["course", "user"],
+                        update_fields=["message", "rating"])
+        self.assertEqual(first.pk, second.pk)
+        self.assertEqual((second.message, second.rating), ("b", 2))
+        self.assertEqual(Feedback.objects.count(), 1)
+
+    def test_upsert_without_update_fields_returns_existing_row(self):
+        first = upsert(Feedback, self.values(rating=4), unique_fields=["course", "user"])
+        second = upsert(Feedback, self.values(message="b", rating=1), unique_fields=["course", "user"])
+        self.assertEqual(second.pk, first.pk)
+        self.assertEqual((second.message, second.rating), ("a", 4))
+
+    def test_insert_ignore(self):
+        self.assertIsNotNone(insert_ignore(Feedback, self.values(), unique_fields=["course", "user"]))
+        self.assertIsNone(insert_ignore(Feedback, self.values(message="b"), unique_fields=["course", "user"]))
+        self.assertEqual(Feedback.objects.get().message, "a")
+
+    def test_tenant_follows_parent_row(self):
+        # tenant aktif berbeda dengan tenant course: baris baru tetap ikut course
+        other = Tenant.objects.create(slug="kampus-b", name="Kampus B")
+        with tenancy.tenant_context(tenancy.CurrentTenant(other.id, "kampus-b", "default")):
+            fb = insert_ignore(Feedback, self.values(), unique_fields=["course", "user"])
+            bm = upsert(Bookmark, {"user_id": self.student.id, "content_id": self.content.id},
+                        unique_fields=["user", "content"])
+        self.assertEqual(fb.tenant_id, self.course.tenant_id)
+        self.assertEqual(bm.tenant_id, self.content.tenant_id)
+
+
+class UpsertEndpointTests(ApiTestCase):
+    def test_repeated_completion_keeps_one_row(self):
+        ids = {
+            self.post("/completions", {"content_id": self.content.id}, self.student).json()["id"]
+            for _ in range(3)
+        }
+        self.assertEqual(len(ids), 1)
+        self.assertEqual(CompletionTracking.objects.count(), 1)
+
+    def test_repeated_bookmark_keeps_one_row(self):
+        for _ in range(3):
+            response = self.post(f"/contents/{self.content.id}/bookmarks", {}, self.student)
+            self.assertEqual(response.status_code, 200)
+        self.assertEqual(Bookmark.objects.count(), 1)
+
+    def test_repeated_feedback_updates_rating(self):
+        self.post(f"/courses/{self.course.id}/feedback", {"message": "a", "rating": 5}, self.student)
+        response = self.post(f"/courses/{self.course.id}/feedback", {"message": "b", "rating": 3}, self.student)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(Feedback.objects.get().rating, 3)
+        rating = CourseRating.objects.get(course=self.course)
+        self.assertEqual((rating.rating_count, rating.rating_sum), (1, 3))
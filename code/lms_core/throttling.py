@@ -0,0 +1,92 @@
+import threading
+import time
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import caches
+from ninja.responses import Response
+from ninja.throttling import SimpleRateThrottle
+
+
+class WindowThrottle(SimpleRateThrottle):
+    """
+    Fixed window di atas cache Django: maksimal N request per jendela rate (mis.
+    "60/m" -> 60 request per menit kalender). Rate per scope diambil dari
+    NINJA_DEFAULT_THROTTLE_RATES. Counter dinaikkan dengan cache.add() + cache.incr(),
+    keduanya atomik di backend cache, jadi request paralel tidak saling menimpa hitungan.
+    Di batas jendela burst bisa mencapai 2N.
+    """
+    cache_format = "lms_rl_%(scope)s_%(ident)s"
+
+    def __init__(self, scope=None, rate=None):
+        if scope:
+            self.scope = scope
+        super().__init__(rate)
+        self.cache = caches[getattr(settings, "LMS_THROTTLE_CACHE", "default")]
+        self._local = threading.local()
+
+    def _hit(self, key):
+        """Tambah counter `key`; return nilai setelah ditambah."""
+        if self.cache.add(key, 1, self.duration):
+            return 1
+        try:
+            return self.cache.incr(key)
+        except ValueError:
+            # kedaluwarsa di antara add() dan incr()
+            self.cache.add(key, 1, self.duration)
+            return 1
+
+    def allow_request(self, request):
+        if not getattr(settings, "LMS_THROTTLE_ENABLED", True):
+            return True
+        key = self.get_cache_key(request)
+        if key is None:
+            return True
+        now = time.time()
+        window = int(now // self.duration)
+        allowed = self._hit(f"{key}_{window}") <= self.num_requests
+        self._local.wait = None if allowed else (window + 1) * self.duration - now
+        return allowed
+
+    def wait(self):
+        return getattr(self._local, "wait", None)
+
+
+class UserWindowThrottle(WindowThrottle):
+    """Per user (dari klaim JWT); request tanpa user jatuh ke IP."""
+
+    def get_cache_key(self, request):
+        user_id = getattr(request.user, "id", None)
+        ident = f"u{user_id}" if user_id else f"ip{self.get_ident(request)}"
+        return self.cache_format % {"scope": self.scope, "ident": ident}
+
+
+class IPWindowThrottle(WindowThrottle):
+    def get_cache_key(self, request):
+        return self.cache_format % {"scope": self.scope, "ident": f"ip{self.get_ident(request)}"}
+
+
+class ConcurrencyLimiter:
+    """
+    Batasi jumlah request mahal yang sedang berjalan per worker. Begitu slot
+    habis, request langsung ditolak 503 (bukan antre) supaya thread worker tetap
+    tersedia untuk jalur baca. Limit per scope di LMS_CONCURRENCY_LIMITS.
+    """
+
+    def __init__(self, scope, default_limit=16):
+        self.scope = scope
+        self.limit = getattr(settings, "LMS_CONCURRENCY_LIMITS", {}).get(scope, default_limit)
+        self._slots = threading.BoundedSemaphore(self.limit)
+
+    def __call__(self, view_func):
+        @wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            if not self._slots.acquire(blocking=False):
+                response = Response({"detail": "Server busy, please retry."}, status=503)
+                response["Retry-After"] = "1"
+                return response
+            try:
+                return view_func(request, *args, **kwargs)
+            finally:
+                self._slots.release()
+        return wrapper
@@ -0,0 +1,148 @@
+import hashlib
+import logging
+import os
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.files.uploadhandler import FileUploadHandler
+from django.db import IntegrityError
+
+from lms_core import tenancy
+from lms_core.models import MediaAsset
+from lms_core.tasks import enqueue
+
+logger = logging.getLogger(__name__)
+
+THUMB_FORMAT = "WEBP"
+
+
+class UploadRejected(Exception):
+    """File upload ditolak; api.py menjawab dengan `status` dan pesan exception."""
+
+    def __init__(self, detail, status=400):
+        super().__init__(detail)
+        self.status = status
+
+
+class HashingUploadHandler(FileUploadHandler):
+    """Hitung sha256 tiap file sambil chunk-nya lewat, lalu teruskan ke handler berikutnya.
+
+    Dipasang paling depan di FILE_UPLOAD_HANDLERS sehingga hash sudah jadi tanpa
+    membaca ulang file; hasilnya ada di request.upload_hashes[field_name]. File yang
+    melewati LMS_UPLOAD_MAX_BYTES ditolak (413) begitu batasnya terlewati, sebelum sisa
+    body ikut di-spool ke file sementara.
+    """
+
+    def new_file(self, field_name, file_name, content_type, content_length, *args, **kwargs):
+        super().new_file(field_name, file_name, content_type, content_length, *args, **kwargs)
+        if content_length is not None and content_length > settings.LMS_UPLOAD_MAX_BYTES:
+            raise UploadRejected("File terlalu besar", status=413)
+        self._hash = hashlib.sha256()
+
+    def receive_data_chunk(self, raw_data, start):
+        if start + len(raw_data) > settings.LMS_UPLOAD_MAX_BYTES:
+            raise UploadRejected("File terlalu besar", status=413)
+        self._hash.update(raw_data)
+        return raw_data
+
+    def file_complete(self, file_size):
+        if not hasattr(self.request, "upload_hashes"):
+            self.request.upload_hashes = {}
+        self.request.upload_hashes[self.field_name] = self._hash.hexdigest()
+        return None
+
+
+def file_sha256(file):
+    digest = hashlib.sha256()
+    for chunk in file.chunks():
+        digest.update(chunk)
+    file.seek(0)
+    return digest.hexdigest()
+
+
+def asset_path(sha256, filename):
+    ext = os.path.splitext(filename or "")[1].lower()[:10]
+    return f"assets/{sha256[:2]}/{sha256[2:4]}/{sha256}{ext}"
+
+
+def image_size(file):
+    """(width, height) kalau file gambar yang bisa dibaca Pillow, selain itu None. Hanya baca header.
+
+    Gambar dengan piksel di atas batas Pillow (decompression bomb) ditolak dengan UploadRejected.
+    """
+    from PIL import Image, UnidentifiedImageError
+
+    try:
+        with Image.open(file) as img:
+            return img.size
+    except Image.DecompressionBombError:
+        raise UploadRejected("Dimensi gambar terlalu besar")
+    except (UnidentifiedImageError, OSError):
+        return None
+    finally:
+        file.seek(0)
+
+
+def store_upload(request, file, field_name="file"):
+    """Simpan UploadedFile sebagai MediaAsset. Return (asset, created).
+
+    Isi yang sama (sha256 sama) tidak disimpan dua kali. File ditulis ke storage
+    chunk per chunk dari file sementara upload handler, tanpa dimuat utuh ke memori.
+    Raise UploadRejected untuk file yang ditolak.
+    """
+    sha256 = getattr(request, "upload_hashes", {}).get(field_name) or file_sha256(file)
+    existing = MediaAsset.objects.filter(sha256=sha256).first()
+    if existing:
+        return existing, False
+
+    size = image_size(file)
+    name = asset_path(sha256, file.name)
+    if not default_storage.exists(name):
+        name = default_storage.save(name, file)
+    try:
+        with tenancy.atomic():
+            asset = MediaAsset.objects.create(
+                sha256=sha256,
+                file=name,
+                content_type=file.content_type or "application/octet-stream",
+                size=file.size,
+                width=size[0] if size else None,
+                height=size[1] if size else None,
+                status="pending" if size else "ready",
+                uploaded_by_id=request.user.id,
+            )
+    except IntegrityError:
+        # upload paralel dengan isi sama menang duluan
+        return MediaAsset.objects.get(sha256=sha256), False
+
+    if size:
+        enqueue(generate_thumbnails, asset.id)
+    return asset, True
+
+
+def generate_thumbnails(asset_id):
+    from PIL import Image, ImageOps
+
+    asset = MediaAsset.objects.get(id=asset_id)
+    thumbs = {}
+    try:
+        with asset.file.open("rb") as f, Image.open(f) as img:
+            img = ImageOps.exif_transpose(img)
+            if img.mode not in ("RGB", "RGBA"):
+                img = img.convert("RGBA" if "transparency" in img.info else "RGB")
+            for edge in settings.LMS_THUMBNAIL_SIZES:
+                name = f"thumbs/{asset.sha256[:2]}/{asset.sha256}_{edge}.webp"
+                if not default_storage.exists(name):
+                    thumb = img.copy()
+                    thumb.thumbnail((edge, edge))
+                    buf = BytesIO()
+                    thumb.save(buf, THUMB_FORMAT, quality=80)
+                    name = default_storage.save(name, ContentFile(buf.getvalue()))
+                thumbs[str(edge)] = name
+    except Exception:
+        logger.exception("Gagal membuat thumbnail untuk asset %s", asset.sha256)
+        MediaAsset.objects.filter(id=asset_id).update(status="failed")
+        return
+    MediaAsset.objects.filter(id=asset_id).update(thumbnails=thumbs, status="ready")
@@ -0,0 +1,57 @@
+"""
+Upsert satu baris dalam satu statement: INSERT ... ON CONFLICT ... RETURNING *.
+
+get_or_create/update_or_create melakukan SELECT lalu INSERT; dua request paralel
+untuk kunci unik yang sama bisa sama-sama lolos SELECT dan salah satunya gagal
+dengan IntegrityError. Di sini konflik diselesaikan oleh database lewat constraint
+unik, dan baris hasilnya langsung dikembalikan (SQLite >= 3.35, PostgreSQL).
+"""
+from django.db import NotSupportedError, connections, router
+
+
+def _columns(model, fields):
+    return [model._meta.get_field(name).column for name in fields]
+
+
+def _insert_sql(model, values, unique_fields, using):
+    connection = connections[using]
+    if connection.vendor not in ("sqlite", "postgresql"):
+        raise NotSupportedError(f"upsert belum didukung untuk {connection.vendor}")
+    qn = connection.ops.quote_name
+    # pre_save mengisi default, auto_now_add, dst. seperti save() biasa
+    obj = model(**values)
+    if getattr(model, "tenant_parent", None) and not {"tenant", "tenant_id"} & values.keys():
+        # model bertenant: tenant_id ikut induknya, sama dengan TenantScoped.save()
+        obj.inherit_tenant()
+    fields = [f for f in model._meta.concrete_fields if f is not model._meta.auto_field]
+    params = [f.get_db_prep_save(f.pre_save(obj, add=True), connection) for f in fields]
+    sql = "INSERT INTO {} ({}) VALUES ({}) ON CONFLICT ({})".format(
+        qn(model._meta.db_table),
+        ", ".join(qn(f.column) for f in fields),
+        ", ".join(["%s"] * len(fields)),
+        ", ".join(qn(c) for c in _columns(model, unique_fields)),
+    )
+    return sql, params, qn
+
+
+def _run(model, sql, params, using):
+    rows = list(model._base_manager.db_manager(using).raw(sql, params))
+    return rows[0] if rows else None
+
+
+def upsert(model, values, unique_fields, update_fields=None, using=None):
+    """Insert baris `values`; kalau `unique_fields` bentrok, update `update_fields`
+    dari nilai baru (None = biarkan baris lama apa adanya). Return instance hasilnya."""
+    using = using or router.db_for_write(model)
+    sql, params, qn = _insert_sql(model, values, unique_fields, using)
+    # tanpa update_fields tetap DO UPDATE (no-op) supaya RETURNING mengembalikan baris lama
+    columns = _columns(model, update_fields) if update_fields else _columns(model, unique_fields[:1])
+    sql += " DO UPDATE SET " + ", ".join(f"{qn(c)} = EXCLUDED.{qn(c)}" for c in columns)
+    return _run(model, sql + " RETURNING *", params, using)
+
+
+def insert_ignore(model, values, unique_fields, using=None):
+    """Insert baris `values` kalau belum ada. Return instance baru, atau None kalau bentrok."""
+    using = using or router.db_for_write(model)
+    sql, params, _ = _insert_sql(model, values, unique_fields, using)
+    return _run(model, sql + " DO NOTHING RETURNING *", params, using)
@@ -1,5 +1,7 @@
 import re
 
+from ninja.utils import contribute_operation_callback
+
 def calculator(a, b, operator):
     if operator == '+':
         return a + b
@@ -25,4 +27,20 @@ def validate_password(password):
         return False
     if not re.search(r"[!@#$%^&*()]", password):  # Memeriksa karakter khusus
         return False
-    return True
\ No newline at end of file
+    return True
+
+
+def after_response(view_func, callback):
+    """Jalankan callback(request, response) setelah ninja selesai merender response view ini."""
+    def contribute(operation):
+        run = operation.run
+
+        def run_with_callback(request, *args, **kwargs):
+            response = run(request, *args, **kwargs)
+            callback(request, response)
+            return response
+
+        operation.run = run_with_callback
+
+    contribute_operation_callback(view_func, contribute)
+    return view_func
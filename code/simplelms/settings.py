@@ -43,6 +43,8 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'lms_core.access_log.AccessLogMiddleware',
+    'lms_core.tenancy.TenantMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -79,8 +81,52 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        # transaksi SQLite langsung ambil write lock dan menunggu (bukan gagal "database is
+        # locked" saat upgrade lock); di PostgreSQL peran ini dipegang select_for_update
+        'OPTIONS': {
+            'transaction_mode': 'IMMEDIATE',
+            'timeout': 20,
+        },
+        # database test berupa file: SQLite in-memory (shared cache) langsung gagal "table is
+        # locked" tanpa menunggu timeout, padahal test concurrency menulis dari banyak thread
+        'TEST': {'NAME': BASE_DIR / 'test_db.sqlite3'},
+    }
+}
+
+
+# Cache
+# Dipakai cache peran course (lms_core/permissions.py), throttle, kategori, dst. LocMemCache
+# hanya berlaku per proses: dengan banyak worker arahkan ke backend bersama (service `redis`
+# di docker-compose, django.core.cache.backends.redis.RedisCache). Kalau tidak, tiap worker
+# punya counter throttle sendiri, request baca bisa memakai peran lama sampai
+# LMS_ROLE_CACHE_TTL habis, dan event SSE (LMS_EVENTS_CACHE) tidak sampai ke worker lain.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'simplelms',
     }
 }
+LMS_ROLE_CACHE_TTL = 30             # detik; request tulis selalu membaca peran dari database
+
+
+# Rate limiting & admission control (lms_core/throttling.py)
+
+NINJA_DEFAULT_THROTTLE_RATES = {
+    'auth': '10000/day',
+    'user': '10000/day',
+    'anon': '1000/day',
+    'register': '10/m',     # per IP
+    'writes': '120/m',      # per user
+    'writes_ip': '600/m',   # per IP
+}
+
+LMS_THROTTLE_ENABLED = True
+LMS_THROTTLE_CACHE = 'default'
+
+# jumlah request mahal yang boleh berjalan bersamaan per worker sebelum ditolak 503
+LMS_CONCURRENCY_LIMITS = {
+    'writes': 16,
+}
 
 
 # Password validation
@@ -119,6 +165,89 @@ USE_TZ = True
 
 STATIC_URL = 'static/'
 
+# Multi-tenant (lms_core/tenancy.py): tenant dipilih lewat header X-Tenant, tanpa header
+# memakai LMS_DEFAULT_TENANT. LMS_TENANT_DATABASES memindahkan tenant ke alias database
+# lain di DATABASES, mis. {'kampus-besar': 'kampus_besar'}.
+LMS_DEFAULT_TENANT = 'default'
+LMS_TENANT_PATHS = ('/api/',)
+LMS_TENANT_DATABASES = {}
+DATABASE_ROUTERS = ['lms_core.tenancy.TenantRouter']
+
+# Header Idempotency-Key (lms_core/idempotency.py): lama response disimpan untuk replay
+LMS_IDEMPOTENCY_TTL = 24 * 3600
+
+# Server-sent events (lms_core/events.py). LMS_EVENTS_CACHE: alias cache bersama (redis)
+# untuk meneruskan event antar worker; None = hanya di dalam proses.
+LMS_EVENTS_CACHE = None
+LMS_EVENTS_QUEUE_SIZE = 64          # event tertunda per koneksi sebelum yang lama dibuang
+LMS_EVENTS_HEARTBEAT = 15           # detik
+LMS_EVENTS_MAX_SUBSCRIBERS = 5000   # koneksi per worker
+
+# GET /feed hanya mengembalikan pengumuman yang tampil minimal sekian detik lalu,
+# supaya cursor `since` tidak melompati baris yang commit-nya terlambat
+LMS_FEED_SETTLE = 5
+
+# Upload (lms_core/uploads.py): file disimpan content-addressed di MEDIA_ROOT/assets/
+MEDIA_URL = 'media/'
+MEDIA_ROOT = BASE_DIR / 'media'
+
+FILE_UPLOAD_HANDLERS = [
+    'lms_core.uploads.HashingUploadHandler',
+    'django.core.files.uploadhandler.MemoryFileUploadHandler',
+    'django.core.files.uploadhandler.TemporaryFileUploadHandler',
+]
+
+LMS_UPLOAD_MAX_BYTES = 50 * 1024 * 1024
+LMS_THUMBNAIL_SIZES = (64, 256, 1024)
+LMS_TASK_WORKERS = 2
+
+# Profiling per request (lms_core/profiling.py): staff kirim header X-Profile, atau
+# sampling 1 dari LMS_PROFILE_SAMPLE_EVERY request (0 = mati). Hasil di LMS_PROFILE_DIR.
+LMS_PROFILE_DIR = BASE_DIR / 'profiles'
+LMS_PROFILE_KEEP = 200              # file terlama dibuang di atas jumlah ini
+LMS_PROFILE_SAMPLE_EVERY = 0
+LMS_PROFILE_INTERVAL = 0.001        # detik antar sampel stack
+
+# Course serupa (lms_core/similarity.py), dibangun command build_similar_courses
+LMS_SIMILAR_TOP_K = 10
+LMS_SIMILAR_MIN_SHARED = 2          # minimal user bersama supaya direkomendasikan
+LMS_SIMILAR_REFRESH_RATIO = 0.2     # hitung ulang kalau jumlah member berubah > 20%
+
+# Cache GET /categories (lms_core/categories.py); dibuang oleh signal Course/Category
+LMS_CATEGORY_CACHE_TTL = 300
+
+# Access log JSON & request lambat (lms_core/access_log.py). File ditulis thread
+# QueueListener, bukan thread request; ringkas dengan `manage.py analyze_access_log`.
+LMS_ACCESS_LOG_PATHS = ('/api/',)
+LMS_LOG_DIR = BASE_DIR / 'logs'
+LMS_SLOW_REQUEST_MS = 1000          # request di atas ini ditulis ke slow.log beserta SQL-nya
+LMS_SLOW_REQUEST_MAX_QUERIES = 200  # SQL per dump
+LMS_SLOW_REQUEST_PER_MINUTE = 30    # batas dump per proses
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'formatters': {
+        'json': {'()': 'lms_core.access_log.JsonFormatter'},
+    },
+    'handlers': {
+        'access': {
+            '()': 'lms_core.access_log.QueuedFileHandler',
+            'filename': LMS_LOG_DIR / 'access.log',
+            'formatter': 'json',
+        },
+        'slow': {
+            '()': 'lms_core.access_log.QueuedFileHandler',
+            'filename': LMS_LOG_DIR / 'slow.log',
+            'formatter': 'json',
+        },
+    },
+    'loggers': {
+        'lms.access': {'handlers': ['access'], 'level': 'INFO', 'propagate': False},
+        'lms.slow': {'handlers': ['slow'], 'level': 'WARNING', 'propagate': False},
+    },
+}
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.1/ref/settings/#default-auto-field
 
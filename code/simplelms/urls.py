@@ -14,6 +14,8 @@ Including another URLconf
     1. Import the include() function: from django.urls import include, path
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
+from django.conf import settings
+from django.conf.urls.static import static
 from django.contrib import admin
 from django.urls import path
 from lms_core.views import index, testing, addData, editData, deleteData
@@ -28,3 +30,6 @@ urlpatterns = [
     path('hapus/', deleteData),
     path('', index),
 ]
+
+# di production MEDIA_URL dilayani web server (path content-addressed → boleh cache immutable)
+urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
@@ -0,0 +1,100 @@
+"""
+Ukur waktu boot worker: import django, django.setup(), load URLconf (apiv1),
+dan latensi request pertama. Tiap run memakai proses baru supaya cold start.
+
+    python startup_bench.py --runs 10
+    python startup_bench.py --runs 10 --token <access token>   # request pertama ber-JWT
+    python startup_bench.py --imports 15                        # modul termahal
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+CHILD = r"""
+import json, os, sys, time
+t0 = time.perf_counter()
+sys.path.insert(0, os.getcwd())
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "simplelms.settings")
+import django
+t1 = time.perf_counter()
+django.setup()
+t2 = time.perf_counter()
+from django.urls import resolve
+resolve("/api/v1/dashboard")
+t3 = time.perf_counter()
+from django.conf import settings
+from django.test import Client  # bukan bagian worker asli, jangan ikut diukur
+settings.ALLOWED_HOSTS = ["*"]
+t3b = time.perf_counter()
+headers = {}
+if os.environ.get("LMS_BENCH_TOKEN"):
+    headers["HTTP_AUTHORIZATION"] = "Bearer " + os.environ["LMS_BENCH_TOKEN"]
+status = Client().get(os.environ.get("LMS_BENCH_PATH", "/api/v1/dashboard"), **headers).status_code
+t4 = time.perf_counter()
+print(json.dumps({
+    "import_django_ms": (t1 - t0) * 1000,
+    "django_setup_ms": (t2 - t1) * 1000,
+    "urlconf_ms": (t3 - t2) * 1000,
+    "first_request_ms": (t4 - t3b) * 1000,
+    "total_ms": (t3 - t0 + t4 - t3b) * 1000,
+    "status": status,
+}))
+"""
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def run_once(env, importtime=False):
+    cmd = [sys.executable] + (["-X", "importtime"] if importtime else []) + ["-c", CHILD]
+    proc = subprocess.run(cmd, cwd=HERE, env=env, capture_output=True, text=True, check=True)
+    return json.loads(proc.stdout.strip().splitlines()[-1]), proc.stderr
+
+
+def top_imports(stderr, limit):
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append((int(cumulative_us), int(self_us), name.rstrip()))
+    return sorted(rows, reverse=True)[:limit]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--path", default="/api/v1/dashboard", help="path untuk request pertama")
+    parser.add_argument("--token", help="JWT access token untuk request pertama")
+    parser.add_argument("--imports", type=int, metavar="N", help="tampilkan N import termahal")
+    parser.add_argument("--json", action="store_true", help="output JSON (median per fase)")
+    args = parser.parse_args()
+
+    env = dict(os.environ, LMS_BENCH_PATH=args.path)
+    if args.token:
+        env["LMS_BENCH_TOKEN"] = args.token
+
+    if args.imports:
+        _, stderr = run_once(env, importtime=True)
+        print(f"{'cumulative ms':>14}{'self ms':>10}  module")
+        for cumulative, self_us, name in top_imports(stderr, args.imports):
+            print(f"{cumulative / 1000:>14.1f}{self_us / 1000:>10.1f}  {name}")
+        return
+
+    samples = [run_once(env)[0] for _ in range(args.runs)]
+    phases = [k for k in samples[0] if k.endswith("_ms")]
+    medians = {k: statistics.median(s[k] for s in samples) for k in phases}
+    if args.json:
+        print(json.dumps(medians, indent=2))
+        return
+    print(f"{args.runs} run, first request {args.path} -> {samples[0]['status']}")
+    print(f"{'phase':<20}{'median ms':>12}{'min ms':>10}{'max ms':>10}")
+    for k in phases:
+        values = [s[k] for s in samples]
+        print(f"{k[:-3]:<20}{medians[k]:>12.1f}{min(values):>10.1f}{max(values):>10.1f}")
+
+
+if __name__ == "__main__":
+    main()